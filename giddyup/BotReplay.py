@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+GiddyUp Bot Replay - Past Racing Days at 1000x Speed
+====================================================
+
+Runs the real decision loops (HorseBot_Simple.run_bot and
+HorseBackLayBot.run_backlay_bot) against past days:
+    - Selections come from that day's bot action log
+    - Prices come from the tick archive via the simulated exchange
+    - Time comes from a ReplayClock - every RECHECK_INTERVAL sleep advances
+      simulated time instantly (paced at 1/speed of real time)
+
+Every decision is written to the replay's own logs (never the live ones),
+and a per-day summary is appended to replay_summary.jsonl.
+
+Commands:
+    python3 BotReplay.py 2025-10-20                          # One day, HorseBot
+    python3 BotReplay.py 2025-10-01 --days 30 --bot both     # A month, both bots
+    python3 BotReplay.py 2025-10-20 --speed 0                # As fast as possible
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import HorseBot_Simple as backbot
+import HorseBackLayBot as backlay
+from HorseBot_Simple import BST, LOG_DIR, TICK_DIR
+from utilities.log_writer import load_action_rows
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+from giddyup.sim import ReplayClock, SimulatedExchange, load_runner_map
+
+# ══════════════════════════════════════════════════════════════════════════════
+# SETTINGS
+# ══════════════════════════════════════════════════════════════════════════════
+
+REPLAY_DIR = Path(__file__).parent / "strategies" / "logs" / "replays"
+DEFAULT_SPEED = 1000.0
+BACKLAY_LEAD = 120               # Back-lay bot starts watching at T-120
+
+# ══════════════════════════════════════════════════════════════════════════════
+# HELPERS
+# ══════════════════════════════════════════════════════════════════════════════
+
+def selections_from_log(log_dir: Path, date: str) -> List[Dict]:
+    """Rebuild a day's selections (one per race/horse) from its action log."""
+    path = log_dir / f"bot_actions_{date}.csv"
+    if not path.exists():
+        return []
+
+    selections = {}
+    with path.open("r", newline="") as f:
+        for row in csv.DictReader(f):
+            key = (row["race_time"], row["horse"])
+            if key in selections:
+                continue
+            selections[key] = {
+                "time": row["race_time"],
+                "course": row["course"],
+                "horse": row["horse"],
+                "strategy": row.get("strategy", ""),
+                "odds": row["expected_odds"],
+                "min_odds_needed": row["min_odds"],
+                "stake_gbp": row["stake"],
+                "reasoning": "",
+            }
+    return sorted(selections.values(), key=lambda s: s["time"])
+
+
+def replay_start(date: str, selections: List[Dict], lead_minutes: int) -> datetime:
+    """Simulated start: `lead_minutes` before the first race (plus one check)."""
+    day = datetime.strptime(date, "%Y-%m-%d").date()
+    first = min(datetime.strptime(s["time"], "%H:%M").time() for s in selections)
+    return BST.localize(datetime.combine(day, first)) - timedelta(minutes=lead_minutes + 5)
+
+
+@contextlib.contextmanager
+def patched(module, **values):
+    """Temporarily replace module globals (log paths, clock, notifiers)."""
+    saved = {name: getattr(module, name) for name in values}
+    for name, value in values.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(module, name, value)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# REPLAY
+# ══════════════════════════════════════════════════════════════════════════════
+
+def replay_day(date: str, bot: str, out_dir: Path, speed: Optional[float],
+               bankroll: float, source_dir: Path = LOG_DIR, tick_root: Path = TICK_DIR,
+               quiet: bool = True) -> Optional[Dict]:
+    """
+    Replay one bot over one day.
+
+    Returns:
+        Summary dict (decisions, fills, loop throughput), or None if the day
+        has no selections
+    """
+    selections = selections_from_log(source_dir, date)
+    if not selections:
+        return None
+
+    lead = backbot.T_MINUS_START_TRACKING if bot == "horsebot" else BACKLAY_LEAD
+    clock = ReplayClock(replay_start(date, selections, lead), speed=speed)
+    exchange = SimulatedExchange(
+        tick_root, date, clock=clock,
+        runners=load_runner_map(source_dir, date),
+        min_liquidity=backbot.MIN_LIQUIDITY if bot == "horsebot" else 0.0,
+    )
+
+    day_dir = out_dir / bot
+    day_dir.mkdir(parents=True, exist_ok=True)
+    console = (day_dir / f"console_{date}.log").open("w") if quiet else None
+
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(console) if console else contextlib.nullcontext():
+            if bot == "horsebot":
+                with patched(backbot, CLOCK=clock, LOG_DIR=day_dir, TWEET_DIR=day_dir,
+                             STATE_DB=day_dir / "bot_state.sqlite3",
+                             TELEGRAM_ENABLED=False, TWITCH_ENABLED=False):
+                    backbot.run_bot(date, {None: bankroll}, live=False,
+                                    selections=selections, betfair=exchange)
+            else:
+                with patched(backlay, CLOCK=clock, LOG_DIR=day_dir, TELEGRAM_ENABLED=False):
+                    backlay.run_backlay_bot(date, bankroll, dry_run=True,
+                                            selections=selections, betfair=exchange)
+    finally:
+        if console:
+            console.close()
+    wall = time.perf_counter() - started
+
+    if bot == "horsebot":
+        action_log = day_dir / f"bot_actions_{date}.csv"
+        rows = load_action_rows(action_log) if action_log.exists() else []
+        decisions = len(rows)
+        bets = sum(1 for r in rows if r["bet_placed"] not in ("NO", "FAILED"))
+    else:
+        trades = day_dir / f"{date}_backlay.csv"
+        with trades.open("r", newline="") as f:
+            rows = list(csv.DictReader(f))
+        decisions = len(rows)
+        bets = decisions
+
+    fills = exchange.report()
+    return {
+        "date": date,
+        "bot": bot,
+        "selections": len(selections),
+        "decisions": decisions,
+        "bets": bets,
+        "orders": fills["orders"],
+        "fill_rate": fills["fill_rate"],
+        "quote_misses": fills["quote_misses"],
+        "iterations": clock.sleeps,
+        "simulated_seconds": clock.slept,
+        "wall_seconds": round(wall, 3),
+        "iterations_per_second": round(clock.sleeps / wall, 1) if wall > 0 else None,
+    }
+
+
+def run_replay(start_date: str, days: int, bots: List[str], out_dir: Path,
+               speed: Optional[float], bankroll: float, quiet: bool = True) -> List[Dict]:
+    """Replay every requested bot over consecutive days."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    summary_file = out_dir / "replay_summary.jsonl"
+    first = datetime.strptime(start_date, "%Y-%m-%d").date()
+
+    results = []
+    for i in range(days):
+        date = (first + timedelta(days=i)).isoformat()
+        for bot in bots:
+            result = replay_day(date, bot, out_dir, speed, bankroll, quiet=quiet)
+            if result is None:
+                print(f"{date} {bot:<9} no selections - skipped")
+                continue
+            results.append(result)
+            with summary_file.open("a") as f:
+                f.write(json.dumps(result) + "\n")
+            fill = f"{result['fill_rate']:.0%}" if result["fill_rate"] is not None else "-"
+            print(f"{date} {bot:<9} {result['decisions']:>3} decisions  {result['bets']:>3} bets  "
+                  f"fill {fill:>4}  {result['iterations']:>5} loops in {result['wall_seconds']:.1f}s")
+
+    if results:
+        loops = sum(r["iterations"] for r in results)
+        wall = sum(r["wall_seconds"] for r in results)
+        print(f"\n{len(results)} bot-day(s), {sum(r['decisions'] for r in results)} decisions, "
+              f"{loops} loop iterations in {wall:.1f}s ({loops / wall if wall else 0:.0f}/s)")
+        print(f"Summary: {summary_file}")
+    return results
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# CLI
+# ══════════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay past racing days through the bots")
+    parser.add_argument("date", help="First date (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, default=1, help="Consecutive days to replay")
+    parser.add_argument("--bot", choices=["horsebot", "backlay", "both"], default="horsebot")
+    parser.add_argument("--speed", type=float, default=DEFAULT_SPEED,
+                        help="Simulated seconds per real second (0 = as fast as possible)")
+    parser.add_argument("--bankroll", type=float, default=5000.0)
+    parser.add_argument("--out", type=Path, default=None, help="Output directory")
+    parser.add_argument("--verbose", action="store_true", help="Show bot output instead of logging it")
+    args = parser.parse_args()
+
+    bots = ["horsebot", "backlay"] if args.bot == "both" else [args.bot]
+    out_dir = args.out or REPLAY_DIR / datetime.now().strftime("%Y%m%d_%H%M%S")
+    run_replay(args.date, args.days, bots, out_dir, args.speed or None,
+               args.bankroll, quiet=not args.verbose)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,659 @@
+#!/usr/bin/env python3
+"""
+GiddyUp Bot Supervisor - Many Strategy Sessions, One Process
+============================================================
+
+Runs Strategy A, Strategy B and the back-lay trader side by side over:
+    - ONE Betfair login (shared by every session)
+    - ONE market lookup + price cache (batched list_market_book calls)
+    - ONE scheduler (each session ticks at its own interval)
+
+Each session keeps its own bankroll, exposure and persisted state, so a
+strategy can never spend another strategy's money. Adding a strategy is a
+new session object - no extra login, process or PID file.
+
+Commands:
+    python3 BotSupervisor.py start 2025-10-20 --a 5000 --b 2000              # A + B
+    python3 BotSupervisor.py start 2025-10-20 --a 5000 --backlay 1000 --days 3
+    python3 BotSupervisor.py stop
+    python3 BotSupervisor.py status
+
+Default is DRY RUN (no real bets). Add --live to bet for real.
+"""
+
+import argparse
+import os
+import signal
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import HorseBot_Simple as backbot
+import HorseBackLayBot as backlay
+from HorseBot_Simple import (
+    BST, LOG_DIR, STATE_DB, ACTION_LOG_HEADER, PRICE_LOG_HEADER,
+    MAX_DRIFT, MIN_LIQUIDITY, T_MINUS_START_TRACKING, T_MINUS_BET_WINDOW,
+    Betfair, log, ts
+)
+from utilities.log_writer import BufferedCSVWriter, open_results_sidecar
+from utilities.market_data import MarketDataHub
+from utilities.request_governor import GOVERNOR
+from utilities.state_store import BotStateStore
+
+# ══════════════════════════════════════════════════════════════════════════════
+# SETTINGS
+# ══════════════════════════════════════════════════════════════════════════════
+
+PID_FILE = Path(__file__).parent / "supervisor.pid"
+
+BACK_INTERVAL = 300               # Back strategies re-check every 5 minutes
+BACKLAY_INTERVAL = backlay.RECHECK_INTERVAL
+RESULTS_INTERVAL = 300            # Check results every 5 minutes
+KEEP_ALIVE_INTERVAL = 4 * 3600    # Refresh the Betfair session token
+DAY_START = "10:00"               # Start of each day's session when running ahead
+
+BACKLAY_LOG_HEADER = [
+    "timestamp", "race_time", "course", "horse", "strategy",
+    "back_odds", "back_stake", "lay_odds", "lay_stake",
+    "profit_gbp", "profit_pct", "reason", "status"
+]
+
+# ══════════════════════════════════════════════════════════════════════════════
+# SESSIONS
+# ══════════════════════════════════════════════════════════════════════════════
+
+def race_datetime(date: str, race_time: str) -> datetime:
+    """UK race datetime for a date + HH:MM."""
+    day = datetime.strptime(date, "%Y-%m-%d").date()
+    return BST.localize(datetime.combine(day, datetime.strptime(race_time, "%H:%M").time()))
+
+
+class StrategySession:
+    """
+    One strategy's view of the day.
+
+    The supervisor asks every due session which markets it wants priced,
+    refreshes them all in one batch, then calls on_tick().
+    """
+
+    name = "base"
+    interval = BACK_INTERVAL
+
+    def __init__(self, date: str, bankroll: float, hub: MarketDataHub, live: bool):
+        self.date = date
+        self.bankroll = bankroll
+        self.hub = hub
+        self.live = live
+        self.exposure = 0.0
+        self.next_due = 0.0
+
+    def markets(self, now: datetime) -> List[str]:
+        """Market IDs this session needs priced on this tick."""
+        return []
+
+    def on_tick(self, now: datetime):
+        """Act on the freshly priced markets (default: nothing to do)."""
+        pass
+
+    def race_times(self) -> List[str]:
+        """HH:MM off-times this session trades (sets the end of the day)."""
+        return []
+
+    def can_afford(self, stake: float) -> bool:
+        """Bankroll isolation: never exceed this session's own bankroll."""
+        return self.exposure + stake <= self.bankroll
+
+    def close(self):
+        pass
+
+    def summary(self) -> str:
+        return f"{self.name}: £{self.exposure:.2f} of £{self.bankroll:.0f} used"
+
+
+class BackSession(StrategySession):
+    """Strategy A or B: one back-bet decision per race at T-60 (same rules as HorseBot_Simple)."""
+
+    interval = BACK_INTERVAL
+
+    def __init__(self, strategy: str, date: str, bankroll: float, selections: List[Dict],
+                 hub: MarketDataHub, betfair: Betfair, live: bool,
+                 action_writer: BufferedCSVWriter, price_writer: BufferedCSVWriter):
+        super().__init__(date, bankroll, hub, live)
+        self.name = f"Strategy {strategy}"
+        self.selections = selections
+        self.betfair = betfair
+        self.action_writer = action_writer
+        self.price_writer = price_writer
+
+        bot_type = f"Supervisor-{strategy}" + ("" if live else "-DRY")
+        self.state = BotStateStore(STATE_DB, date, bot_type)
+        resumed = self.state.load()
+        self.decided = resumed.decided
+        self.market_cache = dict(resumed.markets)
+        self.results_checked = set(resumed.results_checked)
+        self.exposure = sum(
+            d["stake"] or 0.0 for d in resumed.decisions.values()
+            if d["decision"] in ("PENDING", "PLACED")
+        )
+
+        for sel in selections:
+            key = self.key(sel)
+            if key in self.market_cache:
+                hub.seed(sel["horse"], sel["course"], sel["time"], self.market_cache[key])
+
+        if resumed.decisions:
+            log(f"♻️  {self.name}: resumed {len(self.decided)} decision(s)")
+
+    @staticmethod
+    def key(sel: Dict) -> str:
+        return f"{sel['time']}_{sel['horse']}"
+
+    def _tracked(self, now: datetime):
+        """Selections between T-240 and the off that still need a decision."""
+        for sel in self.selections:
+            key = self.key(sel)
+            if key in self.decided:
+                continue
+            minutes_to_off = (race_datetime(self.date, sel["time"]) - now).total_seconds() / 60
+            if 0 <= minutes_to_off <= T_MINUS_START_TRACKING:
+                yield sel, key, minutes_to_off
+
+    def markets(self, now: datetime) -> List[str]:
+        market_ids = []
+        for sel, key, minutes_to_off in self._tracked(now):
+            if key not in self.market_cache:
+                market_info = self.hub.resolve(sel["horse"], sel["course"], sel["time"])
+                if not market_info:
+                    self.price_writer.write([
+                        ts(), sel["time"], sel["course"], sel["horse"],
+                        f"{minutes_to_off:.1f}", "", "", "", "MARKET_NOT_FOUND"
+                    ])
+                    continue
+                self.market_cache[key] = market_info
+                self.state.record_market(key, *market_info)
+            market_ids.append(self.market_cache[key][0])
+        return market_ids
+
+    def on_tick(self, now: datetime):
+        for sel, key, minutes_to_off in list(self._tracked(now)):
+            if key not in self.market_cache:
+                continue
+            market_id, sel_id = self.market_cache[key]
+            current_odds = self.hub.back_price(market_id, sel_id, MIN_LIQUIDITY)
+
+            if minutes_to_off > T_MINUS_BET_WINDOW:
+                status = "TRACKING"
+            elif minutes_to_off > 5:
+                status = "BET_WINDOW"
+            else:
+                status = "TOO_LATE"
+            self.price_writer.write([
+                ts(), sel["time"], sel["course"], sel["horse"],
+                f"{minutes_to_off:.1f}",
+                f"{current_odds:.2f}" if current_odds else "",
+                market_id, sel_id, status
+            ])
+
+            if not current_odds or not 55 <= minutes_to_off <= 65:
+                continue
+
+            self._decide(sel, key, market_id, sel_id, current_odds, minutes_to_off)
+
+    def _decide(self, sel: Dict, key: str, market_id: str, sel_id: str,
+                current_odds: float, minutes_to_off: float):
+        """Make the single T-60 decision for a selection."""
+        min_odds = float(sel["min_odds_needed"])
+        expected = float(sel["odds"])
+        stake = float(sel["stake_gbp"])
+        drift = abs(current_odds - expected) / expected
+
+        log(f"⏰ [{self.name}] T-{int(minutes_to_off)} decision: {sel['horse']} @ {sel['course']} "
+            f"- odds {current_odds:.2f} (min {min_odds:.2f}, drift {drift*100:+.1f}%)")
+
+        reason = None
+        if current_odds < min_odds:
+            reason = f"Odds too low: {current_odds:.2f} < {min_odds:.2f}"
+        elif drift > MAX_DRIFT:
+            reason = f"Drifted {drift*100:.1f}% (max {MAX_DRIFT*100:.0f}%)"
+        elif not self.can_afford(stake):
+            reason = f"Bankroll limit: £{self.exposure:.2f} + £{stake:.2f} > £{self.bankroll:.0f}"
+
+        if reason:
+            log(f"⏭️  [{self.name}] SKIP BET: {reason}", "WARNING")
+            if backbot.TELEGRAM_ENABLED:
+                try:
+                    backbot.send_bet_skipped(
+                        horse=sel["horse"], course=sel["course"], race_time=sel["time"],
+                        current_odds=current_odds, min_odds=min_odds, expected_odds=expected,
+                        reason=reason, strategy=sel["strategy"]
+                    )
+                except Exception as e:
+                    log(f"Telegram error: {e}", "WARNING")
+            self.action_writer.write([
+                ts(), sel["time"], sel["course"], sel["horse"], sel["strategy"],
+                sel["odds"], sel["min_odds_needed"], current_odds, sel["stake_gbp"],
+                "NO", "", reason, market_id, sel_id, "", "", ""
+            ])
+            self.state.record_decision(key, "SKIPPED", odds=current_odds, reason=reason)
+            self.decided.add(key)
+            return
+
+        # Record intent first - a crash mid-placement must not lead to a second bet
+        self.state.record_decision(key, "PENDING", odds=current_odds, stake=stake)
+        self.exposure += stake
+        bet_id = self.betfair.place_bet(market_id, sel_id, current_odds, stake, sel["horse"])
+
+        if bet_id:
+            bet_status = "DRY_RUN" if self.betfair.dry_run else "EXECUTED"
+            reason = f"{bet_status} @ {current_odds:.2f}"
+            if backbot.TELEGRAM_ENABLED:
+                try:
+                    backbot.send_bet_placed(
+                        horse=sel["horse"], course=sel["course"], race_time=sel["time"],
+                        odds=current_odds, stake=stake, strategy=sel["strategy"],
+                        expected_odds=expected, is_dry_run=self.betfair.dry_run
+                    )
+                except Exception as e:
+                    log(f"Telegram error: {e}", "WARNING")
+        else:
+            bet_status = "FAILED"
+            reason = "Bet placement failed"
+            self.exposure -= stake
+
+        self.action_writer.write([
+            ts(), sel["time"], sel["course"], sel["horse"], sel["strategy"],
+            sel["odds"], sel["min_odds_needed"], current_odds, sel["stake_gbp"],
+            bet_status, bet_id or "", reason, market_id, sel_id, "", "", ""
+        ])
+        self.state.record_decision(
+            key, "PLACED" if bet_id else "FAILED", bet_id=bet_id,
+            odds=current_odds, stake=stake, reason=reason
+        )
+        self.decided.add(key)
+
+    def race_times(self) -> List[str]:
+        return [sel["time"] for sel in self.selections]
+
+    def results_due(self, now: datetime) -> List[str]:
+        """Decided races that finished 10+ minutes ago and haven't been checked."""
+        due = []
+        for sel in self.selections:
+            key = self.key(sel)
+            minutes_since = (now - race_datetime(self.date, sel["time"])).total_seconds() / 60
+            if minutes_since >= 10 and key in self.decided and key not in self.results_checked:
+                due.append(key)
+        return due
+
+    def mark_checked(self, keys: List[str]):
+        for key in keys:
+            self.results_checked.add(key)
+            self.state.record_result_checked(key)
+
+    def close(self):
+        self.state.close()
+
+    def summary(self) -> str:
+        return (f"{self.name}: {len(self.decided)}/{len(self.selections)} decisions, "
+                f"£{self.exposure:.2f} of £{self.bankroll:.0f} staked")
+
+
+class BackLaySession(StrategySession):
+    """Paper back at morning odds, lay when the price shortens (rules from HorseBackLayBot)."""
+
+    name = "Back-Lay"
+    interval = BACKLAY_INTERVAL
+
+    def __init__(self, date: str, bankroll: float, selections: List[Dict],
+                 hub: MarketDataHub, live: bool):
+        super().__init__(date, bankroll, hub, live)
+        self.log_writer = BufferedCSVWriter(backlay.LOG_DIR / f"{date}_backlay.csv", BACKLAY_LOG_HEADER)
+        self.positions: Dict[str, Dict] = {}
+        self.total_profit = 0.0
+
+        for sel in selections:
+            stake = float(sel["stake_gbp"])
+            if not self.can_afford(stake):
+                log(f"⏭️  [{self.name}] Bankroll limit - not backing {sel['horse']}", "WARNING")
+                continue
+            self.exposure += stake
+            self.positions[f"{sel['time']}_{sel['horse']}"] = {
+                "selection": sel,
+                "back_odds": float(sel["odds"]),
+                "back_stake": stake,
+                "laid": False,
+                "expired": False,         # Race went off without a lay
+                "market": None,
+            }
+
+    def _open(self, now: datetime):
+        for key, pos in self.positions.items():
+            if pos["laid"] or pos["expired"]:
+                continue
+            sel = pos["selection"]
+            minutes_to_off = (race_datetime(self.date, sel["time"]) - now).total_seconds() / 60
+            if minutes_to_off < -5:
+                pos["expired"] = True
+                log(f"⏰ [{self.name}] Race finished without a lay: {sel['horse']} @ {sel['course']}")
+                continue
+            if minutes_to_off <= 120:
+                yield key, pos, minutes_to_off
+
+    def markets(self, now: datetime) -> List[str]:
+        market_ids = []
+        for _, pos, _ in self._open(now):
+            sel = pos["selection"]
+            if not pos["market"]:
+                pos["market"] = self.hub.resolve(sel["horse"], sel["course"], sel["time"])
+            if pos["market"]:
+                market_ids.append(pos["market"][0])
+        return market_ids
+
+    def on_tick(self, now: datetime):
+        batch = []
+        for _, pos, minutes_to_off in list(self._open(now)):
+            if not pos["market"]:
+                continue
+            current_odds = self.hub.back_price(*pos["market"])
+            if current_odds:
+                batch.append((pos, current_odds, minutes_to_off))
+
+        # One vectorized evaluation for every quoted position
+        for (pos, current_odds, minutes_to_off), (should_lay, reason, profit_pct, profit) in zip(
+            batch, backlay.evaluate_positions(batch), strict=True
+        ):
+            if not should_lay or profit <= 0:
+                continue
+
+            sel = pos["selection"]
+            lay_stake = pos["back_stake"] * pos["back_odds"] / current_odds
+            log(f"💰 [{self.name}] LAY {sel['horse']} @ {current_odds:.2f} "
+                f"(backed {pos['back_odds']:.2f}) → £{profit:.2f} ({reason})", "SUCCESS")
+
+            self.log_writer.write([
+                ts(), sel["time"], sel["course"], sel["horse"], sel["strategy"],
+                pos["back_odds"], pos["back_stake"], current_odds, f"{lay_stake:.2f}",
+                f"{profit:.2f}", f"{profit_pct:.1f}", reason, "COMPLETED"
+            ])
+            pos["laid"] = True
+            self.total_profit += profit
+
+            if backlay.TELEGRAM_ENABLED:
+                try:
+                    backlay.send_telegram_message(
+                        f"💰 <b>BACK-LAY PROFIT</b>\n\n🏇 {sel['horse']} @ {sel['course']}\n"
+                        f"⏰ Race: {sel['time']} (T-{int(minutes_to_off)})\n\n"
+                        f"💵 <b>Profit: £{profit:.2f} ({profit_pct:.1f}%)</b>\n\nReason: {reason}"
+                    )
+                except Exception as e:
+                    log(f"Telegram error: {e}", "WARNING")
+
+    def race_times(self) -> List[str]:
+        return [pos["selection"]["time"] for pos in self.positions.values()]
+
+    def close(self):
+        self.log_writer.close()
+
+    def summary(self) -> str:
+        laid = sum(1 for p in self.positions.values() if p["laid"])
+        expired = sum(1 for p in self.positions.values() if p["expired"])
+        return (f"{self.name}: {laid}/{len(self.positions)} positions closed, "
+                f"{expired} expired unlaid, P&L £{self.total_profit:+.2f}")
+
+# ══════════════════════════════════════════════════════════════════════════════
+# SUPERVISOR
+# ══════════════════════════════════════════════════════════════════════════════
+
+def load_day_selections(date: str, bankrolls: Dict[Optional[str], float]) -> List[Dict]:
+    """Selections for a date with stakes from the given bankrolls."""
+    if backbot.SELECTION_SERVICE_AVAILABLE:
+        try:
+            return [s.to_row() for s in backbot.load_selections(date, bankrolls)]
+        except Exception as e:
+            log(f"Selection service failed ({e}) - falling back to RUN_BOTH_STRATEGIES.sh", "WARNING")
+    return backbot.get_selections_from_script(date, bankrolls)
+
+
+def run_day(date: str, bankrolls: Dict[str, float], betfair: Betfair, live: bool):
+    """
+    Run every configured strategy session for one date.
+
+    Args:
+        date: Date in YYYY-MM-DD format
+        bankrolls: {'A': ..., 'B': ..., 'BACKLAY': ...} (missing/0 = session off)
+        betfair: Shared, logged-in Betfair wrapper
+        live: Live betting (state is kept apart from dry runs)
+    """
+    log("=" * 80)
+    log(f"🏇 SUPERVISOR - {date}")
+    log("=" * 80)
+
+    ticks = backbot.TickArchiver(backbot.TICK_DIR) if backbot.TICK_ARCHIVE_AVAILABLE else None
+    hub = MarketDataHub(betfair, ticks=ticks)
+    sessions: List[StrategySession] = []
+
+    action_log = LOG_DIR / f"bot_actions_{date}.csv"
+    action_writer = BufferedCSVWriter(action_log, ACTION_LOG_HEADER)
+    price_writer = BufferedCSVWriter(LOG_DIR / f"bot_prices_{date}.csv", PRICE_LOG_HEADER)
+    results_writer = open_results_sidecar(action_log)
+
+    try:
+        back_bankrolls = {k: v for k, v in bankrolls.items() if k in ("A", "B") and v}
+        if back_bankrolls:
+            selections = load_day_selections(date, back_bankrolls)
+            for strategy, bankroll in back_bankrolls.items():
+                own = [s for s in selections if s["strategy"].startswith(f"{strategy}-")]
+                sessions.append(BackSession(
+                    strategy, date, bankroll, own, hub, betfair, live, action_writer, price_writer
+                ))
+            if selections and backbot.TELEGRAM_ENABLED:
+                try:
+                    backbot.send_morning_picks(date, selections)
+                except Exception as e:
+                    log(f"Telegram error: {e}", "WARNING")
+
+        if bankrolls.get("BACKLAY"):
+            selections = load_day_selections(date, {None: bankrolls["BACKLAY"]})
+            sessions.append(BackLaySession(date, bankrolls["BACKLAY"], selections, hub, live))
+
+        race_times = [race_datetime(date, t) for session in sessions for t in session.race_times()]
+        if not race_times:
+            log("No selections - nothing to run today", "WARNING")
+            return
+
+        for session in sessions:
+            log(f"   {session.summary()}")
+        end_time = max(race_times) + timedelta(minutes=30)
+        log(f"Running {len(sessions)} session(s) until {end_time.strftime('%H:%M')}")
+
+        next_results = 0.0
+        next_keep_alive = time.monotonic() + KEEP_ALIVE_INTERVAL
+
+        while datetime.now(BST) < end_time:
+            now = datetime.now(BST)
+            mono = time.monotonic()
+
+            # One batched price refresh for every session due this tick
+            due = [s for s in sessions if s.next_due <= mono]
+            market_ids = set()
+            for session in due:
+                market_ids.update(session.markets(now))
+            hub.refresh(market_ids)
+
+            for session in due:
+                try:
+                    session.on_tick(now)
+                except Exception as e:
+                    log(f"[{session.name}] tick error: {e}", "ERROR")
+                session.next_due = mono + session.interval
+
+            if mono >= next_results:
+                check_results(date, sessions, action_log, action_writer, results_writer, now)
+                next_results = mono + RESULTS_INTERVAL
+
+            if mono >= next_keep_alive and betfair.client:
+                try:
+                    betfair.client.keep_alive()
+                except Exception as e:
+                    log(f"Betfair keep-alive failed: {e}", "WARNING")
+                next_keep_alive = mono + KEEP_ALIVE_INTERVAL
+
+            wake = min(s.next_due for s in sessions)
+            time.sleep(max(0.5, wake - time.monotonic()))
+
+        log("")
+        log("=" * 80)
+        log(f"DAY COMPLETE - {date}")
+        log("=" * 80)
+        for session in sessions:
+            log(f"   {session.summary()}")
+        log(f"   Market lookups: {hub.stats['lookups']} (+{hub.stats['lookup_hits']} shared) | "
+            f"Price requests: {hub.stats['book_requests']} for {hub.stats['markets_fetched']} markets")
+        for line in GOVERNOR.report().splitlines():
+            log(f"📡 {line}")
+
+    finally:
+        for session in sessions:
+            session.close()
+        action_writer.close()
+        price_writer.close()
+        results_writer.close()
+        if ticks:
+            backbot.close_ticks(ticks, date)
+
+
+def check_results(date: str, sessions: List[StrategySession], action_log: Path,
+                  action_writer: BufferedCSVWriter, results_writer: BufferedCSVWriter,
+                  now: datetime):
+    """Grade finished races for all back sessions with one results fetch."""
+    if not backbot.RESULTS_CHECKER_AVAILABLE:
+        return
+
+    due = {s: s.results_due(now) for s in sessions if isinstance(s, BackSession)}
+    if not any(due.values()):
+        return
+
+    race_results = backbot.fetch_results(date)
+    if not race_results:
+        return
+
+    action_writer.flush()
+    results_writer.flush()
+    new_results = backbot.check_and_post_results(action_log, date, race_results, results_writer)
+    if new_results:
+        log(f"   ✅ Posted {new_results} new result(s) to Telegram", "SUCCESS")
+
+    for session, keys in due.items():
+        session.mark_checked(keys)
+
+
+def wait_until_day_start(date: str):
+    """Sleep until DAY_START on a future date (no-op for today/past)."""
+    start = race_datetime(date, DAY_START)
+    wait = (start - datetime.now(BST)).total_seconds()
+    if wait > 0:
+        log(f"💤 Waiting until {start.strftime('%Y-%m-%d %H:%M')} for next session")
+        time.sleep(wait)
+
+
+def run_supervisor(start_date: str, days: int, bankrolls: Dict[str, float], live: bool):
+    """Run all sessions for `days` consecutive dates over one Betfair login."""
+    betfair = Betfair(dry_run=not live)
+    betfair.login()
+
+    try:
+        first = datetime.strptime(start_date, "%Y-%m-%d").date()
+        for offset in range(days):
+            date = (first + timedelta(days=offset)).strftime("%Y-%m-%d")
+            wait_until_day_start(date)
+            run_day(date, bankrolls, betfair, live)
+    finally:
+        betfair.logout()
+
+# ══════════════════════════════════════════════════════════════════════════════
+# PROCESS CONTROL
+# ══════════════════════════════════════════════════════════════════════════════
+
+def read_pid() -> Optional[int]:
+    try:
+        return int(PID_FILE.read_text().strip())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def is_running() -> bool:
+    pid = read_pid()
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        PID_FILE.unlink(missing_ok=True)
+        return False
+
+
+def stop_supervisor():
+    pid = read_pid()
+    if not pid or not is_running():
+        print("❌ Supervisor is not running")
+        return
+    os.kill(pid, signal.SIGTERM)
+    print(f"🛑 Stopping supervisor (PID: {pid})...")
+    for _ in range(10):
+        if not is_running():
+            print("✅ Supervisor stopped")
+            return
+        time.sleep(1)
+    os.kill(pid, signal.SIGKILL)
+    print("⚠️  Supervisor force-stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GiddyUp Bot Supervisor")
+    parser.add_argument("command", choices=["start", "stop", "status"])
+    parser.add_argument("date", nargs="?", help="First date (YYYY-MM-DD)")
+    parser.add_argument("--a", type=float, default=0, help="Strategy A bankroll")
+    parser.add_argument("--b", type=float, default=0, help="Strategy B bankroll")
+    parser.add_argument("--backlay", type=float, default=0, help="Back-lay bankroll")
+    parser.add_argument("--days", type=int, default=1, help="Consecutive days to run")
+    parser.add_argument("--live", action="store_true", help="Place real bets (default: dry run)")
+    args = parser.parse_args()
+
+    if args.command == "stop":
+        stop_supervisor()
+        return
+
+    if args.command == "status":
+        if is_running():
+            print(f"🟢 Supervisor is RUNNING (PID: {read_pid()})")
+        else:
+            print("🔴 Supervisor is STOPPED")
+        return
+
+    bankrolls = {"A": args.a, "B": args.b, "BACKLAY": args.backlay}
+    if not args.date or not any(bankrolls.values()):
+        print("❌ Usage: python3 BotSupervisor.py start <date> [--a N] [--b N] [--backlay N] [--days N] [--live]")
+        return
+
+    if is_running():
+        print("⚠️  Supervisor is already running! Use 'stop' first.")
+        return
+
+    print(f"🚀 Starting supervisor from {args.date} for {args.days} day(s)")
+    for name, amount in bankrolls.items():
+        if amount:
+            print(f"   {name}: £{amount:.0f}")
+    print("⚠️  LIVE MODE - Real bets will be placed!" if args.live else "🔍 DRY RUN mode - No real bets")
+
+    PID_FILE.write_text(str(os.getpid()))
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        run_supervisor(args.date, args.days, bankrolls, args.live)
+    finally:
+        PID_FILE.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -41,6 +41,32 @@ except ImportError:
     print("="*80 + "\n")
     sys.exit(1)
 
+# In-process selection service (giddyup package)
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+try:
+    from giddyup.selections import load_selections
+    SELECTION_SERVICE_AVAILABLE = True
+except ImportError:
+    SELECTION_SERVICE_AVAILABLE = False
+
+# Rate limiting / request weight accounting for every Betfair call
+from utilities.request_governor import GOVERNOR, book_weight
+
+# Injectable clock (BotReplay.py swaps in a ReplayClock to run past days fast)
+try:
+    from giddyup.sim.clock import WallClock
+except ImportError:
+    class WallClock:
+        def now(self, tz=None): return datetime.now(tz)
+        def sleep(self, seconds): time.sleep(seconds)
+
+# Vectorized lay decisions (all open positions in one NumPy call)
+try:
+    from giddyup.backlay import lay_decisions
+    BACKLAY_ENGINE_AVAILABLE = True
+except ImportError:
+    BACKLAY_ENGINE_AVAILABLE = False
+
 # Telegram integration
 try:
     from telegram_bot import send_telegram_message, TELEGRAM_ENABLED
@@ -52,6 +78,7 @@ BST = pytz.timezone("Europe/London")
 RECHECK_INTERVAL = 5  # Check every 5 seconds
 LOG_DIR = Path(__file__).parent / "strategies" / "logs" / "backlay_trades"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
+CLOCK = WallClock()  # Every "now" and sleep in the bot goes through this
 
 # Trading parameters
 MIN_PROFIT_PERCENTAGE = 5.0  # Minimum 5% profit to close trade
@@ -60,7 +87,7 @@ T_MINUS_CASHOUT = 15  # Cash out at T-15 if profitable
 
 def ts():
     """Timestamp in UK time."""
-    return datetime.now(BST).strftime("%Y-%m-%d %H:%M:%S")
+    return CLOCK.now(BST).strftime("%Y-%m-%d %H:%M:%S")
 
 def log(msg, level="INFO"):
     """Log with timestamp and color."""
@@ -85,6 +112,15 @@ def get_selections(date: str, bankroll: float) -> List[Dict]:
     """Load morning selections."""
     log(f"Loading morning selections for {date}...")
     
+    if SELECTION_SERVICE_AVAILABLE:
+        try:
+            selections = [s.to_row() for s in load_selections(date, {None: bankroll})]
+            log(f"Loaded {len(selections)} morning selections", "SUCCESS")
+            return selections
+        except Exception as e:
+            log(f"Selection service failed ({e}) - falling back to RUN_BOTH_STRATEGIES.sh", "WARNING")
+    
+    # Fallback: run the strategy script and filter its CSV
     script = Path(__file__).parent / "strategies" / "RUN_BOTH_STRATEGIES.sh"
     
     try:
@@ -167,11 +203,16 @@ class Betfair:
             return round(random.uniform(5.0, 15.0), 2)
         
         try:
-            book = self.client.betting.list_market_book(
-                market_ids=[market_id],
-                price_projection=price_projection(
-                    price_data=["EX_BEST_OFFERS"]
-                )
+            book = GOVERNOR.call(
+                "listMarketBook",
+                lambda: self.client.betting.list_market_book(
+                    market_ids=[market_id],
+                    price_projection=price_projection(
+                        price_data=["EX_BEST_OFFERS"]
+                    )
+                ),
+                weight=book_weight(1),
+                key=("listMarketBook", market_id)
             )
             
             if book and book[0].runners:
@@ -239,8 +280,52 @@ def should_lay_now(back_odds: float, current_odds: float, minutes_to_off: float)
     
     return False, "No lay opportunity", profit_pct
 
-def run_backlay_bot(date: str, bankroll: float, dry_run: bool = True):
-    """Main back-lay trading bot."""
+def evaluate_positions(batch: List[tuple]) -> List[tuple]:
+    """
+    Lay decisions for every quoted position at once.
+    
+    Args:
+        batch: [(position, current_odds, minutes_to_off), ...]
+        
+    Returns:
+        [(should_lay, reason, profit_pct, profit), ...] in the same order
+    """
+    if not batch:
+        return []
+    
+    if not BACKLAY_ENGINE_AVAILABLE:
+        decisions = []
+        for pos, current_odds, minutes_to_off in batch:
+            should_lay, reason, profit_pct = should_lay_now(pos['back_odds'], current_odds, minutes_to_off)
+            profit = calculate_lay_profit(pos['back_stake'], pos['back_odds'], current_odds)
+            decisions.append((should_lay, reason, profit_pct, profit))
+        return decisions
+    
+    d = lay_decisions(
+        [pos['back_odds'] for pos, _, _ in batch],
+        [pos['back_stake'] for pos, _, _ in batch],
+        [odds for _, odds, _ in batch],
+        [minutes for _, _, minutes in batch],
+        drop_threshold=PRICE_DROP_THRESHOLD,
+        cashout_minutes=T_MINUS_CASHOUT,
+    )
+    return [
+        (bool(d.rule[i]), d.reason(i), float(d.profit_pct[i]), float(d.profit[i]))
+        for i in range(len(batch))
+    ]
+
+def run_backlay_bot(date: str, bankroll: float, dry_run: bool = True,
+                    selections: Optional[List[Dict]] = None, betfair=None):
+    """
+    Main back-lay trading bot.
+    
+    Args:
+        date: Race date (YYYY-MM-DD)
+        bankroll: Bankroll in GBP
+        dry_run: Paper trading only
+        selections: Use these selections instead of loading them (replay)
+        betfair: Use this exchange instead of logging in to Betfair (replay)
+    """
     
     log("=" * 80)
     log(f"🏇 HORSE BACK-LAY TRADING BOT - {date}")
@@ -250,13 +335,15 @@ def run_backlay_bot(date: str, bankroll: float, dry_run: bool = True):
     log("")
     
     # Load selections
-    selections = get_selections(date, bankroll)
+    if selections is None:
+        selections = get_selections(date, bankroll)
     if not selections:
         log("No selections - exiting", "WARNING")
         return
     
     # Setup Betfair
-    betfair = Betfair(dry_run=dry_run)
+    if betfair is None:
+        betfair = Betfair(dry_run=dry_run)
     betfair.login()
     
     # Create daily log
@@ -283,7 +370,7 @@ def run_backlay_bot(date: str, bankroll: float, dry_run: bool = True):
             'selection': sel,
             'back_odds': float(sel['odds']),
             'back_stake': float(sel['stake_gbp']),
-            'backed_at': datetime.now(BST),
+            'backed_at': CLOCK.now(BST),
             'laid': False,
             'best_odds_seen': float(sel['odds']),
             'market_id': None,
@@ -300,12 +387,14 @@ def run_backlay_bot(date: str, bankroll: float, dry_run: bool = True):
     try:
         # Get last race time
         last_time = max(datetime.strptime(s["time"], "%H:%M") for s in selections)
-        today = datetime.now(BST).date()
+        today = CLOCK.now(BST).date()
         end_time = BST.localize(datetime.combine(today, last_time.time())) + timedelta(minutes=30)
         
-        while datetime.now(BST) < end_time:
-            now = datetime.now(BST)
+        while CLOCK.now(BST) < end_time:
+            now = CLOCK.now(BST)
             
+            # Quote every open position first, then decide for all of them at once
+            batch = []
             for key, pos in positions.items():
                 # Skip if already laid
                 if pos['laid']:
@@ -348,12 +437,13 @@ def run_backlay_bot(date: str, bankroll: float, dry_run: bool = True):
                 if current_odds < pos['best_odds_seen']:
                     pos['best_odds_seen'] = current_odds
                 
-                # Check if we should lay
-                should_lay, reason, profit_pct = should_lay_now(
-                    pos['back_odds'],
-                    current_odds,
-                    minutes_to_off
-                )
+                batch.append((pos, current_odds, minutes_to_off))
+            
+            # Check which positions we should lay
+            for (pos, current_odds, minutes_to_off), (should_lay, reason, profit_pct, profit) in zip(
+                batch, evaluate_positions(batch)
+            ):
+                sel = pos['selection']
                 
                 if should_lay:
                     # Calculate lay details
@@ -361,8 +451,6 @@ def run_backlay_bot(date: str, bankroll: float, dry_run: bool = True):
                     back_odds = pos['back_odds']
                     lay_odds = current_odds
                     
-                    profit = calculate_lay_profit(back_stake, back_odds, lay_odds)
-                    
                     # Only lay if profitable
                     if profit > 0:
                         # Calculate lay stake
@@ -415,7 +503,7 @@ Reason: {reason}
                                 log(f"Telegram error: {e}", "WARNING")
             
             # Sleep
-            time.sleep(RECHECK_INTERVAL)
+            CLOCK.sleep(RECHECK_INTERVAL)
         
         # Summary
         log("")
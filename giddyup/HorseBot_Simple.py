@@ -38,6 +38,48 @@ except ImportError:
     print("="*80 + "\n")
     sys.exit(1)
 
+# In-process selection service (giddyup package)
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+try:
+    from giddyup.selections import load_selections
+    SELECTION_SERVICE_AVAILABLE = True
+except ImportError:
+    SELECTION_SERVICE_AVAILABLE = False
+    print("⚠️  giddyup.selections not available - falling back to RUN_BOTH_STRATEGIES.sh")
+
+# Columnar tick archive (best back/lay price + size per runner)
+try:
+    from giddyup.ticks import TickArchiver, compact as compact_ticks
+    TICK_ARCHIVE_AVAILABLE = True
+except ImportError:
+    TICK_ARCHIVE_AVAILABLE = False
+
+# Shared risk ledger (opt-in via RISK_LEDGER_PATH) - exposure across every bot process
+try:
+    from giddyup.risk import load_bot_risk_controls_from_env
+    RISK_LEDGER_AVAILABLE = True
+except ImportError:
+    RISK_LEDGER_AVAILABLE = False
+
+# Injectable clock (BotReplay.py swaps in a ReplayClock to run past days fast)
+try:
+    from giddyup.sim.clock import WallClock
+except ImportError:
+    class WallClock:
+        def now(self, tz=None): return datetime.now(tz)
+        def sleep(self, seconds): time.sleep(seconds)
+
+# Buffered CSV logging (keeps file I/O off the decision loop)
+from utilities.log_writer import (
+    BufferedCSVWriter, open_results_sidecar, record_result, load_action_rows
+)
+
+# Persistent state (resume after restart without re-discovery)
+from utilities.state_store import BotStateStore
+
+# Rate limiting / request weight accounting for every Betfair call
+from utilities.request_governor import GOVERNOR, book_weight, catalogue_weight
+
 # Import result checking functions
 try:
     from results_checker import fetch_results, check_horse_position, calculate_pnl
@@ -64,13 +106,7 @@ except ImportError:
 
 # Stream mode (colorized output for Twitch)
 try:
-    from stream_mode import (
-        Colors, banner, big_announcement, racing_ascii_art,
-        bet_placed_banner, bet_skipped_banner, win_announcement,
-        loss_announcement, market_analysis as stream_market_analysis,
-        selection_card, live_stats, countdown_timer,
-        daily_summary_banner
-    )
+    from stream_mode import Colors, StreamRenderer
     STREAM_MODE_AVAILABLE = True
 except ImportError:
     STREAM_MODE_AVAILABLE = False
@@ -93,8 +129,12 @@ except ImportError:
     def send_win(*args, **kwargs): return False
     def send_loss(*args, **kwargs): return False
 
-# Global stream mode flag
+# Global stream mode flag (RENDERER draws the dashboard while stream mode is on)
 STREAM_MODE = False
+RENDERER = None
+
+# Risk controls backed by the shared ledger (live sessions with RISK_LEDGER_PATH set, GBP limits)
+RISK = None
 
 # ══════════════════════════════════════════════════════════════════════════════
 # HARDCODED CONFIG (Your Betfair credentials)
@@ -122,6 +162,20 @@ LOG_DIR = Path(__file__).parent / "strategies" / "logs" / "automated_bets"
 TWEET_DIR = Path(__file__).parent / "strategies" / "logs" / "tweets"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 TWEET_DIR.mkdir(parents=True, exist_ok=True)
+STATE_DB = LOG_DIR / "bot_state.sqlite3"
+TICK_DIR = Path(__file__).parent / "strategies" / "logs" / "ticks"
+CLOCK = WallClock()           # Every "now" and sleep in the bot goes through this
+
+ACTION_LOG_HEADER = [
+    "timestamp", "race_time", "course", "horse", "strategy",
+    "expected_odds", "min_odds", "actual_odds", "stake",
+    "bet_placed", "bet_id", "reason",
+    "market_id", "selection_id", "result", "pnl_gbp", "telegram_posted"
+]
+PRICE_LOG_HEADER = [
+    "timestamp", "race_time", "course", "horse",
+    "minutes_to_off", "odds", "market_id", "selection_id", "status"
+]
 
 # ══════════════════════════════════════════════════════════════════════════════
 # PROCESS CONTROL FUNCTIONS
@@ -331,14 +385,12 @@ def generate_summary_tweet_file(date: str):
 # ══════════════════════════════════════════════════════════════════════════════
 
 def ts():
-    return datetime.now(BST).strftime("%Y-%m-%d %H:%M:%S")
+    return CLOCK.now(BST).strftime("%Y-%m-%d %H:%M:%S")
 
 def log(msg, level="INFO"):
     """Log message - stream mode aware."""
-    global STREAM_MODE
-    
-    if STREAM_MODE and STREAM_MODE_AVAILABLE:
-        # Colorized output for streaming
+    if RENDERER is not None:
+        # Colorized output for streaming (drawn by the renderer thread)
         color_map = {
             "INFO": Colors.BRIGHT_CYAN,
             "SUCCESS": Colors.BRIGHT_GREEN,
@@ -348,85 +400,114 @@ def log(msg, level="INFO"):
         }
         icons = {"INFO": "ℹ️", "SUCCESS": "✅", "WARNING": "⚠️", "ERROR": "❌", "BET": "💰"}
         color = color_map.get(level, Colors.WHITE)
-        print(f"{color}[{ts()}] {icons.get(level, '•')} {msg}{Colors.RESET}")
+        RENDERER.emit("log", text=f"{color}[{ts()}] {icons.get(level, '•')} {msg}{Colors.RESET}")
     else:
         # Normal output
         icons = {"INFO": "ℹ️", "SUCCESS": "✅", "WARNING": "⚠️", "ERROR": "❌", "BET": "💰"}
         print(f"[{ts()}] {icons.get(level, '•')} {msg}")
 
+def stream_event(kind: str, **data):
+    """Hand an event to the stream dashboard (no-op outside stream mode, never blocks)."""
+    if RENDERER is not None:
+        RENDERER.emit(kind, **data)
+
+def stop_stream():
+    """Draw the last dashboard frame and return the terminal to plain logging."""
+    global RENDERER
+    if RENDERER is not None:
+        RENDERER.stop()
+        RENDERER = None
+
 # ══════════════════════════════════════════════════════════════════════════════
 # LOAD SELECTIONS FROM DATABASE
 # ══════════════════════════════════════════════════════════════════════════════
 
 def get_selections(date: str, bankrolls: dict) -> List[Dict]:
     """
-    Load selections by running the RUN_BOTH_STRATEGIES.sh script.
+    Load selections for both strategies.
+    
+    Uses the in-process selection service (one DB query, times converted
+    to UK time); falls back to RUN_BOTH_STRATEGIES.sh if the giddyup
+    package isn't installed or the service can't load (PG_DSN unset,
+    database unreachable).
     
     Args:
         date: Date in YYYY-MM-DD format
         bankrolls: Dict with {strategy: bankroll} or {None: bankroll}
     """
-    # Convert bankrolls dict to single value for script
     if None in bankrolls:
-        total_bankroll = bankrolls[None]
-        log(f"Loading selections for {date} (£{total_bankroll} bankroll)...")
+        log(f"Loading selections for {date} (£{bankrolls[None]} bankroll)...")
     else:
-        # Use total of both strategies
-        total_bankroll = sum(bankrolls.values())
         log(f"Loading selections for {date}...")
         for strat, amount in bankrolls.items():
             log(f"  Strategy {strat}: £{amount}")
     
+    selections = None
+    if SELECTION_SERVICE_AVAILABLE:
+        try:
+            selections = [s.to_row() for s in load_selections(date, bankrolls)]
+            log(f"Loaded {len(selections)} selections (UK times)", "SUCCESS")
+        except Exception as e:
+            log(f"Selection service failed ({e}) - falling back to RUN_BOTH_STRATEGIES.sh", "WARNING")
+    
+    if selections is None:
+        try:
+            selections = get_selections_from_script(date, bankrolls)
+            log(f"Loaded {len(selections)} selections (times corrected +1hr)", "SUCCESS")
+        except Exception as e:
+            log(f"Error loading selections: {e}", "ERROR")
+            return []
+    
+    # Send morning picks to Telegram
+    if selections and TELEGRAM_ENABLED:
+        try:
+            send_morning_picks(date, selections)
+            log("📱 Sent morning picks to Telegram", "SUCCESS")
+        except Exception as e:
+            log(f"Telegram error: {e}", "WARNING")
+    
+    return selections
+
+def get_selections_from_script(date: str, bankrolls: dict) -> List[Dict]:
+    """Legacy loader: run RUN_BOTH_STRATEGIES.sh and filter its CSV by date."""
+    # Script takes a single bankroll - use total of both strategies
+    total_bankroll = bankrolls[None] if None in bankrolls else sum(bankrolls.values())
+    
     script = Path(__file__).parent / "strategies" / "RUN_BOTH_STRATEGIES.sh"
+    subprocess.run(
+        [str(script), date, str(int(total_bankroll))],
+        capture_output=True,
+        text=True,
+        cwd=script.parent,
+        timeout=60
+    )
     
-    try:
-        subprocess.run(
-            [str(script), date, str(int(total_bankroll))],
-            capture_output=True,
-            text=True,
-            cwd=script.parent,
-            timeout=60
-        )
-        
-        # Read from CSV
-        csv_file = script.parent / "logs" / "daily_bets" / "betting_log_2025.csv"
-        selections = []
-        
-        with csv_file.open() as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row["date"] == date:
-                    # FIX: Database times are 1 hour behind UK time - add 1 hour
-                    db_time = datetime.strptime(row["time"], "%H:%M")
-                    corrected_time = db_time + timedelta(hours=1)
-                    row["time"] = corrected_time.strftime("%H:%M")
-                    row["original_db_time"] = db_time.strftime("%H:%M")
-                    selections.append(row)
-        
-        log(f"Loaded {len(selections)} selections (times corrected +1hr)", "SUCCESS")
-        
-        # Send morning picks to Telegram
-        if selections and TELEGRAM_ENABLED:
-            try:
-                send_morning_picks(date, selections)
-                log("📱 Sent morning picks to Telegram", "SUCCESS")
-            except Exception as e:
-                log(f"Telegram error: {e}", "WARNING")
-        
-        return selections
-        
-    except Exception as e:
-        log(f"Error loading selections: {e}", "ERROR")
-        return []
+    # Read from CSV
+    csv_file = script.parent / "logs" / "daily_bets" / "betting_log_2025.csv"
+    selections = []
+    
+    with csv_file.open() as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            if row["date"] == date:
+                # FIX: Database times are 1 hour behind UK time - add 1 hour
+                db_time = datetime.strptime(row["time"], "%H:%M")
+                corrected_time = db_time + timedelta(hours=1)
+                row["time"] = corrected_time.strftime("%H:%M")
+                row["original_db_time"] = db_time.strftime("%H:%M")
+                selections.append(row)
+    
+    return selections
 
 # ══════════════════════════════════════════════════════════════════════════════
 # BETFAIR
 # ══════════════════════════════════════════════════════════════════════════════
 
 class Betfair:
-    def __init__(self, dry_run=True):
+    def __init__(self, dry_run=True, ticks=None):
         self.dry_run = dry_run
         self.client = None
+        self.ticks = ticks  # Optional TickArchiver - every fetched book is archived
     
     def login(self):
         if self.dry_run:
@@ -460,20 +541,26 @@ class Betfair:
         try:
             # Parse race time
             naive_dt = datetime.strptime(f"{race_time}", "%H:%M")
-            today = datetime.now(BST).date()
+            today = CLOCK.now(BST).date()
             race_dt = BST.localize(datetime.combine(today, naive_dt.time()))
             
             time_from = (race_dt - timedelta(minutes=15)).isoformat()
             time_to = (race_dt + timedelta(minutes=15)).isoformat()
             
-            markets = self.client.betting.list_market_catalogue(
-                filter=market_filter(
-                    event_type_ids=["7"],
-                    market_type_codes=["WIN"],
-                    market_start_time=time_range(from_=time_from, to=time_to),
+            projection = ["EVENT", "RUNNER_DESCRIPTION"]
+            markets = GOVERNOR.call(
+                "listMarketCatalogue",
+                lambda: self.client.betting.list_market_catalogue(
+                    filter=market_filter(
+                        event_type_ids=["7"],
+                        market_type_codes=["WIN"],
+                        market_start_time=time_range(from_=time_from, to=time_to),
+                    ),
+                    max_results=100,
+                    market_projection=projection
                 ),
-                max_results=100,
-                market_projection=["EVENT", "RUNNER_DESCRIPTION"]
+                weight=catalogue_weight(100, projection),
+                key=("listMarketCatalogue", time_from, time_to)
             )
             
             # Try to match markets
@@ -520,12 +607,20 @@ class Betfair:
         
         try:
             proj = price_projection(price_data=["EX_BEST_OFFERS"])
-            books = self.client.betting.list_market_book([market_id], proj)
+            books = GOVERNOR.call(
+                "listMarketBook",
+                lambda: self.client.betting.list_market_book([market_id], proj),
+                weight=book_weight(1),
+                key=("listMarketBook", market_id)
+            )
             
             if not books:
                 return None
             
             book = books[0]
+            if self.ticks:
+                self.ticks.record_book(book)
+            
             if book.total_matched < MIN_LIQUIDITY:
                 log(f"   Low liquidity: £{book.total_matched:.0f}", "WARNING")
                 return None
@@ -553,7 +648,7 @@ class Betfair:
         log(f"   Return: £{stake * odds:.2f} | Profit: £{stake * (odds - 1):.2f}")
         
         if self.dry_run:
-            bet_id = f"DRY_{int(time.time())}"
+            bet_id = f"DRY_{int(CLOCK.now(BST).timestamp())}"
             log(f"   DRY RUN - Not actually placed (ID: {bet_id})", "WARNING")
             log("=" * 80)
             return bet_id
@@ -566,7 +661,10 @@ class Betfair:
                 limit_order=limit_order(size=stake, price=odds, persistence_type="PERSIST")
             )
             
-            report = self.client.betting.place_orders(market_id=market_id, instructions=[instruction])
+            report = GOVERNOR.call(
+                "placeOrders",
+                lambda: self.client.betting.place_orders(market_id=market_id, instructions=[instruction])
+            )
             
             if report and report.status == "SUCCESS":
                 for rep in report.place_instruction_reports:
@@ -588,49 +686,31 @@ class Betfair:
 # RESULT CHECKING
 # ══════════════════════════════════════════════════════════════════════════════
 
-def check_and_post_results(action_log: Path, date: str, race_results: dict) -> int:
+def check_and_post_results(action_log: Path, date: str, race_results: dict,
+                           results_log: BufferedCSVWriter) -> int:
     """
     Check for finished races and post results to Telegram.
+    
+    Results are appended to the results sidecar - the action log itself
+    is never rewritten.
     Returns number of new results posted.
     """
     if not RESULTS_CHECKER_AVAILABLE:
         return 0
     
     new_results = 0
-    updated_rows = []
     
-    # Read all bets from CSV
-    with action_log.open('r') as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames
-        rows = list(reader)
-    
-    # Ensure required fields exist
-    if 'result' not in fieldnames:
-        fieldnames = list(fieldnames) + ['result']
-    if 'pnl_gbp' not in fieldnames:
-        fieldnames = list(fieldnames) + ['pnl_gbp']
-    if 'telegram_posted' not in fieldnames:
-        fieldnames = list(fieldnames) + ['telegram_posted']
+    # Read all bets (with any results already in the sidecar)
+    rows = load_action_rows(action_log)
     
     # Check each bet
     for row in rows:
-        # Initialize new fields if they don't exist
-        if 'result' not in row:
-            row['result'] = ''
-        if 'pnl_gbp' not in row:
-            row['pnl_gbp'] = ''
-        if 'telegram_posted' not in row:
-            row['telegram_posted'] = ''
-        
         # Skip if already has result
         if row.get('result') in ['WIN', 'LOSS']:
-            updated_rows.append(row)
             continue
         
         # Skip if not a placed bet
         if row.get('bet_placed') not in ['DRY_RUN', 'EXECUTED']:
-            updated_rows.append(row)
             continue
         
         # Check if result available
@@ -645,13 +725,12 @@ def check_and_post_results(action_log: Path, date: str, race_results: dict) -> i
             odds = float(row.get('actual_odds', row.get('expected_odds', 0)))
             stake = float(row.get('stake', 0))
             pnl = calculate_pnl(result, odds, stake)
-            
-            # Update the row
-            row['result'] = result
-            row['pnl_gbp'] = str(pnl)
-            row['telegram_posted'] = 'YES'
+            if RISK is not None:
+                RISK.ledger.record_settlement(f"{date}:{race_time}_{horse}", pnl)
+            stream_event("result", key=f"{race_time}_{horse}", horse=horse, course=course, pnl=pnl)
             
             # Post to Telegram
+            posted = False
             if TELEGRAM_ENABLED:
                 try:
                     send_result(
@@ -665,34 +744,49 @@ def check_and_post_results(action_log: Path, date: str, race_results: dict) -> i
                         strategy=row.get('strategy', 'Unknown')
                     )
                     log(f"   📱 Posted {result} to Telegram: {horse} @ {course}", "SUCCESS")
+                    posted = True
                     new_results += 1
                 except Exception as e:
                     log(f"   Telegram error: {e}", "WARNING")
-        
-        updated_rows.append(row)
-    
-    # Write back to CSV if any results were updated
-    if new_results > 0:
-        with action_log.open('w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(updated_rows)
+            
+            # Append to results sidecar
+            record_result(results_log, row, result, pnl, telegram_posted=posted)
     
     return new_results
 
+def close_ticks(ticks, date: str):
+    """Flush the tick archive and merge the day's part files into ticks.parquet."""
+    ticks.close()
+    try:
+        compact_ticks(TICK_DIR, date)
+    except Exception as e:
+        log(f"Tick compaction failed for {date}: {e}", "WARNING")
+
 # ══════════════════════════════════════════════════════════════════════════════
 # MAIN BOT
 # ══════════════════════════════════════════════════════════════════════════════
 
-def run_bot(date: str, bankrolls: dict, live: bool = False, stream: bool = False):
-    """Run the bot."""
-    global STREAM_MODE
+def run_bot(date: str, bankrolls: dict, live: bool = False, stream: bool = False,
+            selections: Optional[List[Dict]] = None, betfair: Optional[Any] = None):
+    """
+    Run the bot.
+    
+    Args:
+        date: Race date (YYYY-MM-DD)
+        bankrolls: {strategy: bankroll} (or {None: bankroll})
+        live: Place real bets
+        stream: Colorized stream output
+        selections: Use these selections instead of loading them (replay)
+        betfair: Use this exchange instead of logging in to Betfair (replay) -
+                 ticks are not archived and results/reports are left to the caller
+    """
+    global STREAM_MODE, RENDERER, RISK
     STREAM_MODE = stream
     
-    # Stream mode intro
+    # Stream mode: the dashboard is drawn by its own thread
     if STREAM_MODE and STREAM_MODE_AVAILABLE:
-        print(racing_ascii_art())
-        time.sleep(0.5)
+        RENDERER = StreamRenderer()
+        RENDERER.start(date, "🔴 LIVE" if live else "🟢 DRY RUN")
     
     log("=" * 80)
     log(f"🏇 HORSEBOT - {date}")
@@ -716,54 +810,44 @@ def run_bot(date: str, bankrolls: dict, live: bool = False, stream: bool = False
     log("")
     
     # Load selections
-    selections = get_selections(date, bankrolls)
+    if selections is None:
+        selections = get_selections(date, bankrolls)
     if not selections:
         log("No selections - exiting", "WARNING")
+        stop_stream()
         return
     
-    # Stream mode: Show daily summary banner
+    # Stream mode: Today's card
     if STREAM_MODE and STREAM_MODE_AVAILABLE:
         total_stake = sum(float(s['stake_gbp']) for s in selections)
-        print(daily_summary_banner(date, len(selections), total_stake))
-        
-        # Show each selection as a card
-        for i, sel in enumerate(selections, 1):
-            print(selection_card(
-                i, sel['horse'], sel['course'], sel['time'],
-                float(sel['odds']), float(sel['stake_gbp']),
-                sel['strategy'], sel['reasoning']
-            ))
-            time.sleep(0.3)  # Dramatic pause
+        stream_event("card", date=date, selections=selections)
         
         # Send to Twitch chat
         if TWITCH_ENABLED:
             twitch_morning(date, len(selections), total_stake)
     
     # Setup
-    betfair = Betfair(dry_run=not live)
+    replay = betfair is not None
+    ticks = TickArchiver(TICK_DIR) if TICK_ARCHIVE_AVAILABLE and not replay else None
+    if betfair is None:
+        betfair = Betfair(dry_run=not live, ticks=ticks)
     betfair.login()
     
-    # Log files
+    # Log files (buffered - written by background threads)
     action_log = LOG_DIR / f"bot_actions_{date}.csv"
     price_log = LOG_DIR / f"bot_prices_{date}.csv"
+    action_writer = BufferedCSVWriter(action_log, ACTION_LOG_HEADER)
+    price_writer = BufferedCSVWriter(price_log, PRICE_LOG_HEADER)
+    results_writer = open_results_sidecar(action_log)
     
-    if not action_log.exists():
-        with action_log.open("w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                "timestamp", "race_time", "course", "horse", "strategy",
-                "expected_odds", "min_odds", "actual_odds", "stake",
-                "bet_placed", "bet_id", "reason",
-                "market_id", "selection_id", "result", "pnl_gbp", "telegram_posted"
-            ])
+    # Persistent state - dry runs are kept apart so they never block a live session
+    state = BotStateStore(STATE_DB, date, "HorseBot" if live else "HorseBot-DRY")
     
-    if not price_log.exists():
-        with price_log.open("w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                "timestamp", "race_time", "course", "horse",
-                "minutes_to_off", "odds", "market_id", "selection_id", "status"
-            ])
+    # Shared risk ledger - live only, so dry runs never use up real limits
+    if RISK_LEDGER_AVAILABLE and live and not replay and os.getenv("RISK_LEDGER_PATH"):
+        RISK = load_bot_risk_controls_from_env(date)    # GBP limits (BOT_* settings)
+        day = RISK.ledger.day_totals()
+        log(f"🛡️  Risk ledger: {day.bets} bet(s), £{day.stake:.2f} staked, £{day.pnl:+.2f} P&L today")
     
     try:
         log("Starting monitoring loop...")
@@ -772,18 +856,27 @@ def run_bot(date: str, bankrolls: dict, live: bool = False, stream: bool = False
         log("   (Betting window: T-65 to T-55, stops at T-1 before race)")
         log("")
         
-        bet_placed = set()  # Races we've placed bets on
-        market_cache = {}   # Store market IDs to avoid repeated lookups
-        results_checked = set()  # Races we've checked results for
-        last_result_check = datetime.now(BST) - timedelta(minutes=10)  # Last time we checked results
+        # Restore anything already resolved/decided today
+        resumed = state.load()
+        bet_placed = resumed.decided  # Races we've made a decision on
+        market_cache = dict(resumed.markets)  # Store market IDs to avoid repeated lookups
+        results_checked = set(resumed.results_checked)  # Races we've checked results for
+        
+        if resumed.markets or resumed.decisions:
+            log(f"♻️  Resumed state: {len(market_cache)} market(s), {len(bet_placed)} decision(s), "
+                f"{len(results_checked)} result check(s)")
+        for key in resumed.pending:
+            log(f"⚠️  {key}: bet was being placed when the bot stopped - check Betfair manually", "WARNING")
+        
+        last_result_check = CLOCK.now(BST) - timedelta(minutes=10)  # Last time we checked results
         
         # Get last race time
         last_time = max(datetime.strptime(s["time"], "%H:%M") for s in selections)
-        today = datetime.now(BST).date()
+        today = CLOCK.now(BST).date()
         end_time = BST.localize(datetime.combine(today, last_time.time())) + timedelta(minutes=30)
         
-        while datetime.now(BST) < end_time:
-            now = datetime.now(BST)
+        while CLOCK.now(BST) < end_time:
+            now = CLOCK.now(BST)
             
             for sel in selections:
                 key = f"{sel['time']}_{sel['horse']}"
@@ -820,15 +913,14 @@ def run_bot(date: str, bankrolls: dict, live: bool = False, stream: bool = False
                     if not market_info:
                         log(f"   ❌ Market not found", "WARNING")
                         # Log to price tracking that we couldn't find market
-                        with price_log.open("a", newline="") as f:
-                            writer = csv.writer(f)
-                            writer.writerow([
-                                ts(), sel["time"], sel["course"], sel["horse"],
-                                f"{minutes_to_off:.1f}", "", "", "", "MARKET_NOT_FOUND"
-                            ])
+                        price_writer.write([
+                            ts(), sel["time"], sel["course"], sel["horse"],
+                            f"{minutes_to_off:.1f}", "", "", "", "MARKET_NOT_FOUND"
+                        ])
                         continue
                     
                     market_cache[key] = market_info
+                    state.record_market(key, *market_info)
                 
                 market_id, sel_id = market_cache[key]
                 
@@ -838,6 +930,7 @@ def run_bot(date: str, bankrolls: dict, live: bool = False, stream: bool = False
                 # Log odds lookup result
                 if current_odds:
                     log(f"   💱 Odds: {current_odds:.2f}")
+                    stream_event("price", key=key, odds=current_odds, minutes=minutes_to_off)
                 
                 # Log price to tracking file
                 if minutes_to_off > T_MINUS_BET_WINDOW:
@@ -846,14 +939,12 @@ def run_bot(date: str, bankrolls: dict, live: bool = False, stream: bool = False
                     status = "BET_WINDOW"
                 else:
                     status = "TOO_LATE"
-                with price_log.open("a", newline="") as f:
-                    writer = csv.writer(f)
-                    writer.writerow([
-                        ts(), sel["time"], sel["course"], sel["horse"],
-                        f"{minutes_to_off:.1f}", 
-                        f"{current_odds:.2f}" if current_odds else "",
-                        market_id, sel_id, status
-                    ])
+                price_writer.write([
+                    ts(), sel["time"], sel["course"], sel["horse"],
+                    f"{minutes_to_off:.1f}", 
+                    f"{current_odds:.2f}" if current_odds else "",
+                    market_id, sel_id, status
+                ])
                 
                 if not current_odds:
                     continue
@@ -905,11 +996,8 @@ def run_bot(date: str, bankrolls: dict, live: bool = False, stream: bool = False
                         log("=" * 80)
                         
                         # Stream mode: Show skip banner
-                        if STREAM_MODE and STREAM_MODE_AVAILABLE:
-                            print(bet_skipped_banner(
-                                sel["horse"], sel["course"], reason,
-                                current_odds, min_odds
-                            ))
+                        stream_event("skipped", key=key, horse=sel["horse"], course=sel["course"],
+                                     reason=reason, current=current_odds, needed=min_odds)
                         
                         # Send to Twitch chat
                         if TWITCH_ENABLED:
@@ -931,14 +1019,13 @@ def run_bot(date: str, bankrolls: dict, live: bool = False, stream: bool = False
                             except Exception as e:
                                 log(f"Telegram error: {e}", "WARNING")
                         
-                        with action_log.open("a", newline="") as f:
-                            writer = csv.writer(f)
-                            writer.writerow([
-                                ts(), sel["time"], sel["course"], sel["horse"], sel["strategy"],
-                                sel["odds"], sel["min_odds_needed"], current_odds, sel["stake_gbp"],
-                                "NO", "", reason, market_id, sel_id, "", "", ""
-                            ])
+                        action_writer.write([
+                            ts(), sel["time"], sel["course"], sel["horse"], sel["strategy"],
+                            sel["odds"], sel["min_odds_needed"], current_odds, sel["stake_gbp"],
+                            "NO", "", reason, market_id, sel_id, "", "", ""
+                        ])
                         
+                        state.record_decision(key, "SKIPPED", odds=current_odds, reason=reason)
                         bet_placed.add(key)
                         continue
                     
@@ -948,11 +1035,8 @@ def run_bot(date: str, bankrolls: dict, live: bool = False, stream: bool = False
                         log("=" * 80)
                         
                         # Stream mode: Show skip banner
-                        if STREAM_MODE and STREAM_MODE_AVAILABLE:
-                            print(bet_skipped_banner(
-                                sel["horse"], sel["course"], reason,
-                                current_odds, min_odds
-                            ))
+                        stream_event("skipped", key=key, horse=sel["horse"], course=sel["course"],
+                                     reason=reason, current=current_odds, needed=min_odds)
                         
                         # Send to Twitch chat
                         if TWITCH_ENABLED:
@@ -974,34 +1058,57 @@ def run_bot(date: str, bankrolls: dict, live: bool = False, stream: bool = False
                             except Exception as e:
                                 log(f"Telegram error: {e}", "WARNING")
                         
-                        with action_log.open("a", newline="") as f:
-                            writer = csv.writer(f)
-                            writer.writerow([
+                        action_writer.write([
+                            ts(), sel["time"], sel["course"], sel["horse"], sel["strategy"],
+                            sel["odds"], sel["min_odds_needed"], current_odds, sel["stake_gbp"],
+                            "NO", "", reason, market_id, sel_id, "", "", ""
+                        ])
+                        
+                        state.record_decision(key, "SKIPPED", odds=current_odds, reason=reason)
+                        bet_placed.add(key)
+                        continue
+                    
+                    # Reserve the exposure in the shared ledger before the order goes out
+                    ledger_id = f"{date}:{key}"
+                    if RISK is not None:
+                        check = RISK.place(ledger_id, market_id, float(sel["stake_gbp"]),
+                                           sel["strategy"], odds=current_odds)
+                        if not check["recorded"]:
+                            reason = f"Risk limit: {check.get('reason') or 'already in ledger'}"
+                            log(f"⏭️  SKIP BET: {reason}", "WARNING")
+                            log("=" * 80)
+                            
+                            action_writer.write([
                                 ts(), sel["time"], sel["course"], sel["horse"], sel["strategy"],
                                 sel["odds"], sel["min_odds_needed"], current_odds, sel["stake_gbp"],
                                 "NO", "", reason, market_id, sel_id, "", "", ""
                             ])
+                            
+                            state.record_decision(key, "SKIPPED", odds=current_odds, reason=reason)
+                            bet_placed.add(key)
+                            continue
                         
-                        bet_placed.add(key)
-                        continue
+                        if check["stake"] < float(sel["stake_gbp"]):
+                            log(f"🛡️  Stake trimmed to £{check['stake']:.2f} by risk limits", "WARNING")
+                            sel["stake_gbp"] = round(check["stake"], 2)
                     
                     # Place bet!
                     log(f"✅ ALL CONDITIONS MET", "SUCCESS")
                     log("")
                     
-                    # Stream mode: Show exciting bet banner
-                    if STREAM_MODE and STREAM_MODE_AVAILABLE:
-                        profit_potential = (current_odds - 1) * float(sel["stake_gbp"])
-                        print(bet_placed_banner(
-                            sel["horse"], sel["course"], current_odds,
-                            float(sel["stake_gbp"]), profit_potential
-                        ))
+                    # Record intent first - a crash mid-placement must not lead to a second bet
+                    state.record_decision(key, "PENDING", odds=current_odds, stake=float(sel["stake_gbp"]))
                     
                     bet_id = betfair.place_bet(
                         market_id, sel_id, current_odds, 
                         float(sel["stake_gbp"]), sel["horse"]
                     )
                     
+                    # Stream mode: Show exciting bet banner
+                    stream_event("placed", key=key, horse=sel["horse"], course=sel["course"],
+                                 odds=current_odds, stake=float(sel["stake_gbp"]), bet_id=bet_id,
+                                 profit=(current_odds - 1) * float(sel["stake_gbp"]))
+                    
                     # Send to Twitch chat
                     if bet_id and TWITCH_ENABLED:
                         profit_potential = (current_odds - 1) * float(sel["stake_gbp"])
@@ -1042,24 +1149,26 @@ def run_bot(date: str, bankrolls: dict, live: bool = False, stream: bool = False
                         bet_status = "DRY_RUN" if betfair.dry_run else "EXECUTED"
                         reason = f"{bet_status} @ {current_odds:.2f}"
                         
-                        with action_log.open("a", newline="") as f:
-                            writer = csv.writer(f)
-                            writer.writerow([
-                                ts(), sel["time"], sel["course"], sel["horse"], sel["strategy"],
-                                sel["odds"], sel["min_odds_needed"], current_odds, sel["stake_gbp"],
-                                bet_status, bet_id, reason, market_id, sel_id, "", "", ""
-                            ])
+                        action_writer.write([
+                            ts(), sel["time"], sel["course"], sel["horse"], sel["strategy"],
+                            sel["odds"], sel["min_odds_needed"], current_odds, sel["stake_gbp"],
+                            bet_status, bet_id, reason, market_id, sel_id, "", "", ""
+                        ])
                     else:
                         reason = "Bet placement failed"
+                        if RISK is not None:
+                            RISK.ledger.void(ledger_id)
                         
-                        with action_log.open("a", newline="") as f:
-                            writer = csv.writer(f)
-                            writer.writerow([
-                                ts(), sel["time"], sel["course"], sel["horse"], sel["strategy"],
-                                sel["odds"], sel["min_odds_needed"], current_odds, sel["stake_gbp"],
-                                "FAILED", "", reason, market_id, sel_id, "", "", ""
-                            ])
+                        action_writer.write([
+                            ts(), sel["time"], sel["course"], sel["horse"], sel["strategy"],
+                            sel["odds"], sel["min_odds_needed"], current_odds, sel["stake_gbp"],
+                            "FAILED", "", reason, market_id, sel_id, "", "", ""
+                        ])
                     
+                    state.record_decision(
+                        key, "PLACED" if bet_id else "FAILED", bet_id=bet_id,
+                        odds=current_odds, stake=float(sel["stake_gbp"]), reason=reason
+                    )
                     bet_placed.add(key)
             
             # Check if done betting (all races either bet on or passed T-60)
@@ -1070,7 +1179,7 @@ def run_bot(date: str, bankrolls: dict, live: bool = False, stream: bool = False
             
             # Check for race results (every 5 minutes, for races that finished 10+ mins ago)
             time_since_last_check = (now - last_result_check).total_seconds() / 60
-            if RESULTS_CHECKER_AVAILABLE and time_since_last_check >= 5:
+            if RESULTS_CHECKER_AVAILABLE and not replay and time_since_last_check >= 5:
                 # Check which races should have results by now (finished 10+ mins ago)
                 races_to_check = []
                 for sel in selections:
@@ -1095,8 +1204,12 @@ def run_bot(date: str, bankrolls: dict, live: bool = False, stream: bool = False
                     race_results = fetch_results(date)
                     
                     if race_results:
+                        # Make sure queued decisions are on disk before reading them back
+                        action_writer.flush()
+                        results_writer.flush()
+                        
                         # Check and post results
-                        new_results = check_and_post_results(action_log, date, race_results)
+                        new_results = check_and_post_results(action_log, date, race_results, results_writer)
                         
                         if new_results > 0:
                             log(f"   ✅ Posted {new_results} new result(s) to Telegram", "SUCCESS")
@@ -1105,11 +1218,28 @@ def run_bot(date: str, bankrolls: dict, live: bool = False, stream: bool = False
                         for sel in races_to_check:
                             key = f"{sel['time']}_{sel['horse']}"
                             results_checked.add(key)
+                            state.record_result_checked(key)
                 
                 last_result_check = now
             
             # Sleep
-            time.sleep(RECHECK_INTERVAL)
+            CLOCK.sleep(RECHECK_INTERVAL)
+        
+        # Last results pass - races that finished near the end of the session
+        # would otherwise stay open in the risk ledger
+        if RESULTS_CHECKER_AVAILABLE and not replay and len(results_checked) < len(bet_placed):
+            race_results = fetch_results(date)
+            if race_results:
+                action_writer.flush()
+                results_writer.flush()
+                new_results = check_and_post_results(action_log, date, race_results, results_writer)
+                if new_results > 0:
+                    log(f"✅ Posted {new_results} new result(s) to Telegram", "SUCCESS")
+        
+        # Flush and fsync logs before reading them back
+        action_writer.close()
+        price_writer.close()
+        results_writer.close()
         
         # Summary
         log("")
@@ -1121,6 +1251,10 @@ def run_bot(date: str, bankrolls: dict, live: bool = False, stream: bool = False
         log(f"Price tracking log: {price_log}")
         log("")
         
+        # Betfair request stats (calls, weight, throttling, latency)
+        for line in GOVERNOR.report().splitlines():
+            log(f"📡 {line}")
+        
         # Show some price movement stats
         with price_log.open() as f:
             reader = csv.DictReader(f)
@@ -1131,6 +1265,9 @@ def run_bot(date: str, bankrolls: dict, live: bool = False, stream: bool = False
                 log(f"Horses tracked: {len(horses)}")
         log("")
         
+        if replay:
+            return
+        
         # Generate Excel report
         log("📊 Generating Excel report...")
         try:
@@ -1156,7 +1293,17 @@ def run_bot(date: str, bankrolls: dict, live: bool = False, stream: bool = False
             log(f"Could not generate summary tweet file: {e}", "WARNING")
         
     finally:
+        action_writer.close()
+        price_writer.close()
+        results_writer.close()
+        state.close()
+        if RISK is not None:
+            RISK.ledger.close()
+            RISK = None
+        if ticks:
+            close_ticks(ticks, date)
         betfair.logout()
+        stop_stream()
 
 # ══════════════════════════════════════════════════════════════════════════════
 # CLI
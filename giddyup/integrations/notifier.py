@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Notification Dispatcher
+
+Telegram and Twitch messages are queued and sent by background workers,
+so a slow or unreachable service never delays a price check or a bet.
+
+- One bounded queue + worker thread per channel (a Twitch outage doesn't
+  hold up Telegram). When a queue is full new messages are dropped, never
+  blocked on.
+- Per-channel rate limits (token bucket).
+- Retries with exponential backoff, honouring Telegram's retry_after.
+- Messages that pile up while a channel is rate limited are coalesced into
+  one digest message.
+
+Usage:
+    from integrations.notifier import DISPATCHER
+
+    DISPATCHER.register("telegram", send_fn, rate=20 / 60, burst=3)
+    DISPATCHER.submit("telegram", "🎯 BET PLACED ...")   # Returns immediately
+"""
+
+import atexit
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class RetryAfter(Exception):
+    """Raised by a sender when the service asks us to wait before retrying."""
+
+    def __init__(self, seconds: float):
+        super().__init__(f"retry after {seconds}s")
+        self.seconds = seconds
+
+
+class Channel:
+    """One destination: its queue, limiter and worker thread."""
+
+    def __init__(self, name: str, send: Callable[[str], bool], rate: float, burst: int,
+                 max_queue: int, max_retries: int, joiner: str, max_chars: int):
+        self.name = name
+        self.send = send
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.joiner = joiner
+        self.max_chars = max_chars
+
+        self.queue: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=max_queue)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.stats = {"queued": 0, "dropped": 0, "sent": 0, "digests": 0, "failed": 0, "retries": 0}
+
+        self.thread = threading.Thread(target=self._run, name=f"notify-{name}", daemon=True)
+        self.thread.start()
+
+    # ------------------------------------------------------------------
+
+    def _wait_for_token(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            time.sleep((1 - self.tokens) / self.rate)
+
+    def _coalesce(self, first: str) -> List[List[str]]:
+        """Take whatever else is queued, split into digests of up to max_chars."""
+        batches, batch, size = [], [first], len(first)
+        while True:
+            try:
+                nxt = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if nxt is None:
+                self.queue.put_nowait(None)     # Keep the stop marker for the loop
+                break
+            if size + len(self.joiner) + len(nxt) > self.max_chars:
+                batches.append(batch)
+                batch, size = [nxt], len(nxt)
+                continue
+            batch.append(nxt)
+            size += len(self.joiner) + len(nxt)
+        batches.append(batch)
+        return batches
+
+    def _deliver(self, batch: List[str]):
+        if not batch:
+            return
+        message = batch[0] if len(batch) == 1 else self.joiner.join(batch)
+        if len(batch) > 1:
+            self.stats["digests"] += 1
+
+        delay = 1.0
+        for attempt in range(self.max_retries + 1):
+            try:
+                if self.send(message):
+                    self.stats["sent"] += len(batch)
+                    return
+            except RetryAfter as e:
+                delay = max(delay, e.seconds)
+            except Exception as e:
+                print(f"{self.name} error: {e}")
+
+            if attempt < self.max_retries:
+                self.stats["retries"] += 1
+                time.sleep(delay)
+                delay = min(delay * 2, 60.0)
+
+        self.stats["failed"] += len(batch)
+
+    def _run(self):
+        while True:
+            first = self.queue.get()
+            if first is None:
+                return
+            self._wait_for_token()              # Messages arriving meanwhile get coalesced
+            for i, batch in enumerate(self._coalesce(first)):
+                if i:
+                    self._wait_for_token()      # Every digest is one rate-limited send
+                self._deliver(batch)
+
+
+class NotificationDispatcher:
+    """Registry of channels; submit() never blocks."""
+
+    def __init__(self):
+        self._channels: Dict[str, Channel] = {}
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def register(self, name: str, send: Callable[[str], bool], rate: float = 1.0,
+                 burst: int = 3, max_queue: int = 500, max_retries: int = 3,
+                 joiner: str = "\n\n", max_chars: int = 4000) -> Channel:
+        """
+        Add a channel (idempotent - the first registration wins).
+
+        Args:
+            name: Channel name ("telegram", "twitch")
+            send: Blocking sender; returns True on success, may raise RetryAfter
+            rate: Messages per second allowed
+            burst: Messages that may go out back-to-back
+            max_queue: Queued messages before new ones are dropped
+            max_retries: Attempts after the first failure
+            joiner: Separator between coalesced messages
+            max_chars: Longest digest the service accepts
+        """
+        with self._lock:
+            if name not in self._channels:
+                self._channels[name] = Channel(name, send, rate, burst, max_queue,
+                                               max_retries, joiner, max_chars)
+            return self._channels[name]
+
+    def submit(self, name: str, message: str) -> bool:
+        """Queue a message. False if the channel is unknown or its queue is full."""
+        channel = self._channels.get(name)
+        if channel is None:
+            return False
+        try:
+            channel.queue.put_nowait(message)
+        except queue.Full:
+            channel.stats["dropped"] += 1
+            return False
+        channel.stats["queued"] += 1
+        return True
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {name: dict(ch.stats) for name, ch in self._channels.items()}
+
+    def close(self, timeout: float = 5.0):
+        """Let workers drain their queues (up to `timeout` seconds in total)."""
+        deadline = time.monotonic() + timeout
+        for channel in list(self._channels.values()):
+            try:
+                channel.queue.put_nowait(None)
+            except queue.Full:
+                continue
+        for channel in list(self._channels.values()):
+            channel.thread.join(max(0.0, deadline - time.monotonic()))
+
+
+# Shared by telegram_bot and twitch_bot
+DISPATCHER = NotificationDispatcher()
@@ -4,9 +4,20 @@ Stream Mode - Colorized, Exciting Logs for Twitch Streaming
 
 Usage:
     python3 HorseBot_Simple.py start 2025-10-18 5000 --stream
+
+The bot never prints stream output itself: it hands events to a
+StreamRenderer, whose own thread redraws a terminal dashboard at a fixed
+frame rate (repainting only the lines that changed), so stream mode adds no
+delay to price checks or bet placement.
 """
 
+import queue
+import re
+import sys
+import threading
+from collections import deque
 from datetime import datetime
+from typing import Dict, List, Optional
 import pytz
 
 # ANSI color codes for terminal
@@ -305,6 +316,209 @@ def live_stats(bets_placed: int, bets_skipped: int, total_staked: float,
 """
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+# DASHBOARD RENDERER
+# ══════════════════════════════════════════════════════════════════════════════
+
+SGR = re.compile(r'\x1B\[[0-9;]*m')
+
+
+def styled_lines(text: str) -> List[str]:
+    """
+    Split a multi-line banner so every line carries its own colour codes
+    (a banner sets its colour once at the top; a repainted line on its own
+    would lose it).
+    """
+    lines, active = [], ""
+    for line in text.strip("\n").split("\n"):
+        lines.append(f"{active}{line}{Colors.RESET}")
+        for code in SGR.findall(line):
+            active = "" if code == Colors.RESET else active + code
+    return lines
+
+
+class StreamRenderer:
+    """
+    Terminal dashboard fed by bot events.
+
+    emit() only puts the event on a queue (never blocks - if the renderer
+    falls behind, events are dropped). A background thread applies queued
+    events and redraws at `fps`, writing only the lines that changed.
+
+    Events:
+        log       text
+        card      date, selections             (start of day)
+        price     key, odds, minutes           (every price check)
+        skipped   key, horse, course, reason, current, needed
+        placed    key, horse, course, odds, stake, profit, bet_id
+        result    key, horse, course, pnl      (pnl > 0 = win)
+
+    Example:
+        >>> renderer = StreamRenderer()
+        >>> renderer.start("2025-10-18", "DRY RUN")
+        >>> renderer.emit("log", text="Starting monitoring loop...")
+        >>> renderer.stop()
+    """
+
+    ANNOUNCEMENT_LINES = 16
+
+    def __init__(self, fps: float = 10.0, log_lines: int = 12, max_events: int = 10_000, out=None):
+        self.interval = 1.0 / fps
+        self.out = out or sys.stdout
+        self.events: "queue.Queue[tuple]" = queue.Queue(maxsize=max_events)
+        self.dropped = 0
+
+        # Dashboard state (only touched by the render thread)
+        self.date = ""
+        self.mode = ""
+        self.rows: Dict[str, Dict] = {}
+        self.announcement: List[str] = []
+        self.logs: deque = deque(maxlen=log_lines)
+        self.placed = 0
+        self.skipped = 0
+        self.staked = 0.0
+
+        self._frame: List[str] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Producer side (bot thread)
+    # ------------------------------------------------------------------
+
+    def emit(self, kind: str, **data) -> bool:
+        try:
+            self.events.put_nowait((kind, data))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def start(self, date: str, mode: str):
+        self.date, self.mode = date, mode
+        self._thread = threading.Thread(target=self._run, name="stream-renderer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Draw the final frame and hand the terminal back."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        self.out.write(f"\033[{len(self._frame) + 1};1H\033[?25h\n")
+        self.out.flush()
+
+    # ------------------------------------------------------------------
+    # Render thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        self.out.write("\033[?25l" + Colors.CLEAR)
+        while True:
+            stopping = self._stop.is_set()
+            self._drain()
+            self._paint(self._compose())
+            if stopping:
+                return
+            self._stop.wait(self.interval)
+
+    def _drain(self):
+        while True:
+            try:
+                kind, data = self.events.get_nowait()
+            except queue.Empty:
+                return
+            self._apply(kind, data)
+
+    def _apply(self, kind: str, data: Dict):
+        if kind == "log":
+            self.logs.append(data["text"])
+        elif kind == "card":
+            self.date = data.get("date", self.date)
+            for sel in data["selections"]:
+                self.rows[f"{sel['time']}_{sel['horse']}"] = {
+                    "time": sel["time"], "course": sel["course"], "horse": sel["horse"],
+                    "strategy": sel.get("strategy", ""), "stake": float(sel["stake_gbp"]),
+                    "expected": float(sel["odds"]), "minimum": float(sel["min_odds_needed"]),
+                    "current": None, "minutes": None, "status": "WAITING",
+                }
+            total = sum(r["stake"] for r in self.rows.values())
+            self.announcement = styled_lines(big_announcement(
+                f"{len(self.rows)} selections • £{total:.2f} staked today", Colors.BRIGHT_CYAN))
+        elif kind == "price":
+            row = self.rows.get(data["key"])
+            if row and row["status"] in ("WAITING", "TRACKING"):
+                row.update(current=data["odds"], minutes=data["minutes"], status="TRACKING")
+        elif kind == "skipped":
+            self.skipped += 1
+            self._set_status(data["key"], "SKIPPED")
+            self.announcement = styled_lines(bet_skipped_banner(
+                data["horse"], data["course"], data["reason"], data["current"], data["needed"]))
+        elif kind == "placed":
+            if data.get("bet_id"):
+                self.placed += 1
+                self.staked += data["stake"]
+            self._set_status(data["key"], "PLACED" if data.get("bet_id") else "FAILED")
+            self.announcement = styled_lines(bet_placed_banner(
+                data["horse"], data["course"], data["odds"], data["stake"], data["profit"]))
+        elif kind == "result":
+            won = data["pnl"] > 0
+            self._set_status(data["key"], "WON" if won else "LOST")
+            banner_fn = win_announcement if won else loss_announcement
+            self.announcement = styled_lines(banner_fn(data["horse"], data["course"], data["pnl"]))
+
+    def _set_status(self, key: str, status: str):
+        if key in self.rows:
+            self.rows[key]["status"] = status
+
+    def _compose(self) -> List[str]:
+        status_colors = {
+            "WAITING": Colors.DIM, "TRACKING": Colors.BRIGHT_CYAN, "PLACED": Colors.BRIGHT_GREEN,
+            "SKIPPED": Colors.BRIGHT_RED, "FAILED": Colors.RED, "WON": Colors.BRIGHT_YELLOW,
+            "LOST": Colors.RED,
+        }
+        now = datetime.now(pytz.timezone("Europe/London")).strftime("%H:%M:%S")
+        races_left = sum(1 for r in self.rows.values() if r["status"] in ("WAITING", "TRACKING"))
+
+        frame = [
+            f"{Colors.BRIGHT_CYAN}{Colors.BOLD}🏇 GIDDYUP LIVE BETTING • {self.date} • {self.mode} • {now}{Colors.RESET}",
+            live_stats(self.placed, self.skipped, self.staked, races_left).strip("\n"),
+            "",
+            f"{Colors.BOLD}{'TIME':<6} {'COURSE':<14} {'HORSE':<28} {'STAKE':>7} {'EXP':>6} "
+            f"{'MIN':>6} {'NOW':>6} {'T-':>5}  STATUS{Colors.RESET}",
+        ]
+        for row in sorted(self.rows.values(), key=lambda r: r["time"]):
+            current = f"{row['current']:.2f}" if row["current"] else "-"
+            minutes = f"{int(row['minutes'])}" if row["minutes"] is not None else "-"
+            color = status_colors.get(row["status"], "")
+            frame.append(
+                f"{row['time']:<6} {row['course'][:14]:<14} {row['horse'][:28]:<28} £{row['stake']:>6.2f} "
+                f"{row['expected']:>6.2f} {row['minimum']:>6.2f} {current:>6} {minutes:>5}  "
+                f"{color}{row['status']}{Colors.RESET}"
+            )
+
+        frame.append("")
+        announcement = self.announcement[:self.ANNOUNCEMENT_LINES]
+        frame.extend(announcement + [""] * (self.ANNOUNCEMENT_LINES - len(announcement)))
+        frame.append(f"{Colors.CYAN}{'━' * 100}{Colors.RESET}")
+        frame.extend(self.logs)
+        return frame
+
+    def _paint(self, frame: List[str]):
+        """Write only the lines that differ from the previous frame."""
+        parts = []
+        for i, line in enumerate(frame):
+            if i >= len(self._frame) or self._frame[i] != line:
+                parts.append(f"\033[{i + 1};1H{line}\033[K")
+        for i in range(len(frame), len(self._frame)):
+            parts.append(f"\033[{i + 1};1H\033[K")
+        if parts:
+            self.out.write("".join(parts))
+            self.out.flush()
+        self._frame = frame
+
+
 def twitch_chat_format(message: str) -> str:
     """Format message for Twitch chat (no colors)."""
     # Strip ANSI codes for Twitch
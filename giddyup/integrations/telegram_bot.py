@@ -3,12 +3,21 @@
 Telegram Bot Integration for GiddyUp Horse Racing Bot
 
 Sends betting notifications to Telegram channel/group.
+
+send_telegram_message() only queues the message; the notifier's background
+worker posts it over a keep-alive session, so a Telegram outage never
+slows down the betting loop.
 """
 
 import requests
 from typing import Optional
 from pathlib import Path
 
+try:
+    from integrations.notifier import DISPATCHER, RetryAfter
+except ImportError:
+    from notifier import DISPATCHER, RetryAfter
+
 # Try to import config
 try:
     from telegram_config import (
@@ -34,42 +43,76 @@ except ImportError:
     SEND_RESULTS = False
 
 
-def send_telegram_message(message: str, parse_mode: str = "HTML") -> bool:
+# Telegram allows ~20 messages/minute into a group or channel
+TELEGRAM_RATE = 20 / 60
+TELEGRAM_BURST = 3
+TELEGRAM_MAX_CHARS = 4096
+DIGEST_SEPARATOR = "\n\n━━━━━━━━━━\n\n"
+
+_session = None
+
+
+def _chat_id() -> Optional[str]:
+    # Use channel ID if available, otherwise fall back to personal chat
+    return TELEGRAM_CHANNEL_ID if TELEGRAM_CHANNEL_ID else TELEGRAM_CHAT_ID
+
+
+def post_telegram_message(message: str, parse_mode: str = "HTML") -> bool:
     """
-    Send a message to Telegram channel.
-    
-    Args:
-        message: Message text (supports HTML or Markdown)
-        parse_mode: "HTML" or "Markdown"
-        
-    Returns:
-        True if sent successfully, False otherwise
+    Send a message to Telegram now (blocking). Used by the notifier worker
+    and the connection test - everything else should queue.
+
+    Raises:
+        RetryAfter: Telegram rate-limited us (HTTP 429)
     """
-    if not TELEGRAM_ENABLED:
-        return False
-    
-    # Use channel ID if available, otherwise fall back to personal chat
-    chat_id = TELEGRAM_CHANNEL_ID if TELEGRAM_CHANNEL_ID else TELEGRAM_CHAT_ID
-    
-    if not TELEGRAM_BOT_TOKEN or not chat_id:
+    global _session
+    if not TELEGRAM_ENABLED or not TELEGRAM_BOT_TOKEN or not _chat_id():
         return False
-    
+
+    if _session is None:
+        _session = requests.Session()       # Keep-alive: one TLS handshake, not one per message
+
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
     
     data = {
-        "chat_id": chat_id,
+        "chat_id": _chat_id(),
         "text": message,
         "parse_mode": parse_mode,
         "disable_web_page_preview": True
     }
     
-    try:
-        response = requests.post(url, json=data, timeout=10)
-        return response.status_code == 200
-    except Exception as e:
-        print(f"Telegram error: {e}")
+    response = _session.post(url, json=data, timeout=10)
+    if response.status_code == 429:
+        try:
+            retry_after = response.json().get("parameters", {}).get("retry_after", 5)
+        except ValueError:
+            retry_after = 5
+        raise RetryAfter(float(retry_after))
+    return response.status_code == 200
+
+
+def send_telegram_message(message: str, parse_mode: str = "HTML") -> bool:
+    """
+    Queue a message for the Telegram channel (returns immediately).
+    
+    Args:
+        message: Message text (supports HTML or Markdown)
+        parse_mode: "HTML" or "Markdown"
+        
+    Returns:
+        True if queued, False if Telegram isn't configured or the queue is full
+    """
+    if not TELEGRAM_ENABLED or not TELEGRAM_BOT_TOKEN or not _chat_id():
         return False
 
+    channel = f"telegram:{parse_mode}"
+    DISPATCHER.register(
+        channel, lambda text: post_telegram_message(text, parse_mode),
+        rate=TELEGRAM_RATE, burst=TELEGRAM_BURST,
+        joiner=DIGEST_SEPARATOR, max_chars=TELEGRAM_MAX_CHARS,
+    )
+    return DISPATCHER.submit(channel, message)
+
 
 def send_morning_picks(date: str, selections: list) -> bool:
     """Send morning picks summary to Telegram."""
@@ -286,7 +329,11 @@ You'll receive notifications for:
 
 #GiddyUp #HorseRacing"""
     
-    success = send_telegram_message(message)
+    try:
+        success = post_telegram_message(message)
+    except Exception as e:
+        print(f"Telegram error: {e}")
+        success = False
     
     if success:
         print("✅ Telegram test message sent successfully!")
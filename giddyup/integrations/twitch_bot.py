@@ -8,12 +8,21 @@ Setup:
 1. Copy twitch_config.template.py to twitch_config.py
 2. Add your Twitch credentials
 3. Run python3 twitch_bot.py to test
+
+send_to_twitch() only queues the message; the notifier's background worker
+sends it over one persistent IRC connection (answering the server's PINGs
+so it stays open).
 """
 
+import select
 import socket
-import time
 from typing import Optional
 
+try:
+    from integrations.notifier import DISPATCHER
+except ImportError:
+    from notifier import DISPATCHER
+
 # Try to import config
 try:
     from twitch_config import (
@@ -37,6 +46,10 @@ except ImportError:
     SEND_RESULTS = False
 
 
+# Blocking socket operations give up after this long (the send runs on the notifier thread)
+SOCKET_TIMEOUT = 10.0
+
+
 class TwitchBot:
     """Simple Twitch IRC bot for sending messages."""
     
@@ -45,35 +58,52 @@ class TwitchBot:
         self.connected = False
     
     def connect(self) -> bool:
-        """Connect to Twitch IRC."""
+        """Connect to Twitch IRC (replacing any previous connection)."""
         if not TWITCH_ENABLED:
             return False
         
+        self.disconnect()
         try:
-            self.sock = socket.socket()
-            self.sock.connect(('irc.chat.twitch.tv', 6667))
+            self.sock = socket.create_connection(('irc.chat.twitch.tv', 6667), timeout=SOCKET_TIMEOUT)
             
             # Authenticate
-            self.sock.send(f"PASS {TWITCH_OAUTH_TOKEN}\n".encode('utf-8'))
-            self.sock.send(f"NICK {TWITCH_BOT_USERNAME}\n".encode('utf-8'))
-            self.sock.send(f"JOIN #{TWITCH_CHANNEL}\n".encode('utf-8'))
+            self.sock.sendall(f"PASS {TWITCH_OAUTH_TOKEN}\n".encode('utf-8'))
+            self.sock.sendall(f"NICK {TWITCH_BOT_USERNAME}\n".encode('utf-8'))
+            self.sock.sendall(f"JOIN #{TWITCH_CHANNEL}\n".encode('utf-8'))
             
-            time.sleep(1)
             self.connected = True
             return True
             
         except Exception as e:
             print(f"Twitch connection error: {e}")
+            self.disconnect()
             return False
     
+    def keepalive(self):
+        """Answer PINGs waiting on the socket (Twitch drops silent clients)."""
+        try:
+            # Only read what has already arrived - never wait for server chatter
+            while select.select([self.sock], [], [], 0)[0]:
+                data = self.sock.recv(4096)
+                if not data:                # Server closed the connection
+                    self.connected = False
+                    return
+                for line in data.decode("utf-8", errors="ignore").splitlines():
+                    if line.startswith("PING"):
+                        self.sock.sendall(f"PONG{line[4:]}\n".encode('utf-8'))
+        except (OSError, ValueError):
+            self.connected = False
+    
     def send_message(self, message: str) -> bool:
-        """Send message to Twitch chat."""
+        """Send message to Twitch chat (blocking; see send_to_twitch)."""
+        if self.connected:
+            self.keepalive()
         if not self.connected:
             if not self.connect():
                 return False
         
         try:
-            self.sock.send(f"PRIVMSG #{TWITCH_CHANNEL} :{message}\n".encode('utf-8'))
+            self.sock.sendall(f"PRIVMSG #{TWITCH_CHANNEL} :{message}\n".encode('utf-8'))
             return True
         except Exception as e:
             print(f"Twitch send error: {e}")
@@ -83,8 +113,12 @@ class TwitchBot:
     def disconnect(self):
         """Disconnect from Twitch."""
         if self.sock:
-            self.sock.close()
-            self.connected = False
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+        self.connected = False
 
 
 # Global bot instance
@@ -99,13 +133,23 @@ def get_bot() -> TwitchBot:
     return _twitch_bot
 
 
+# Twitch allows 20 messages per 30 seconds for non-moderators
+TWITCH_RATE = 20 / 30
+TWITCH_BURST = 5
+TWITCH_MAX_CHARS = 500
+
+
 def send_to_twitch(message: str) -> bool:
-    """Send a message to Twitch chat."""
+    """Queue a message for Twitch chat (returns immediately)."""
     if not TWITCH_ENABLED:
         return False
     
-    bot = get_bot()
-    return bot.send_message(message)
+    DISPATCHER.register(
+        "twitch", get_bot().send_message,
+        rate=TWITCH_RATE, burst=TWITCH_BURST,
+        joiner=" | ", max_chars=TWITCH_MAX_CHARS,
+    )
+    return DISPATCHER.submit("twitch", message)
 
 
 def send_morning_summary(date: str, total_bets: int, total_stake: float) -> bool:
@@ -171,7 +215,7 @@ def test_connection() -> bool:
     
     message = "🤖 GiddyUp bot connected! Stream starting soon! 🏇"
     
-    success = send_to_twitch(message)
+    success = get_bot().send_message(message)
     
     if success:
         print("✅ Twitch test message sent successfully!")
@@ -2,19 +2,28 @@
 """
 Live Racing Results Monitor
 ============================
-Continuously polls Sporting Life API and displays results in real-time.
+Polls the Sporting Life API and displays results in real-time.
 Perfect for streaming!
 
+Polling follows the day's off times (taken from the feed itself): every
+FAST_POLL seconds while a race is due to finish, otherwise nothing until
+the next race can have a result (at most IDLE_POLL apart). Requests are
+conditional, so an unchanged feed costs a 304, and each poll only looks at
+races whose status changed.
+
 Usage:
     python3 live_results_monitor.py
 """
 
-import requests
 import time
 import sys
 from datetime import datetime, timedelta
-from typing import Dict, List, Set
-import json
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+sys.path.insert(0, str(Path(__file__).parent))
+from utilities.results_checker import RESULTS_API, ResultsCache
 
 # ANSI Color codes for terminal
 class Colors:
@@ -49,11 +58,26 @@ class Colors:
     BG_MAGENTA = '\033[45m'
 
 # API URL
-API_URL = "https://www.sportinglife.com/api/horse-racing/v2/fast-results?countryGroups=UK,IRE"
+API_URL = RESULTS_API
+
+UK = ZoneInfo("Europe/London")
+
+# Polling schedule
+FIRST_CHECK = 3        # Minutes after the off before a result can be in
+HOT_WINDOW = 15        # Minutes after the off to keep polling fast
+FAST_POLL = 15         # Seconds between polls while a race is due
+IDLE_POLL = 300        # Longest gap between polls otherwise
+ERROR_POLL = 60        # Retry delay when the feed can't be fetched
+
+FINISHED = ('RESULT', 'WEIGHEDIN')
 
 # Track which races we've already displayed
 displayed_races: Set[str] = set()
 
+# Conditional, keep-alive fetches; the schedule below decides when to poll
+# (the TTL only stops races() re-fetching straight after a forced refresh)
+feed = ResultsCache(API_URL, ttl=FAST_POLL / 2)
+
 def clear_screen():
     """Clear the terminal screen."""
     print('\033[2J\033[H', end='')
@@ -66,7 +90,7 @@ def print_header():
     
     now = datetime.now().strftime("%H:%M:%S")
     print(f"{Colors.BRIGHT_WHITE}⏰ Current Time: {Colors.BRIGHT_CYAN}{now}{Colors.RESET}")
-    print(f"{Colors.BRIGHT_WHITE}🔄 Checking for new results every 30 seconds...{Colors.RESET}\n")
+    print(f"{Colors.BRIGHT_WHITE}🔄 Checking for results as each race finishes...{Colors.RESET}\n")
 
 def print_race_result(race: Dict, is_new: bool = True):
     """Print a single race result with fancy formatting."""
@@ -162,15 +186,65 @@ def print_race_result(race: Dict, is_new: bool = True):
     
     print(f"{Colors.BOLD}{Colors.BRIGHT_MAGENTA}┗{'━' * 78}┛{Colors.RESET}")
 
-def fetch_results() -> List[Dict]:
-    """Fetch results from Sporting Life API."""
+def fetch_results() -> Tuple[List[Dict], bool]:
+    """
+    Fetch today's races from Sporting Life API.
+    
+    Returns:
+        (races, changed) - changed is False when the feed was unchanged (304)
+        or couldn't be fetched (the last good copy is returned)
+    """
+    changed = feed.refresh(force=True)
+    return feed.races(datetime.now(UK).strftime("%Y-%m-%d")), changed
+
+def race_key(race: Dict) -> str:
+    return f"{race.get('courseName')}_{race.get('time')}"
+
+def diff_snapshot(snapshot: Dict[str, Tuple], races: List[Dict]) -> List[Dict]:
+    """
+    Update `snapshot` (race key -> (status, placings)) in place and return the
+    races whose status or placings changed since the previous poll.
+    """
+    changed = []
+    for race in races:
+        key = race_key(race)
+        state = (race.get('status'), len(race.get('top_horses') or []))
+        if snapshot.get(key) != state:
+            snapshot[key] = state
+            changed.append(race)
+    return changed
+
+def off_time(race: Dict, day: datetime) -> Optional[datetime]:
     try:
-        response = requests.get(API_URL, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        print(f"{Colors.BRIGHT_RED}❌ Error fetching results: {e}{Colors.RESET}")
-        return []
+        hour, minute = map(int, race.get('time', '').split(':'))
+    except ValueError:
+        return None
+    return day.replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+def next_poll(now: datetime, races: List[Dict]) -> Tuple[Optional[float], str]:
+    """
+    Seconds until the next poll, and why.
+    
+    Returns:
+        (None, reason) once every race on the card has a result
+    """
+    pending = [off_time(r, now) for r in races if r.get('status') not in FINISHED]
+    pending = [off for off in pending if off is not None]
+    if races and not pending:
+        return None, "all results in"
+    
+    # A race is due: between FIRST_CHECK and HOT_WINDOW minutes after its off
+    due = [off for off in pending
+           if off + timedelta(minutes=FIRST_CHECK) <= now <= off + timedelta(minutes=HOT_WINDOW)]
+    if due:
+        return FAST_POLL, f"{len(due)} race(s) due"
+    
+    upcoming = [off + timedelta(minutes=FIRST_CHECK) for off in pending
+                if off + timedelta(minutes=FIRST_CHECK) > now]
+    if upcoming:
+        wait = (min(upcoming) - now).total_seconds()
+        return max(FAST_POLL, min(IDLE_POLL, wait)), f"next off {min(upcoming) - timedelta(minutes=FIRST_CHECK):%H:%M}"
+    return IDLE_POLL, "waiting on late results"
 
 def print_summary(results: List[Dict]):
     """Print summary of today's racing."""
@@ -183,13 +257,8 @@ def print_summary(results: List[Dict]):
     print(f"{Colors.BRIGHT_CYAN}{'─' * 80}{Colors.RESET}")
 
 def print_animation():
-    """Print a cool racing animation."""
-    horses = ["🐎", "🏇", "🐴"]
-    for horse in horses:
-        sys.stdout.write(f"\r{Colors.BRIGHT_YELLOW}{horse * 10}{Colors.RESET}")
-        sys.stdout.flush()
-        time.sleep(0.1)
-    print("\r" + " " * 50 + "\r", end="")
+    """Print a cool racing banner."""
+    print(f"{Colors.BRIGHT_YELLOW}{'🐎🏇🐴' * 10}{Colors.RESET}")
 
 def monitor_results():
     """Main monitoring loop."""
@@ -210,12 +279,9 @@ def monitor_results():
     """)
     print(f"{Colors.RESET}")
     
-    time.sleep(2)
-    
     print(f"{Colors.BRIGHT_YELLOW}🚀 Starting monitor...{Colors.RESET}\n")
-    time.sleep(1)
     
-    last_result_count = 0
+    snapshot: Dict[str, Tuple] = {}
     check_count = 0
     
     try:
@@ -227,25 +293,20 @@ def monitor_results():
                 print_header()
             
             # Fetch results
-            now = datetime.now().strftime("%H:%M:%S")
-            print(f"\n{Colors.BRIGHT_CYAN}[{now}]{Colors.RESET} {Colors.BRIGHT_WHITE}🔍 Checking for results (Check #{check_count})...{Colors.RESET}")
-            results = fetch_results()
+            now = datetime.now(UK)
+            print(f"\n{Colors.BRIGHT_CYAN}[{now:%H:%M:%S}]{Colors.RESET} {Colors.BRIGHT_WHITE}🔍 Checking for results (Check #{check_count})...{Colors.RESET}")
+            results, changed = fetch_results()
             
             if not results:
                 print(f"{Colors.BRIGHT_RED}⚠️  No results available yet{Colors.RESET}")
-                print(f"{Colors.BRIGHT_WHITE}⏳ Waiting 30 seconds...{Colors.RESET}")
-                time.sleep(30)
+                print(f"{Colors.BRIGHT_WHITE}⏳ Waiting {ERROR_POLL} seconds...{Colors.RESET}")
+                time.sleep(ERROR_POLL)
                 continue
             
-            # Filter for finished races
-            finished_races = [r for r in results if r.get('status') in ['RESULT', 'WEIGHEDIN']]
-            
-            # Check for new results
-            new_results = []
-            for race in finished_races:
-                race_key = f"{race.get('courseName')}_{race.get('time')}"
-                if race_key not in displayed_races:
-                    new_results.append(race)
+            # Only races whose status/placings moved since the last poll
+            updates = diff_snapshot(snapshot, results) if changed or check_count == 1 else []
+            new_results = [r for r in updates
+                           if r.get('status') in FINISHED and race_key(r) not in displayed_races]
             
             # Display new results with fanfare
             if new_results:
@@ -254,27 +315,30 @@ def monitor_results():
                 
                 for race in new_results:
                     print_race_result(race, is_new=True)
-                    time.sleep(0.5)  # Dramatic pause between results
             else:
                 print(f"{Colors.BRIGHT_YELLOW}✓ Up to date - No new results{Colors.RESET}")
             
             # Summary
-            print_summary(results)
+            if updates:
+                print_summary(results)
+            
+            # Next check - scheduled from the card's off times
+            wait, reason = next_poll(now, results)
+            if wait is None:
+                print(f"\n{Colors.BOLD}{Colors.BRIGHT_GREEN}🏁 All {len(results)} results in - done for the day{Colors.RESET}")
+                print(f"   Requests: {feed.stats['requests']} ({feed.stats['not_modified']} unchanged)")
+                break
             
-            # Next check countdown
-            print(f"\n{Colors.BRIGHT_WHITE}⏱️  Next check in: {Colors.RESET}", end="")
-            for i in range(30, 0, -1):
-                print(f"\r{Colors.BRIGHT_WHITE}⏱️  Next check in: {Colors.BRIGHT_CYAN}{i:2d}{Colors.RESET} seconds... ", end="")
-                sys.stdout.flush()
-                time.sleep(1)
-            print()
+            next_at = now + timedelta(seconds=wait)
+            print(f"{Colors.BRIGHT_WHITE}⏱️  Next check at {Colors.BRIGHT_CYAN}{next_at:%H:%M:%S}{Colors.RESET} ({reason})")
+            time.sleep(wait)
             
     except KeyboardInterrupt:
         print(f"\n\n{Colors.BOLD}{Colors.BRIGHT_YELLOW}{'═' * 80}{Colors.RESET}")
         print(f"{Colors.BOLD}{Colors.BRIGHT_RED}🛑 Monitor stopped by user{Colors.RESET}")
         print(f"{Colors.BOLD}{Colors.BRIGHT_YELLOW}{'═' * 80}{Colors.RESET}\n")
         print(f"{Colors.BRIGHT_WHITE}📊 Final Stats:{Colors.RESET}")
-        print(f"   Total checks: {Colors.BRIGHT_CYAN}{check_count}{Colors.RESET}")
+        print(f"   Total checks: {Colors.BRIGHT_CYAN}{check_count}{Colors.RESET} ({feed.stats['not_modified']} unchanged)")
         print(f"   Races displayed: {Colors.BRIGHT_GREEN}{len(displayed_races)}{Colors.RESET}")
         print(f"\n{Colors.BRIGHT_GREEN}✅ Thanks for watching!{Colors.RESET}\n")
         sys.exit(0)
@@ -0,0 +1,437 @@
+-- ============================================================================
+-- Incrementally Maintained P&L Summaries
+-- ============================================================================
+-- Purpose: Keep vw_daily_pnl and vw_strategy_performance constant-time as
+--          history grows. Triggers apply per-row deltas to two summary tables
+--          instead of re-joining every session/selection/decision/result.
+-- Requires: 002_bot_tracking_schema.sql
+-- Apply:    psql "$DATABASE_URL" -f migrations/003_pnl_summary_tables.sql
+-- Created: 2025-10-22
+-- ============================================================================
+
+-- ============================================================================
+-- 1. SUMMARY TABLES
+-- ============================================================================
+
+-- One row per session key (same grouping as the old vw_daily_pnl)
+CREATE TABLE IF NOT EXISTS pnl_daily_summary (
+    date DATE NOT NULL,
+    bot_type VARCHAR(50) NOT NULL,
+    mode VARCHAR(20) NOT NULL,
+    total_selections BIGINT NOT NULL DEFAULT 0,
+    total_bets BIGINT NOT NULL DEFAULT 0,
+    bets_placed BIGINT NOT NULL DEFAULT 0,
+    bets_skipped BIGINT NOT NULL DEFAULT 0,
+    wins BIGINT NOT NULL DEFAULT 0,
+    losses BIGINT NOT NULL DEFAULT 0,
+    settled_results BIGINT NOT NULL DEFAULT 0,
+    total_staked NUMERIC NOT NULL DEFAULT 0,
+    net_pnl NUMERIC NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (date, bot_type, mode)
+);
+
+-- One row per strategy per selection date (same grouping as the old vw_strategy_performance)
+CREATE TABLE IF NOT EXISTS pnl_strategy_summary (
+    strategy VARCHAR(50) NOT NULL,
+    date DATE NOT NULL,
+    total_selections BIGINT NOT NULL DEFAULT 0,
+    bets_placed BIGINT NOT NULL DEFAULT 0,
+    wins BIGINT NOT NULL DEFAULT 0,
+    losses BIGINT NOT NULL DEFAULT 0,
+    settled_results BIGINT NOT NULL DEFAULT 0,
+    total_staked NUMERIC NOT NULL DEFAULT 0,
+    net_pnl NUMERIC NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (strategy, date)
+);
+
+CREATE INDEX IF NOT EXISTS idx_pnl_strategy_summary_date ON pnl_strategy_summary(date);
+
+-- ============================================================================
+-- 2. DELTA FUNCTION
+-- ============================================================================
+-- Adds (or with negative deltas, removes) one row's contribution to both
+-- summaries. Selections without a session only count towards the strategy
+-- summary - the old daily view joined from bot_sessions, so it skipped them too.
+
+CREATE OR REPLACE FUNCTION pnl_summary_apply(
+    p_session_id INTEGER,
+    p_date DATE,
+    p_strategy VARCHAR,
+    d_selections INTEGER,
+    d_bets INTEGER,
+    d_placed INTEGER,
+    d_skipped INTEGER,
+    d_wins INTEGER,
+    d_losses INTEGER,
+    d_results INTEGER,
+    d_staked NUMERIC,
+    d_pnl NUMERIC
+)
+RETURNS VOID AS $$
+DECLARE
+    v_session RECORD;
+BEGIN
+    IF p_session_id IS NOT NULL THEN
+        SELECT date, bot_type, mode INTO v_session
+        FROM bot_sessions WHERE session_id = p_session_id;
+
+        IF FOUND THEN
+            INSERT INTO pnl_daily_summary AS t
+                (date, bot_type, mode, total_selections, total_bets, bets_placed,
+                 bets_skipped, wins, losses, settled_results, total_staked, net_pnl)
+            VALUES (v_session.date, v_session.bot_type, v_session.mode,
+                    d_selections, d_bets, d_placed, d_skipped, d_wins, d_losses,
+                    d_results, d_staked, d_pnl)
+            ON CONFLICT (date, bot_type, mode) DO UPDATE SET
+                total_selections = t.total_selections + EXCLUDED.total_selections,
+                total_bets = t.total_bets + EXCLUDED.total_bets,
+                bets_placed = t.bets_placed + EXCLUDED.bets_placed,
+                bets_skipped = t.bets_skipped + EXCLUDED.bets_skipped,
+                wins = t.wins + EXCLUDED.wins,
+                losses = t.losses + EXCLUDED.losses,
+                settled_results = t.settled_results + EXCLUDED.settled_results,
+                total_staked = t.total_staked + EXCLUDED.total_staked,
+                net_pnl = t.net_pnl + EXCLUDED.net_pnl,
+                updated_at = CURRENT_TIMESTAMP;
+        END IF;
+    END IF;
+
+    IF p_strategy IS NOT NULL AND p_date IS NOT NULL THEN
+        INSERT INTO pnl_strategy_summary AS t
+            (strategy, date, total_selections, bets_placed, wins, losses,
+             settled_results, total_staked, net_pnl)
+        VALUES (p_strategy, p_date, d_selections, d_placed, d_wins, d_losses,
+                d_results, d_staked, d_pnl)
+        ON CONFLICT (strategy, date) DO UPDATE SET
+            total_selections = t.total_selections + EXCLUDED.total_selections,
+            bets_placed = t.bets_placed + EXCLUDED.bets_placed,
+            wins = t.wins + EXCLUDED.wins,
+            losses = t.losses + EXCLUDED.losses,
+            settled_results = t.settled_results + EXCLUDED.settled_results,
+            total_staked = t.total_staked + EXCLUDED.total_staked,
+            net_pnl = t.net_pnl + EXCLUDED.net_pnl,
+            updated_at = CURRENT_TIMESTAMP;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- 3. TRIGGERS
+-- ============================================================================
+-- UPDATEs remove the OLD row's contribution and add the NEW one, so
+-- upserts from BotTracker (ON CONFLICT DO UPDATE) stay exact. When a
+-- selection or decision is re-keyed, the rows below it (decisions, results)
+-- are moved from the old summary key to the new one as well.
+
+-- Sessions: make sure a session with no selections still shows up
+CREATE OR REPLACE FUNCTION trg_pnl_sessions() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO pnl_daily_summary (date, bot_type, mode)
+        VALUES (NEW.date, NEW.bot_type, NEW.mode)
+        ON CONFLICT (date, bot_type, mode) DO NOTHING;
+    ELSE
+        -- Session re-keyed or removed: rebuild the affected dates
+        PERFORM refresh_pnl_summaries(OLD.date);
+        IF TG_OP = 'UPDATE' AND NEW.date <> OLD.date THEN
+            PERFORM refresh_pnl_summaries(NEW.date);
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trg_pnl_selections() RETURNS TRIGGER AS $$
+DECLARE
+    v_bets RECORD;
+    v_res RECORD;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM pnl_summary_apply(OLD.session_id, OLD.date, OLD.strategy,
+                                  -1, 0, 0, 0, 0, 0, 0, 0, 0);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM pnl_summary_apply(NEW.session_id, NEW.date, NEW.strategy,
+                                  1, 0, 0, 0, 0, 0, 0, 0, 0);
+    END IF;
+
+    -- Re-keyed selection: its decisions and results move with it
+    IF TG_OP = 'UPDATE' AND (OLD.session_id, OLD.date, OLD.strategy)
+            IS DISTINCT FROM (NEW.session_id, NEW.date, NEW.strategy) THEN
+        SELECT
+            COUNT(*)::INTEGER AS bets,
+            COUNT(*) FILTER (WHERE decision = 'PLACED')::INTEGER AS placed,
+            COUNT(*) FILTER (WHERE decision = 'SKIPPED')::INTEGER AS skipped,
+            COALESCE(SUM(stake_gbp) FILTER (WHERE decision = 'PLACED'), 0) AS staked
+        INTO v_bets
+        FROM bet_decisions WHERE selection_id = NEW.selection_id;
+
+        SELECT
+            COUNT(*) FILTER (WHERE br.result = 'WIN')::INTEGER AS wins,
+            COUNT(*) FILTER (WHERE br.result = 'LOSS')::INTEGER AS losses,
+            COUNT(*)::INTEGER AS results,
+            COALESCE(SUM(br.net_pnl), 0) AS pnl
+        INTO v_res
+        FROM bet_results br
+        JOIN bet_decisions bd ON bd.decision_id = br.decision_id
+        WHERE bd.selection_id = NEW.selection_id;
+
+        IF v_bets.bets > 0 OR v_res.results > 0 THEN
+            PERFORM pnl_summary_apply(
+                OLD.session_id, OLD.date, OLD.strategy,
+                0, -v_bets.bets, -v_bets.placed, -v_bets.skipped,
+                -v_res.wins, -v_res.losses, -v_res.results, -v_bets.staked, -v_res.pnl
+            );
+            PERFORM pnl_summary_apply(
+                NEW.session_id, NEW.date, NEW.strategy,
+                0, v_bets.bets, v_bets.placed, v_bets.skipped,
+                v_res.wins, v_res.losses, v_res.results, v_bets.staked, v_res.pnl
+            );
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trg_pnl_decisions() RETURNS TRIGGER AS $$
+DECLARE
+    v_sel RECORD;
+    v_old RECORD;
+    v_res RECORD;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT session_id, date, strategy INTO v_sel
+        FROM morning_selections WHERE selection_id = OLD.selection_id;
+        IF FOUND THEN
+            PERFORM pnl_summary_apply(
+                v_sel.session_id, v_sel.date, v_sel.strategy,
+                0, -1,
+                -CASE WHEN OLD.decision = 'PLACED' THEN 1 ELSE 0 END,
+                -CASE WHEN OLD.decision = 'SKIPPED' THEN 1 ELSE 0 END,
+                0, 0, 0,
+                -CASE WHEN OLD.decision = 'PLACED' THEN COALESCE(OLD.stake_gbp, 0) ELSE 0 END,
+                0
+            );
+        END IF;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT session_id, date, strategy INTO v_sel
+        FROM morning_selections WHERE selection_id = NEW.selection_id;
+        IF FOUND THEN
+            PERFORM pnl_summary_apply(
+                v_sel.session_id, v_sel.date, v_sel.strategy,
+                0, 1,
+                CASE WHEN NEW.decision = 'PLACED' THEN 1 ELSE 0 END,
+                CASE WHEN NEW.decision = 'SKIPPED' THEN 1 ELSE 0 END,
+                0, 0, 0,
+                CASE WHEN NEW.decision = 'PLACED' THEN COALESCE(NEW.stake_gbp, 0) ELSE 0 END,
+                0
+            );
+        END IF;
+    END IF;
+
+    -- Decision moved to another selection: its results move with it
+    IF TG_OP = 'UPDATE' AND OLD.selection_id IS DISTINCT FROM NEW.selection_id THEN
+        SELECT
+            COUNT(*) FILTER (WHERE result = 'WIN')::INTEGER AS wins,
+            COUNT(*) FILTER (WHERE result = 'LOSS')::INTEGER AS losses,
+            COUNT(*)::INTEGER AS results,
+            COALESCE(SUM(net_pnl), 0) AS pnl
+        INTO v_res
+        FROM bet_results WHERE decision_id = NEW.decision_id;
+
+        IF v_res.results > 0 THEN
+            SELECT session_id, date, strategy INTO v_old
+            FROM morning_selections WHERE selection_id = OLD.selection_id;
+            IF FOUND THEN
+                PERFORM pnl_summary_apply(
+                    v_old.session_id, v_old.date, v_old.strategy,
+                    0, 0, 0, 0, -v_res.wins, -v_res.losses, -v_res.results, 0, -v_res.pnl
+                );
+            END IF;
+            SELECT session_id, date, strategy INTO v_sel
+            FROM morning_selections WHERE selection_id = NEW.selection_id;
+            IF FOUND THEN
+                PERFORM pnl_summary_apply(
+                    v_sel.session_id, v_sel.date, v_sel.strategy,
+                    0, 0, 0, 0, v_res.wins, v_res.losses, v_res.results, 0, v_res.pnl
+                );
+            END IF;
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trg_pnl_results() RETURNS TRIGGER AS $$
+DECLARE
+    v_sel RECORD;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT ms.session_id, ms.date, ms.strategy INTO v_sel
+        FROM bet_decisions bd
+        JOIN morning_selections ms ON ms.selection_id = bd.selection_id
+        WHERE bd.decision_id = OLD.decision_id;
+        IF FOUND THEN
+            PERFORM pnl_summary_apply(
+                v_sel.session_id, v_sel.date, v_sel.strategy,
+                0, 0, 0, 0,
+                -CASE WHEN OLD.result = 'WIN' THEN 1 ELSE 0 END,
+                -CASE WHEN OLD.result = 'LOSS' THEN 1 ELSE 0 END,
+                -1, 0, -COALESCE(OLD.net_pnl, 0)
+            );
+        END IF;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT ms.session_id, ms.date, ms.strategy INTO v_sel
+        FROM bet_decisions bd
+        JOIN morning_selections ms ON ms.selection_id = bd.selection_id
+        WHERE bd.decision_id = NEW.decision_id;
+        IF FOUND THEN
+            PERFORM pnl_summary_apply(
+                v_sel.session_id, v_sel.date, v_sel.strategy,
+                0, 0, 0, 0,
+                CASE WHEN NEW.result = 'WIN' THEN 1 ELSE 0 END,
+                CASE WHEN NEW.result = 'LOSS' THEN 1 ELSE 0 END,
+                1, 0, COALESCE(NEW.net_pnl, 0)
+            );
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS pnl_summary_sessions ON bot_sessions;
+CREATE TRIGGER pnl_summary_sessions
+    AFTER INSERT OR DELETE OR UPDATE OF date, bot_type, mode ON bot_sessions
+    FOR EACH ROW EXECUTE FUNCTION trg_pnl_sessions();
+
+DROP TRIGGER IF EXISTS pnl_summary_selections ON morning_selections;
+CREATE TRIGGER pnl_summary_selections
+    AFTER INSERT OR DELETE OR UPDATE OF session_id, date, strategy ON morning_selections
+    FOR EACH ROW EXECUTE FUNCTION trg_pnl_selections();
+
+DROP TRIGGER IF EXISTS pnl_summary_decisions ON bet_decisions;
+CREATE TRIGGER pnl_summary_decisions
+    AFTER INSERT OR DELETE OR UPDATE OF selection_id, decision, stake_gbp ON bet_decisions
+    FOR EACH ROW EXECUTE FUNCTION trg_pnl_decisions();
+
+DROP TRIGGER IF EXISTS pnl_summary_results ON bet_results;
+CREATE TRIGGER pnl_summary_results
+    AFTER INSERT OR DELETE OR UPDATE OF decision_id, result, net_pnl ON bet_results
+    FOR EACH ROW EXECUTE FUNCTION trg_pnl_results();
+
+-- ============================================================================
+-- 4. REBUILD / BACKFILL
+-- ============================================================================
+-- Recomputes summaries from the base tables. Used once below to backfill
+-- existing history, and available for repairs: SELECT refresh_pnl_summaries();
+
+CREATE OR REPLACE FUNCTION refresh_pnl_summaries(p_date DATE DEFAULT NULL)
+RETURNS VOID AS $$
+BEGIN
+    DELETE FROM pnl_daily_summary WHERE p_date IS NULL OR date = p_date;
+    DELETE FROM pnl_strategy_summary WHERE p_date IS NULL OR date = p_date;
+
+    INSERT INTO pnl_daily_summary
+        (date, bot_type, mode, total_selections, total_bets, bets_placed,
+         bets_skipped, wins, losses, settled_results, total_staked, net_pnl)
+    SELECT
+        s.date, s.bot_type, s.mode,
+        COUNT(DISTINCT ms.selection_id),
+        COUNT(DISTINCT bd.decision_id),
+        COUNT(DISTINCT CASE WHEN bd.decision = 'PLACED' THEN bd.decision_id END),
+        COUNT(DISTINCT CASE WHEN bd.decision = 'SKIPPED' THEN bd.decision_id END),
+        COUNT(DISTINCT CASE WHEN br.result = 'WIN' THEN br.result_id END),
+        COUNT(DISTINCT CASE WHEN br.result = 'LOSS' THEN br.result_id END),
+        COUNT(DISTINCT br.result_id),
+        COALESCE(SUM(CASE WHEN bd.decision = 'PLACED' THEN bd.stake_gbp ELSE 0 END), 0),
+        COALESCE(SUM(br.net_pnl), 0)
+    FROM bot_sessions s
+    LEFT JOIN morning_selections ms ON s.session_id = ms.session_id
+    LEFT JOIN bet_decisions bd ON ms.selection_id = bd.selection_id
+    LEFT JOIN bet_results br ON bd.decision_id = br.decision_id
+    WHERE p_date IS NULL OR s.date = p_date
+    GROUP BY s.date, s.bot_type, s.mode;
+
+    INSERT INTO pnl_strategy_summary
+        (strategy, date, total_selections, bets_placed, wins, losses,
+         settled_results, total_staked, net_pnl)
+    SELECT
+        ms.strategy, ms.date,
+        COUNT(DISTINCT ms.selection_id),
+        COUNT(DISTINCT CASE WHEN bd.decision = 'PLACED' THEN bd.decision_id END),
+        COUNT(DISTINCT CASE WHEN br.result = 'WIN' THEN br.result_id END),
+        COUNT(DISTINCT CASE WHEN br.result = 'LOSS' THEN br.result_id END),
+        COUNT(DISTINCT br.result_id),
+        COALESCE(SUM(CASE WHEN bd.decision = 'PLACED' THEN bd.stake_gbp ELSE 0 END), 0),
+        COALESCE(SUM(br.net_pnl), 0)
+    FROM morning_selections ms
+    LEFT JOIN bet_decisions bd ON ms.selection_id = bd.selection_id
+    LEFT JOIN bet_results br ON bd.decision_id = br.decision_id
+    WHERE p_date IS NULL OR ms.date = p_date
+    GROUP BY ms.strategy, ms.date;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT refresh_pnl_summaries();
+
+-- ============================================================================
+-- 5. VIEWS (same columns as 002, now reading the summaries)
+-- ============================================================================
+
+DROP VIEW IF EXISTS vw_daily_pnl;
+CREATE VIEW vw_daily_pnl AS
+SELECT
+    date,
+    bot_type,
+    mode,
+    total_selections,
+    total_bets,
+    bets_placed,
+    bets_skipped,
+    wins,
+    losses,
+    total_staked,
+    CASE WHEN settled_results > 0 THEN net_pnl END as net_pnl,
+    CASE
+        WHEN total_staked > 0 THEN (net_pnl / total_staked * 100)
+        ELSE 0
+    END as roi_percentage
+FROM pnl_daily_summary
+ORDER BY date DESC;
+
+DROP VIEW IF EXISTS vw_strategy_performance;
+CREATE VIEW vw_strategy_performance AS
+SELECT
+    strategy,
+    date,
+    total_selections,
+    bets_placed,
+    wins,
+    losses,
+    total_staked,
+    CASE WHEN settled_results > 0 THEN net_pnl END as net_pnl,
+    CASE
+        WHEN wins + losses > 0 THEN (wins::DECIMAL / (wins + losses) * 100)
+        ELSE 0
+    END as win_rate_percentage
+FROM pnl_strategy_summary
+ORDER BY date DESC, strategy;
+
+-- ============================================================================
+-- COMMENTS
+-- ============================================================================
+
+COMMENT ON TABLE pnl_daily_summary IS 'Trigger-maintained daily P&L per date/bot_type/mode (backs vw_daily_pnl)';
+COMMENT ON TABLE pnl_strategy_summary IS 'Trigger-maintained P&L per strategy/date (backs vw_strategy_performance)';
+COMMENT ON FUNCTION refresh_pnl_summaries(DATE) IS 'Rebuild P&L summaries from base tables (all dates if NULL)';
+
+COMMENT ON VIEW vw_daily_pnl IS 'Daily profit/loss summary by bot type';
+COMMENT ON VIEW vw_strategy_performance IS 'Performance metrics by strategy';
+
+-- ============================================================================
+-- END OF MIGRATION
+-- ============================================================================
@@ -0,0 +1,283 @@
+-- ============================================================================
+-- Monthly Partitioning for Tick / Signal History
+-- ============================================================================
+-- Purpose: Keep insert throughput and range queries flat as price history
+--          grows. price_observations (by observed_at) and modeling.signals
+--          (by as_of) become monthly RANGE partitions with BRIN indexes on
+--          the timestamp, and old ticks are compacted into 1-minute OHLC rows.
+-- Requires: 001_modeling_schema.sql, 002_bot_tracking_schema.sql
+-- Apply:    psql "$DATABASE_URL" -f migrations/004_partition_tick_tables.sql
+-- Maintain: SELECT maintain_tick_storage();   -- daily (cron / pg_cron)
+-- Created: 2025-10-22
+-- ============================================================================
+
+BEGIN;
+
+-- ============================================================================
+-- 1. PARTITION HELPER
+-- ============================================================================
+-- Creates <table>_pYYYYMM partitions for p_months months starting at the
+-- month containing p_start. Safe to call repeatedly.
+
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(
+    p_schema TEXT,
+    p_table TEXT,
+    p_start DATE,
+    p_months INTEGER DEFAULT 3
+)
+RETURNS INTEGER AS $$
+DECLARE
+    v_month DATE := date_trunc('month', p_start)::DATE;
+    v_name TEXT;
+    v_created INTEGER := 0;
+BEGIN
+    FOR i IN 0..p_months - 1 LOOP
+        v_name := format('%s_p%s', p_table, to_char(v_month, 'YYYYMM'));
+        IF to_regclass(format('%I.%I', p_schema, v_name)) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I.%I PARTITION OF %I.%I FOR VALUES FROM (%L) TO (%L)',
+                p_schema, v_name, p_schema, p_table,
+                v_month, (v_month + INTERVAL '1 month')::DATE
+            );
+            v_created := v_created + 1;
+        END IF;
+        v_month := (v_month + INTERVAL '1 month')::DATE;
+    END LOOP;
+    RETURN v_created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- 2. PRICE_OBSERVATIONS -> PARTITIONED BY observed_at
+-- ============================================================================
+-- Partition key must be part of the primary key: (observation_id, observed_at).
+-- The existing id sequence is kept so observation_ids carry on.
+
+ALTER TABLE price_observations RENAME TO price_observations_legacy;
+ALTER SEQUENCE price_observations_observation_id_seq OWNED BY NONE;
+
+CREATE TABLE price_observations (
+    observation_id BIGINT NOT NULL DEFAULT nextval('price_observations_observation_id_seq'),
+    selection_id INTEGER REFERENCES morning_selections(selection_id),
+    observed_at TIMESTAMP NOT NULL,
+    minutes_to_off INTEGER,
+    back_odds DECIMAL(10,2),
+    lay_odds DECIMAL(10,2),
+    market_id VARCHAR(100),
+    selection_id_betfair VARCHAR(100),
+    market_status VARCHAR(50), -- 'OPEN', 'SUSPENDED', 'CLOSED'
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT price_observations_pk PRIMARY KEY (observation_id, observed_at)
+) PARTITION BY RANGE (observed_at);
+
+ALTER SEQUENCE price_observations_observation_id_seq OWNED BY price_observations.observation_id;
+
+-- Partitions for existing history through three months ahead
+DO $$
+DECLARE
+    v_first DATE;
+    v_months INTEGER;
+BEGIN
+    SELECT COALESCE(MIN(observed_at), now())::DATE INTO v_first FROM price_observations_legacy;
+    v_months := (EXTRACT(YEAR FROM age(date_trunc('month', now()), date_trunc('month', v_first))) * 12
+               + EXTRACT(MONTH FROM age(date_trunc('month', now()), date_trunc('month', v_first))))::INTEGER + 4;
+    PERFORM ensure_monthly_partitions('public', 'price_observations', v_first, v_months);
+END $$;
+
+INSERT INTO price_observations
+    (observation_id, selection_id, observed_at, minutes_to_off, back_odds, lay_odds,
+     market_id, selection_id_betfair, market_status, created_at)
+SELECT observation_id, selection_id, observed_at, minutes_to_off, back_odds, lay_odds,
+       market_id, selection_id_betfair, market_status, created_at
+FROM price_observations_legacy;
+
+DROP TABLE price_observations_legacy;
+
+-- BRIN: tiny, and ideal for append-mostly timestamp columns
+CREATE INDEX idx_price_observations_time_brin
+    ON price_observations USING BRIN (observed_at) WITH (pages_per_range = 32);
+-- Per-selection price paths (B-tree, time-ordered within selection)
+CREATE INDEX idx_price_observations_selection
+    ON price_observations (selection_id, observed_at);
+
+-- ============================================================================
+-- 3. MODELING.SIGNALS -> PARTITIONED BY as_of
+-- ============================================================================
+-- The (as_of, race_id, horse_id, model_id) unique key already contains the
+-- partition key, so publish()'s ON CONFLICT upsert keeps working unchanged.
+
+ALTER TABLE modeling.signals RENAME TO signals_legacy;
+ALTER SEQUENCE modeling.signals_signal_id_seq OWNED BY NONE;
+
+CREATE TABLE modeling.signals (
+  signal_id       BIGINT NOT NULL DEFAULT nextval('modeling.signals_signal_id_seq'),
+  as_of           TIMESTAMPTZ NOT NULL,
+  race_id         BIGINT NOT NULL,
+  horse_id        BIGINT NOT NULL,
+  model_id        BIGINT NOT NULL REFERENCES modeling.models(model_id),
+  p_win           DOUBLE PRECISION NOT NULL,
+  p_place         DOUBLE PRECISION,
+  fair_odds_win   DOUBLE PRECISION NOT NULL,
+  fair_odds_place DOUBLE PRECISION,
+  best_odds_win   DOUBLE PRECISION,
+  best_odds_src   TEXT,
+  ew_places       INT,
+  ew_fraction     TEXT,
+  edge_win        DOUBLE PRECISION,
+  edge_ew         DOUBLE PRECISION,
+  kelly_fraction  DOUBLE PRECISION,
+  stake_units     DOUBLE PRECISION,
+  liquidity_ok    BOOLEAN DEFAULT true,
+  reasons_json    JSONB,
+  CONSTRAINT signals_pk PRIMARY KEY (signal_id, as_of),
+  CONSTRAINT signals_as_of_race_horse_model_key UNIQUE (as_of, race_id, horse_id, model_id)
+) PARTITION BY RANGE (as_of);
+
+ALTER SEQUENCE modeling.signals_signal_id_seq OWNED BY modeling.signals.signal_id;
+
+DO $$
+DECLARE
+    v_first DATE;
+    v_months INTEGER;
+BEGIN
+    SELECT COALESCE(MIN(as_of), now())::DATE INTO v_first FROM modeling.signals_legacy;
+    v_months := (EXTRACT(YEAR FROM age(date_trunc('month', now()), date_trunc('month', v_first))) * 12
+               + EXTRACT(MONTH FROM age(date_trunc('month', now()), date_trunc('month', v_first))))::INTEGER + 4;
+    PERFORM ensure_monthly_partitions('modeling', 'signals', v_first, v_months);
+END $$;
+
+INSERT INTO modeling.signals
+SELECT * FROM modeling.signals_legacy;
+
+DROP TABLE modeling.signals_legacy;
+
+CREATE INDEX IF NOT EXISTS idx_signals_as_of_brin
+  ON modeling.signals USING BRIN (as_of) WITH (pages_per_range = 32);
+
+CREATE INDEX IF NOT EXISTS idx_signals_race_as_of
+  ON modeling.signals(race_id, as_of DESC);
+
+CREATE INDEX IF NOT EXISTS idx_signals_model_as_of
+  ON modeling.signals(model_id, as_of DESC);
+
+COMMENT ON TABLE modeling.signals IS 'Generated predictions/signals for upcoming races (monthly partitions on as_of)';
+
+-- ============================================================================
+-- 4. 1-MINUTE OHLC ROLLUP
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS price_observations_1m (
+    selection_id INTEGER NOT NULL REFERENCES morning_selections(selection_id),
+    minute TIMESTAMP NOT NULL,
+    market_id VARCHAR(100),
+    selection_id_betfair VARCHAR(100),
+    minutes_to_off INTEGER,            -- At the last tick in the minute
+    back_open DECIMAL(10,2),
+    back_high DECIMAL(10,2),
+    back_low DECIMAL(10,2),
+    back_close DECIMAL(10,2),
+    lay_open DECIMAL(10,2),
+    lay_high DECIMAL(10,2),
+    lay_low DECIMAL(10,2),
+    lay_close DECIMAL(10,2),
+    ticks INTEGER NOT NULL,
+    PRIMARY KEY (selection_id, minute)
+);
+
+CREATE INDEX IF NOT EXISTS idx_price_observations_1m_minute_brin
+    ON price_observations_1m USING BRIN (minute);
+
+-- Compacts ticks older than p_keep into price_observations_1m and removes
+-- them (whole partitions are dropped, the boundary month is DELETEd).
+-- Returns the number of raw ticks removed.
+CREATE OR REPLACE FUNCTION rollup_price_observations(p_keep INTERVAL DEFAULT INTERVAL '30 days')
+RETURNS BIGINT AS $$
+DECLARE
+    v_cutoff TIMESTAMP := date_trunc('minute', now()::TIMESTAMP - p_keep);
+    v_part RECORD;
+    v_removed BIGINT := 0;
+    v_count BIGINT;
+BEGIN
+    INSERT INTO price_observations_1m AS t
+        (selection_id, minute, market_id, selection_id_betfair, minutes_to_off,
+         back_open, back_high, back_low, back_close,
+         lay_open, lay_high, lay_low, lay_close, ticks)
+    SELECT
+        selection_id,
+        date_trunc('minute', observed_at) AS minute,
+        (array_agg(market_id ORDER BY observed_at DESC))[1],
+        (array_agg(selection_id_betfair ORDER BY observed_at DESC))[1],
+        (array_agg(minutes_to_off ORDER BY observed_at DESC))[1],
+        (array_agg(back_odds ORDER BY observed_at) FILTER (WHERE back_odds IS NOT NULL))[1],
+        MAX(back_odds),
+        MIN(back_odds),
+        (array_agg(back_odds ORDER BY observed_at DESC) FILTER (WHERE back_odds IS NOT NULL))[1],
+        (array_agg(lay_odds ORDER BY observed_at) FILTER (WHERE lay_odds IS NOT NULL))[1],
+        MAX(lay_odds),
+        MIN(lay_odds),
+        (array_agg(lay_odds ORDER BY observed_at DESC) FILTER (WHERE lay_odds IS NOT NULL))[1],
+        COUNT(*)
+    FROM price_observations
+    WHERE observed_at < v_cutoff
+      AND selection_id IS NOT NULL
+    GROUP BY selection_id, date_trunc('minute', observed_at)
+    ON CONFLICT (selection_id, minute) DO UPDATE SET
+        back_high = GREATEST(t.back_high, EXCLUDED.back_high),
+        back_low = LEAST(t.back_low, EXCLUDED.back_low),
+        back_close = COALESCE(EXCLUDED.back_close, t.back_close),
+        lay_high = GREATEST(t.lay_high, EXCLUDED.lay_high),
+        lay_low = LEAST(t.lay_low, EXCLUDED.lay_low),
+        lay_close = COALESCE(EXCLUDED.lay_close, t.lay_close),
+        minutes_to_off = EXCLUDED.minutes_to_off,
+        ticks = t.ticks + EXCLUDED.ticks;
+
+    -- Drop partitions that end on or before the cutoff
+    FOR v_part IN
+        SELECT c.relname,
+               to_date(right(c.relname, 6), 'YYYYMM') AS month_start
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'price_observations'::regclass
+          AND c.relname ~ '_p[0-9]{6}$'
+    LOOP
+        IF (v_part.month_start + INTERVAL '1 month') <= v_cutoff THEN
+            EXECUTE format('SELECT COUNT(*) FROM %I', v_part.relname) INTO v_count;
+            EXECUTE format('DROP TABLE %I', v_part.relname);
+            v_removed := v_removed + v_count;
+        END IF;
+    END LOOP;
+
+    -- Boundary month: delete only the rolled-up ticks
+    DELETE FROM price_observations WHERE observed_at < v_cutoff;
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    v_removed := v_removed + v_count;
+
+    RETURN v_removed;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Daily maintenance: create upcoming partitions, then compact old ticks
+CREATE OR REPLACE FUNCTION maintain_tick_storage(p_keep INTERVAL DEFAULT INTERVAL '30 days')
+RETURNS BIGINT AS $$
+BEGIN
+    PERFORM ensure_monthly_partitions('public', 'price_observations', CURRENT_DATE, 3);
+    PERFORM ensure_monthly_partitions('modeling', 'signals', CURRENT_DATE, 3);
+    RETURN rollup_price_observations(p_keep);
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- COMMENTS
+-- ============================================================================
+
+COMMENT ON TABLE price_observations IS 'Continuous price tracking throughout the day (monthly partitions on observed_at)';
+COMMENT ON TABLE price_observations_1m IS '1-minute OHLC rollup of price_observations older than the retention window';
+COMMENT ON FUNCTION ensure_monthly_partitions(TEXT, TEXT, DATE, INTEGER) IS 'Create monthly range partitions ahead of time';
+COMMENT ON FUNCTION rollup_price_observations(INTERVAL) IS 'Compact ticks older than the window into 1-minute OHLC rows';
+COMMENT ON FUNCTION maintain_tick_storage(INTERVAL) IS 'Daily job: ensure partitions + roll up old ticks';
+
+COMMIT;
+
+-- ============================================================================
+-- END OF MIGRATION
+-- ============================================================================
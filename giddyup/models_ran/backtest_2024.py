@@ -13,6 +13,8 @@ import numpy as np
 import pickle
 import os
 
+from giddyup.backtest.bootstrap import bootstrap_frame, format_ci
+
 
 def main():
     """Run backtest on 2024 data."""
@@ -146,6 +148,11 @@ def main():
     print(f"   ROI: {roi:+.1f}%")
     print(f"   Profit per bet: {total_pnl/len(bets_df):+.3f} units")
     
+    # Race-clustered bootstrap
+    ci = bootstrap_frame(bets_df, "stake_units", "pnl", seed=42)
+    print(f"   {format_ci(ci)}")
+    print(f"   {format_ci(ci, 'hit_rate')}")
+    
     # ===== 8. Odds Distribution =====
     print(f"\n📈 Bets by Odds Range:")
     print(f"\n{'Range':<12} {'Bets':>8} {'Wins':>6} {'Win%':>7} {'Stake':>8} {'P&L':>10} {'ROI':>8}")
@@ -19,6 +19,7 @@ from sklearn.isotonic import IsotonicRegression
 
 from giddyup.data.feature_lists import ABILITY_FEATURES
 from giddyup.data.market import add_market_features_from_data
+from giddyup.backtest.bootstrap import bootstrap_frame, format_ci
 from giddyup.models.hybrid import (
     score_hybrid,
     select_top_per_race,
@@ -211,6 +212,10 @@ if len(bets) > 0:
     print(f"   Total P&L: {total_pnl:+.2f}u")
     print(f"   ROI: {roi:.3f} ({roi*100:+.1f}%)")
     
+    # Race-clustered bootstrap
+    ci = bootstrap_frame(bets, "stake_units", "pnl", seed=42)
+    print(f"   {format_ci(ci)}")
+    
     # Risk metrics
     cumulative_pnl = np.cumsum(bets_pd["pnl"].values)
     running_max = np.maximum.accumulate(np.concatenate([[0], cumulative_pnl]))
@@ -77,6 +77,7 @@ print(f"   Loaded {len(df):,} rows")
 
 # Features
 from giddyup.data.feature_lists import ABILITY_FEATURES
+from giddyup.backtest.bootstrap import bootstrap_races, format_ci
 features = [f for f in ABILITY_FEATURES if f in df.columns]
 print(f"\n📋 Using {len(features)} features")
 
@@ -271,6 +272,10 @@ if len(candidates) > 0:
     print(f"   Total P&L: {total_pnl:+.2f} units")
     print(f"   ROI: {roi:.3f} ({roi*100:+.1f}%)")
     
+    # Race-clustered bootstrap (1 unit per bet)
+    ci = bootstrap_races(np.ones(n_bets), candidates["roi_bet"], candidates["race_id"], candidates["won"], seed=42)
+    print(f"   {format_ci(ci)}")
+    
     # By odds band
     print(f"\n📊 Performance by Odds Band:")
     candidates["odds_band"] = candidates["decimal_odds"].apply(get_odds_band)
@@ -126,6 +126,7 @@ print(f"   Loaded {len(df):,} rows")
 
 # Features
 from giddyup.data.feature_lists import ABILITY_FEATURES
+from giddyup.backtest.bootstrap import bootstrap_races, format_ci
 features = [f for f in ABILITY_FEATURES if f in df.columns]
 print(f"\n📋 Using {len(features)} features (Path A - pure ability)")
 
@@ -327,6 +328,10 @@ if len(candidates) > 0:
     print(f"   Total P&L: {total_pnl:+.2f}u")
     print(f"   ROI: {roi:.3f} ({roi*100:+.1f}%)")
     
+    # Race-clustered bootstrap
+    ci = bootstrap_races(candidates["stake_units"], candidates["pnl"], candidates["race_id"], candidates["won"], seed=42)
+    print(f"   {format_ci(ci)}")
+    
     # Risk metrics
     cumulative_pnl = np.cumsum(candidates["pnl"].values)
     running_max = np.maximum.accumulate(cumulative_pnl)
@@ -22,6 +22,7 @@ print(f"   Loaded {len(df):,} rows")
 
 # Features
 from giddyup.data.feature_lists import ABILITY_FEATURES
+from giddyup.backtest.bootstrap import bootstrap_frame, format_ci
 
 features = [f for f in ABILITY_FEATURES if f in df.columns]
 print(f"\n📋 Using {len(features)} features")
@@ -145,6 +146,10 @@ if len(filtered) > 0:
     print(f"   Total P&L: {total_pnl:+.2f} units")
     print(f"   ROI: {roi:.3f} ({roi*100:+.1f}%)")
     
+    # Race-clustered bootstrap (1 unit per bet)
+    ci = bootstrap_frame(filtered.with_columns(pl.lit(1.0).alias("stake_units")), "stake_units", "roi_bet", seed=42)
+    print(f"   {format_ci(ci)}")
+    
     # By GPR delta (if available)
     if "gpr_minus_or" in filtered.columns:
         print(f"\n📊 Performance by GPR - OR Delta:")
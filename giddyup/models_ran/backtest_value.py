@@ -17,6 +17,8 @@ import numpy as np
 import pickle
 from pathlib import Path
 
+from giddyup.backtest.bootstrap import bootstrap_frame, format_ci
+
 # Configuration
 EDGE_MIN = 0.03  # 3% minimum edge
 ODDS_MIN = 2.0   # Avoid heavy favorites
@@ -189,6 +191,11 @@ def main():
     print(f"   P&L: {total_pnl:+.2f} units")
     print(f"   ROI: {roi:+.1f}%")
     
+    # Race-clustered bootstrap
+    ci = bootstrap_frame(bets_df, "stake_units", "pnl", seed=42)
+    print(f"   {format_ci(ci)}")
+    print(f"   {format_ci(ci, 'hit_rate')}")
+    
     print(f"\n📊 Betting:")
     print(f"   Average odds: {avg_odds:.2f}")
     print(f"   Average edge: {avg_edge:.1%}")
@@ -20,6 +20,7 @@ from dotenv import load_dotenv
 
 from giddyup.data.build import build_training_data
 from giddyup.data.feature_lists import ABILITY_FEATURES
+from giddyup.backtest.bootstrap import bootstrap_frame, format_ci
 from giddyup.price.value import ev_win
 
 load_dotenv()
@@ -310,6 +311,8 @@ def overall_summary(bets: pl.DataFrame) -> None:
     print(f"\n💰 Financials (1 unit per bet):")
     print(f"   Total P&L: {total_pnl:+.2f} units")
     print(f"   ROI: {roi:.3f} ({roi*100:+.1f}%)")
+    ci = bootstrap_frame(bets.with_columns(pl.lit(1.0).alias("stake_units")), "stake_units", "roi_bet", seed=42)
+    print(f"   {format_ci(ci)}")
     print(f"   Commission Paid: ~{n_wins * COMMISSION:.2f} units")
     
     # Risk metrics
@@ -13,6 +13,8 @@ import polars as pl
 import numpy as np
 import pickle
 
+from giddyup.backtest.bootstrap import bootstrap_frame, format_ci
+
 
 COMMISSION_RATE = 0.05  # 5% on winning bets (Betfair standard)
 
@@ -240,6 +242,8 @@ def main():
     print(f"      Commission Paid: {commission_cost:.2f} units")
     print(f"      Net P&L: {total_pnl_after:+.2f} units")
     print(f"      Net ROI: {roi_after:+.1f}%")
+    ci = bootstrap_frame(bets_df, "stake_units", "pnl_after_comm", seed=42)
+    print(f"      {format_ci(ci)}")
     print(f"\n   Betting Stats:")
     print(f"      Average Odds: {avg_odds:.2f}")
     print(f"      Average Stake: {avg_stake:.3f} units")
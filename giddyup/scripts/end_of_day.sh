@@ -137,12 +137,12 @@ if python3 -c "from telegram_bot import TELEGRAM_ENABLED; exit(0 if TELEGRAM_ENA
         echo "   Sending results to Telegram..."
         
         # Send individual results
-        python3 << 'EOF'
+        python3 - "$DATE" << 'EOF'
 import sys
-import csv
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path.cwd()))
 from telegram_bot import send_result, send_daily_summary
+from utilities.log_writer import load_action_rows
 
 date = sys.argv[1]
 actions_csv = Path(f"strategies/logs/automated_bets/bot_actions_{date}.csv")
@@ -154,40 +154,38 @@ total_pnl = 0
 total_staked = 0
 total_bets = 0
 
-with actions_csv.open() as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        if row.get("bet_placed") in ["DRY_RUN", "EXECUTED"]:
-            total_bets += 1
-            total_staked += float(row.get("stake", 0))
+for row in load_action_rows(actions_csv):
+    if row.get("bet_placed") in ["DRY_RUN", "EXECUTED"]:
+        total_bets += 1
+        total_staked += float(row.get("stake", 0))
+        
+        result = row.get("result", "").strip().upper()
+        if result in ["WIN", "LOSS"]:
+            # Calculate P&L
+            odds = float(row.get("actual_odds", 0))
+            stake = float(row.get("stake", 0))
+            
+            if result == "WIN":
+                pnl = (odds * stake) - stake - (odds * stake * 0.02)
+                wins += 1
+            else:
+                pnl = -stake
+                losses += 1
+            
+            total_pnl += pnl
             
-            result = row.get("result", "").strip().upper()
-            if result in ["WIN", "LOSS"]:
-                # Calculate P&L
-                odds = float(row.get("actual_odds", 0))
-                stake = float(row.get("stake", 0))
-                
-                if result == "WIN":
-                    pnl = (odds * stake) - stake - (odds * stake * 0.02)
-                    wins += 1
-                else:
-                    pnl = -stake
-                    losses += 1
-                
-                total_pnl += pnl
-                
-                # Send result
-                send_result(
-                    horse=row["horse"],
-                    course=row["course"],
-                    race_time=row["race_time"],
-                    result=result,
-                    odds=odds,
-                    stake=stake,
-                    pnl=pnl,
-                    strategy=row["strategy"]
-                )
-                results_sent += 1
+            # Send result
+            send_result(
+                horse=row["horse"],
+                course=row["course"],
+                race_time=row["race_time"],
+                result=result,
+                odds=odds,
+                stake=stake,
+                pnl=pnl,
+                strategy=row["strategy"]
+            )
+            results_sent += 1
 
 # Send daily summary
 if results_sent > 0:
@@ -196,7 +194,6 @@ if results_sent > 0:
 print(f"\n✅ Sent {results_sent} result(s) to Telegram")
 print(f"   Wins: {wins} | Losses: {losses} | P&L: £{total_pnl:.2f}")
 EOF
-        "$DATE"
     else
         echo "   Skipped Telegram notifications"
     fi
@@ -238,9 +235,10 @@ echo "==========================================================================
 echo ""
 
 # Parse final stats from CSV
-python3 << 'EOF'
-import csv
+python3 - "$DATE" << 'EOF'
+import sys
 from pathlib import Path
+from utilities.log_writer import load_action_rows
 
 date = sys.argv[1]
 actions_csv = Path(f"strategies/logs/automated_bets/bot_actions_{date}.csv")
@@ -252,25 +250,23 @@ pending = 0
 total_pnl = 0
 total_staked = 0
 
-with actions_csv.open() as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        if row.get("bet_placed") in ["DRY_RUN", "EXECUTED"]:
-            total_bets += 1
-            stake = float(row.get("stake", 0))
-            total_staked += stake
-            
-            result = row.get("result", "").strip().upper()
-            if result == "WIN":
-                odds = float(row.get("actual_odds", 0))
-                pnl = (odds * stake) - stake - (odds * stake * 0.02)
-                total_pnl += pnl
-                wins += 1
-            elif result == "LOSS":
-                total_pnl -= stake
-                losses += 1
-            else:
-                pending += 1
+for row in load_action_rows(actions_csv):
+    if row.get("bet_placed") in ["DRY_RUN", "EXECUTED"]:
+        total_bets += 1
+        stake = float(row.get("stake", 0))
+        total_staked += stake
+        
+        result = row.get("result", "").strip().upper()
+        if result == "WIN":
+            odds = float(row.get("actual_odds", 0))
+            pnl = (odds * stake) - stake - (odds * stake * 0.02)
+            total_pnl += pnl
+            wins += 1
+        elif result == "LOSS":
+            total_pnl -= stake
+            losses += 1
+        else:
+            pending += 1
 
 print(f"📊 Summary for {date}:")
 print(f"   Total Bets: {total_bets}")
@@ -286,7 +282,6 @@ if wins + losses > 0:
     win_rate = (wins / (wins + losses)) * 100
     print(f"   Win Rate: {win_rate:.1f}%")
 EOF
-"$DATE"
 
 echo ""
 echo "📁 Files generated:"
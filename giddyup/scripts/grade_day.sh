@@ -115,13 +115,13 @@ if python3 -c "from telegram_bot import TELEGRAM_ENABLED; exit(0 if TELEGRAM_ENA
         echo "   ✅ Results notifications sent via results_checker"
         
         # Send daily summary
-        python3 << 'EOF'
+        python3 - "$DATE" << 'EOF'
 import sys
-import csv
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path.cwd()))
 from telegram_bot import send_daily_summary
+from utilities.log_writer import load_action_rows
 
 date = sys.argv[1]
 actions_csv = Path(f"strategies/logs/automated_bets/bot_actions_{date}.csv")
@@ -132,25 +132,22 @@ total_pnl = 0
 total_staked = 0
 total_bets = 0
 
-with actions_csv.open() as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        if row.get("bet_placed") in ["DRY_RUN", "EXECUTED"]:
-            total_bets += 1
-            total_staked += float(row.get("stake", 0))
-            
-            result = row.get("result", "").strip().upper()
-            if result == "WIN":
-                wins += 1
-                total_pnl += float(row.get("pnl_gbp", 0))
-            elif result == "LOSS":
-                losses += 1
-                total_pnl += float(row.get("pnl_gbp", 0))
+for row in load_action_rows(actions_csv):
+    if row.get("bet_placed") in ["DRY_RUN", "EXECUTED"]:
+        total_bets += 1
+        total_staked += float(row.get("stake", 0))
+        
+        result = row.get("result", "").strip().upper()
+        if result == "WIN":
+            wins += 1
+            total_pnl += float(row.get("pnl_gbp", 0))
+        elif result == "LOSS":
+            losses += 1
+            total_pnl += float(row.get("pnl_gbp", 0))
 
 send_daily_summary(date, total_bets, total_staked, wins, losses, total_pnl)
 print(f"   ✅ Daily summary sent to Telegram")
 EOF
-        "$DATE"
     fi
 else
     echo "ℹ️  Telegram not configured (optional)"
@@ -165,10 +162,10 @@ echo "==========================================================================
 echo ""
 
 # Calculate final stats
-python3 << 'EOF'
+python3 - "$DATE" << 'EOF'
 import sys
-import csv
 from pathlib import Path
+from utilities.log_writer import load_action_rows
 
 date = sys.argv[1]
 actions_csv = Path(f"strategies/logs/automated_bets/bot_actions_{date}.csv")
@@ -180,25 +177,23 @@ pending = 0
 total_pnl = 0
 total_staked = 0
 
-with actions_csv.open() as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        if row.get("bet_placed") in ["DRY_RUN", "EXECUTED"]:
-            total_bets += 1
-            stake = float(row.get("stake", 0))
-            total_staked += stake
-            
-            result = row.get("result", "").strip().upper()
-            if result == "WIN":
-                wins += 1
-                pnl = float(row.get("pnl_gbp", 0))
-                total_pnl += pnl
-            elif result == "LOSS":
-                losses += 1
-                pnl = float(row.get("pnl_gbp", 0))
-                total_pnl += pnl
-            else:
-                pending += 1
+for row in load_action_rows(actions_csv):
+    if row.get("bet_placed") in ["DRY_RUN", "EXECUTED"]:
+        total_bets += 1
+        stake = float(row.get("stake", 0))
+        total_staked += stake
+        
+        result = row.get("result", "").strip().upper()
+        if result == "WIN":
+            wins += 1
+            pnl = float(row.get("pnl_gbp", 0))
+            total_pnl += pnl
+        elif result == "LOSS":
+            losses += 1
+            pnl = float(row.get("pnl_gbp", 0))
+            total_pnl += pnl
+        else:
+            pending += 1
 
 print(f"📊 Final Summary:")
 print(f"   Total Bets: {total_bets}")
@@ -214,13 +209,12 @@ if wins + losses > 0:
     win_rate = (wins / (wins + losses)) * 100
     print(f"   Win Rate: {win_rate:.1f}%")
 EOF
-"$DATE"
 
 echo ""
 echo "📁 Files generated:"
 echo "   Excel Report: strategies/logs/automated_bets/betting_report_$DATE.xlsx"
 echo "   Result Tweets: strategies/logs/tweets/*_result.tweet"
-echo "   Updated CSV: strategies/logs/automated_bets/bot_actions_$DATE.csv"
+echo "   Results: strategies/logs/automated_bets/bot_results_$DATE.csv"
 echo ""
 echo "🎯 Next steps:"
 echo "   - Review Excel report: Open betting_report_$DATE.xlsx"
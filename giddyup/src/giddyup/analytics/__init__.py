@@ -0,0 +1,11 @@
+"""
+Out-of-core analytics over local Parquet.
+
+Registers the feature store, tick archive and bot bet logs as DuckDB views
+and provides parameterised ROI queries (by odds band, course, trainer, month)
+for backtests and reports.
+"""
+
+from .duck import DIMENSIONS, ODDS_BANDS, Analytics, band_case, connect
+
+__all__ = ["DIMENSIONS", "ODDS_BANDS", "Analytics", "band_case", "connect"]
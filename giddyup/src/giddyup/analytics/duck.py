@@ -0,0 +1,334 @@
+"""
+DuckDB views over the local Parquet/CSV files.
+
+Nothing is loaded up front: each source is registered as a view and DuckDB
+streams it from disk when a query runs, so filters and aggregations over the
+full feature store never materialise the whole table in memory.
+
+Views (registered only when their files exist):
+
+    features     data/training_dataset.parquet (one row per runner)
+    runner_bets  features as level 1-unit win bets on every priced runner
+    ticks        strategies/logs/ticks/date=*/*.parquet (hive `date` column)
+    bot_actions  strategies/logs/automated_bets/bot_actions_*.csv
+    bot_results  latest result per (date, race_time, horse) from the
+                 bot_results_*.csv sidecars
+    bot_bets     placed bot bets (DRY_RUN / EXECUTED, `live` flags real
+                 money) joined to their results
+
+Every "bet" relation exposes the same columns, so the ROI queries work on any
+of them: race_date, course, trainer, odds, stake, won, pnl.
+"""
+
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import duckdb
+import polars as pl
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+DEFAULT_FEATURE_STORE = Path("data/training_dataset.parquet")
+DEFAULT_TICK_ROOT = REPO_ROOT / "strategies" / "logs" / "ticks"
+DEFAULT_BET_LOG_DIR = REPO_ROOT / "strategies" / "logs" / "automated_bets"
+
+# (label, min_odds inclusive, max_odds exclusive)
+ODDS_BANDS: List[Tuple[str, float, float]] = [
+    ("1.01-2.99", 1.01, 3.0),
+    ("3.00-5.99", 3.0, 6.0),
+    ("6.00-10.99", 6.0, 11.0),
+    ("11.00-20.99", 11.0, 21.0),
+    ("21.00+", 21.0, 1001.0),
+]
+
+DIMENSIONS = ("band", "course", "trainer", "month")
+
+_IDENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+PathLike = Union[str, Path]
+
+
+def _quote_path(path: PathLike) -> str:
+    return "'" + str(path).replace("'", "''") + "'"
+
+
+def _ident(name: str) -> str:
+    if not _IDENT.match(name):
+        raise ValueError(f"Invalid relation name: {name!r}")
+    return name
+
+
+def band_case(bands: Sequence[Tuple[str, float, float]] = ODDS_BANDS,
+              column: str = "odds") -> Tuple[str, str]:
+    """
+    SQL CASE expressions mapping odds to a band label and its sort order.
+
+    Returns:
+        (label_expr, order_expr)
+    """
+    column = _ident(column)
+    labels, orders = [], []
+    for i, (label, lo, hi) in enumerate(bands):
+        cond = f"{column} >= {float(lo)!r} AND {column} < {float(hi)!r}"
+        labels.append(f"WHEN {cond} THEN '{label.replace(chr(39), chr(39) * 2)}'")
+        orders.append(f"WHEN {cond} THEN {i}")
+    return (
+        f"CASE {' '.join(labels)} ELSE 'other' END",
+        f"CASE {' '.join(orders)} ELSE {len(bands)} END",
+    )
+
+
+def connect(feature_store: Optional[PathLike] = DEFAULT_FEATURE_STORE,
+            tick_root: Optional[PathLike] = DEFAULT_TICK_ROOT,
+            bet_log_dir: Optional[PathLike] = DEFAULT_BET_LOG_DIR,
+            database: str = ":memory:",
+            memory_limit: Optional[str] = None,
+            threads: Optional[int] = None) -> duckdb.DuckDBPyConnection:
+    """
+    Open a DuckDB connection with the local data registered as views.
+
+    Args:
+        feature_store: Training dataset Parquet file (None to skip)
+        tick_root: Tick archive directory (None to skip)
+        bet_log_dir: Directory of bot_actions_*.csv / bot_results_*.csv (None to skip)
+        database: DuckDB database file (default in-memory; views only)
+        memory_limit: e.g. "2GB" - DuckDB spills to disk above this
+        threads: Worker threads (default: DuckDB's choice)
+
+    Returns:
+        DuckDB connection
+    """
+    con = duckdb.connect(database)
+    if memory_limit:
+        con.execute(f"SET memory_limit = {_quote_path(memory_limit)}")
+    if threads:
+        con.execute(f"SET threads = {int(threads)}")
+
+    if feature_store is not None and Path(feature_store).exists():
+        con.execute(
+            f"CREATE OR REPLACE VIEW features AS "
+            f"SELECT * FROM read_parquet({_quote_path(feature_store)})"
+        )
+        con.execute("""
+            CREATE OR REPLACE VIEW runner_bets AS
+            SELECT
+                race_id,
+                horse_id,
+                race_date,
+                CAST(course_id AS VARCHAR)  AS course,
+                CAST(trainer_id AS VARCHAR) AS trainer,
+                decimal_odds                AS odds,
+                1.0                         AS stake,
+                won,
+                CASE WHEN won THEN decimal_odds - 1.0 ELSE -1.0 END AS pnl
+            FROM features
+            WHERE decimal_odds IS NOT NULL
+        """)
+
+    if tick_root is not None and any(Path(tick_root).glob("date=*/*.parquet")):
+        pattern = str(Path(tick_root) / "date=*" / "*.parquet")
+        con.execute(
+            f"CREATE OR REPLACE VIEW ticks AS "
+            f"SELECT * FROM read_parquet({_quote_path(pattern)}, hive_partitioning = true)"
+        )
+
+    if bet_log_dir is not None:
+        _register_bet_logs(con, Path(bet_log_dir))
+
+    return con
+
+
+def _register_bet_logs(con: duckdb.DuckDBPyConnection, log_dir: Path):
+    if not any(log_dir.glob("bot_actions_*.csv")):
+        return
+
+    actions = _quote_path(log_dir / "bot_actions_*.csv")
+    con.execute(f"""
+        CREATE OR REPLACE VIEW bot_actions AS
+        SELECT
+            CAST(regexp_extract(filename, 'bot_actions_(\\d{{4}}-\\d{{2}}-\\d{{2}})', 1) AS DATE) AS race_date,
+            * EXCLUDE (filename)
+        FROM read_csv({actions}, header = true, union_by_name = true,
+                      filename = true, all_varchar = true)
+    """)
+
+    if any(log_dir.glob("bot_results_*.csv")):
+        results = _quote_path(log_dir / "bot_results_*.csv")
+        con.execute(f"""
+            CREATE OR REPLACE VIEW bot_results AS
+            SELECT race_date, race_time, horse, result, pnl_gbp
+            FROM (
+                SELECT
+                    CAST(regexp_extract(filename, 'bot_results_(\\d{{4}}-\\d{{2}}-\\d{{2}})', 1) AS DATE) AS race_date,
+                    race_time, horse, result, pnl_gbp,
+                    row_number() OVER (
+                        PARTITION BY filename, race_time, horse ORDER BY timestamp DESC
+                    ) AS rn
+                FROM read_csv({results}, header = true, union_by_name = true,
+                              filename = true, all_varchar = true)
+            )
+            WHERE rn = 1
+        """)
+        result_join = """
+            LEFT JOIN bot_results r
+              ON r.race_date = a.race_date AND r.race_time = a.race_time AND r.horse = a.horse
+        """
+        result_col = "COALESCE(NULLIF(r.result, ''), NULLIF(a.result, ''))"
+        pnl_col = "COALESCE(TRY_CAST(NULLIF(r.pnl_gbp, '') AS DOUBLE), TRY_CAST(NULLIF(a.pnl_gbp, '') AS DOUBLE))"
+    else:
+        result_join = ""
+        result_col = "NULLIF(a.result, '')"
+        pnl_col = "TRY_CAST(NULLIF(a.pnl_gbp, '') AS DOUBLE)"
+
+    con.execute(f"""
+        CREATE OR REPLACE VIEW bot_bets AS
+        SELECT
+            a.race_date,
+            a.race_time,
+            a.course,
+            NULL::VARCHAR                                     AS trainer,
+            a.horse,
+            a.strategy,
+            a.bet_id,
+            COALESCE(TRY_CAST(NULLIF(a.actual_odds, '') AS DOUBLE),
+                     TRY_CAST(NULLIF(a.expected_odds, '') AS DOUBLE)) AS odds,
+            TRY_CAST(NULLIF(a.stake, '') AS DOUBLE)           AS stake,
+            {result_col}                                      AS result,
+            upper({result_col}) = 'WIN'                        AS won,
+            {pnl_col}                                         AS pnl,
+            upper(a.bet_placed) = 'EXECUTED'                  AS live
+        FROM bot_actions a
+        {result_join}
+        WHERE upper(COALESCE(a.bet_placed, '')) IN ('DRY_RUN', 'EXECUTED', 'YES')
+    """)
+
+
+class Analytics:
+    """
+    Parameterised backtest/report queries over the registered views.
+
+    Example:
+        >>> an = Analytics()
+        >>> an.roi_by("band", start="2024-01-01", end="2024-12-31")
+        >>> an.roi_by("month", relation="bot_bets")
+    """
+
+    def __init__(self, con: Optional[duckdb.DuckDBPyConnection] = None, **paths):
+        """
+        Args:
+            con: Existing connection (default: connect(**paths))
+            **paths: Passed to connect() when no connection is given
+        """
+        self.con = con if con is not None else connect(**paths)
+
+    def views(self) -> List[str]:
+        """Registered view names."""
+        rows = self.con.execute(
+            "SELECT view_name FROM duckdb_views() WHERE NOT internal ORDER BY view_name"
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def query(self, sql: str, params: Optional[Union[Sequence[Any], Dict[str, Any]]] = None) -> pl.DataFrame:
+        """Run SQL against the views and return a Polars DataFrame."""
+        return self.con.execute(sql, params or []).pl()
+
+    def register(self, name: str, sql: str,
+                 params: Optional[Union[Sequence[Any], Dict[str, Any]]] = None):
+        """
+        Register a derived bet relation (e.g. model selections) as a view.
+
+        The relation should expose race_date, course, trainer, odds, stake, won,
+        pnl to be usable with roi_by(). With params, the rows are materialised
+        as a temp table (only the filtered rows are held in memory).
+        """
+        name = _ident(name)
+        if params:
+            # Views can't hold bound parameters - keep the filtered rows instead
+            self.con.execute(f"CREATE OR REPLACE TEMP TABLE {name} AS {sql}", params)
+        else:
+            self.con.execute(f"CREATE OR REPLACE VIEW {name} AS {sql}")
+
+    def roi_by(self, dimension: str, relation: str = "runner_bets",
+               start: Optional[str] = None, end: Optional[str] = None,
+               min_odds: Optional[float] = None, max_odds: Optional[float] = None,
+               bands: Sequence[Tuple[str, float, float]] = ODDS_BANDS,
+               min_bets: int = 1) -> pl.DataFrame:
+        """
+        Bets, wins, stake, P&L and ROI grouped by one dimension.
+
+        Args:
+            dimension: 'band', 'course', 'trainer' or 'month'
+            relation: Bet view (runner_bets, bot_bets or one added via register())
+            start / end: Inclusive race_date bounds ('YYYY-MM-DD')
+            min_odds / max_odds: Odds filter (min inclusive, max exclusive)
+            bands: Odds bands for dimension='band'
+            min_bets: Drop groups with fewer bets
+
+        Returns:
+            DataFrame [<dimension>, bets, wins, win_rate, staked, pnl, roi_pct, avg_odds]
+        """
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"dimension must be one of {DIMENSIONS}, got {dimension!r}")
+        relation = _ident(relation)
+
+        if dimension == "band":
+            key, order = band_case(bands)
+        elif dimension == "month":
+            key = order = "strftime(race_date, '%Y-%m')"
+        else:
+            key = order = dimension
+
+        sql = f"""
+            SELECT
+                {key}                                         AS {dimension},
+                COUNT(*)                                      AS bets,
+                SUM(CASE WHEN won THEN 1 ELSE 0 END)          AS wins,
+                AVG(CASE WHEN won THEN 1.0 ELSE 0.0 END)      AS win_rate,
+                SUM(stake)                                    AS staked,
+                SUM(pnl)                                      AS pnl,
+                SUM(pnl) / NULLIF(SUM(stake), 0) * 100        AS roi_pct,
+                AVG(odds)                                     AS avg_odds
+            FROM {relation}
+            WHERE ($start IS NULL OR race_date >= CAST($start AS DATE))
+              AND ($end IS NULL OR race_date <= CAST($end AS DATE))
+              AND ($min_odds IS NULL OR odds >= $min_odds)
+              AND ($max_odds IS NULL OR odds < $max_odds)
+              AND pnl IS NOT NULL
+            GROUP BY {key}, {order}
+            HAVING COUNT(*) >= $min_bets
+            ORDER BY {order}
+        """
+        return self.query(sql, {
+            "start": start, "end": end,
+            "min_odds": min_odds, "max_odds": max_odds,
+            "min_bets": min_bets,
+        })
+
+    def summary(self, relation: str = "runner_bets",
+                start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
+        """Overall bets, wins, stake, P&L, ROI and average odds for a relation."""
+        relation = _ident(relation)
+        row = self.query(f"""
+            SELECT
+                COUNT(*)                                 AS bets,
+                SUM(CASE WHEN won THEN 1 ELSE 0 END)     AS wins,
+                SUM(stake)                               AS staked,
+                SUM(pnl)                                 AS pnl,
+                SUM(pnl) / NULLIF(SUM(stake), 0) * 100   AS roi_pct,
+                AVG(odds)                                AS avg_odds
+            FROM {relation}
+            WHERE ($start IS NULL OR race_date >= CAST($start AS DATE))
+              AND ($end IS NULL OR race_date <= CAST($end AS DATE))
+              AND pnl IS NOT NULL
+        """, {"start": start, "end": end}).row(0, named=True)
+        return row
+
+    def close(self):
+        self.con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,36 @@
+"""
+Back-to-lay trading rules.
+
+Vectorized green-up profit and lay decisions for all open positions, plus
+threshold sweeps over archived price paths.
+"""
+
+from .engine import (
+    CASHOUT,
+    LARGE_PROFIT,
+    NO_LAY,
+    PRICE_DROP,
+    LayDecisions,
+    best_thresholds,
+    green_up_profit,
+    lay_decisions,
+    lay_rules,
+    minutes_grid,
+    price_matrix,
+    sweep_thresholds,
+)
+
+__all__ = [
+    "CASHOUT",
+    "LARGE_PROFIT",
+    "NO_LAY",
+    "PRICE_DROP",
+    "LayDecisions",
+    "best_thresholds",
+    "green_up_profit",
+    "lay_decisions",
+    "lay_rules",
+    "minutes_grid",
+    "price_matrix",
+    "sweep_thresholds",
+]
@@ -0,0 +1,234 @@
+"""
+Vectorized back-to-lay decisions.
+
+Array versions of HorseBackLayBot's `should_lay_now` and
+`calculate_lay_profit`: every open back position is evaluated in one call,
+and the same rules can be swept over archived price paths to tune
+PRICE_DROP_THRESHOLD and T_MINUS_CASHOUT across many days in one NumPy pass.
+
+Rules (in priority order, as in the bot):
+    1. PRICE_DROP   current <= back * (1 - drop_threshold / 100)
+    2. CASHOUT      minutes_to_off <= cashout_minutes and current < back
+    3. LARGE_PROFIT profit_pct >= large_profit_pct
+A position is only laid if the green-up profit is positive.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+NO_LAY = 0
+PRICE_DROP = 1
+CASHOUT = 2
+LARGE_PROFIT = 3
+
+PRICE_DROP_THRESHOLD = 10.0   # Lay when price drops 10% or more
+T_MINUS_CASHOUT = 15          # Cash out at T-15 if profitable
+LARGE_PROFIT_PCT = 20.0       # Lay on any 20%+ profit
+WATCH_FROM = 120              # Positions are watched from T-120 ...
+WATCH_UNTIL = -5              # ... until 5 minutes after the off
+
+
+def green_up_profit(back_stake, back_odds, lay_odds) -> np.ndarray:
+    """
+    Profit from backing then laying to equal the back return (same whichever
+    way the race goes). Vectorized calculate_lay_profit.
+    """
+    back_stake = np.asarray(back_stake, dtype=np.float64)
+    back_return = back_stake * np.asarray(back_odds, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lay_stake = back_return / np.asarray(lay_odds, dtype=np.float64)
+    return lay_stake - back_stake
+
+
+@dataclass
+class LayDecisions:
+    """Per-position results of lay_decisions()."""
+
+    lay: np.ndarray           # bool - lay now
+    rule: np.ndarray          # int8 - NO_LAY / PRICE_DROP / CASHOUT / LARGE_PROFIT
+    profit_pct: np.ndarray    # (back - current) / back * 100
+    profit: np.ndarray        # Green-up profit in GBP
+    lay_stake: np.ndarray     # Lay stake to green up
+    minutes_to_off: np.ndarray
+
+    def reason(self, i: int) -> str:
+        """Human-readable reason (same wording as should_lay_now)."""
+        rule = int(self.rule[i])
+        if rule == PRICE_DROP:
+            return f"Price shortened {self.profit_pct[i]:.1f}%"
+        if rule == CASHOUT:
+            return f"T-{int(self.minutes_to_off[i])} cash out"
+        if rule == LARGE_PROFIT:
+            return f"Large profit available {self.profit_pct[i]:.1f}%"
+        return "No lay opportunity"
+
+
+def lay_rules(back_odds, current_odds, minutes_to_off,
+              drop_threshold: float = PRICE_DROP_THRESHOLD,
+              cashout_minutes: float = T_MINUS_CASHOUT,
+              large_profit_pct: float = LARGE_PROFIT_PCT) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Which rule (if any) fires for each position. Inputs broadcast together.
+
+    Returns:
+        (rule int8 array, profit_pct array)
+    """
+    back = np.asarray(back_odds, dtype=np.float64)
+    current = np.asarray(current_odds, dtype=np.float64)
+    minutes = np.asarray(minutes_to_off, dtype=np.float64)
+
+    profit_pct = (back - current) / back * 100
+    drop = current <= back * (1 - np.asarray(drop_threshold) / 100)
+    cashout = (minutes <= np.asarray(cashout_minutes)) & (current < back)
+    large = profit_pct >= large_profit_pct
+
+    rule = np.select([drop, cashout, large], [PRICE_DROP, CASHOUT, LARGE_PROFIT], NO_LAY)
+    return rule.astype(np.int8), profit_pct
+
+
+def lay_decisions(back_odds, back_stakes, current_odds, minutes_to_off,
+                  drop_threshold: float = PRICE_DROP_THRESHOLD,
+                  cashout_minutes: float = T_MINUS_CASHOUT,
+                  large_profit_pct: float = LARGE_PROFIT_PCT) -> LayDecisions:
+    """
+    Evaluate every open position at once.
+
+    Args:
+        back_odds: Odds each position was backed at
+        back_stakes: Back stakes (GBP)
+        current_odds: Current best back price (NaN = no price)
+        minutes_to_off: Minutes until each race
+        drop_threshold / cashout_minutes / large_profit_pct: Rule settings
+
+    Example:
+        >>> d = lay_decisions([8.0, 6.0], [10, 10], [7.0, 6.2], [40, 12])
+        >>> d.lay, d.reason(0)
+        (array([ True, False]), 'Price shortened 12.5%')
+    """
+    current = np.asarray(current_odds, dtype=np.float64)
+    minutes = np.asarray(minutes_to_off, dtype=np.float64)
+    rule, profit_pct = lay_rules(back_odds, current, minutes,
+                                 drop_threshold, cashout_minutes, large_profit_pct)
+    profit = green_up_profit(back_stakes, back_odds, current)
+
+    priced = np.isfinite(current) & (current > 1.0)
+    lay = priced & (rule != NO_LAY) & (profit > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lay_stake = np.asarray(back_stakes, dtype=np.float64) * np.asarray(back_odds, dtype=np.float64) / current
+
+    return LayDecisions(lay, np.where(priced, rule, NO_LAY).astype(np.int8),
+                        profit_pct, profit, lay_stake, minutes)
+
+
+# ----------------------------------------------------------------------
+# Threshold sweeps over archived price paths
+# ----------------------------------------------------------------------
+
+def minutes_grid(step: float = 1.0, start: float = WATCH_FROM, end: float = WATCH_UNTIL) -> np.ndarray:
+    """Decision times (minutes to off, counting down) the bot would check at."""
+    return np.arange(start, end - 1e-9, -step)
+
+
+def price_matrix(paths: Sequence[Tuple[np.ndarray, np.ndarray]],
+                 off_times: Sequence[np.datetime64],
+                 grid: np.ndarray) -> np.ndarray:
+    """
+    Resample price paths onto a minutes-to-off grid.
+
+    Each cell holds the last price seen at or before that time (NaN before the
+    first tick), i.e. what the bot's polling loop would have seen.
+
+    Args:
+        paths: Per position (ts datetime64 array sorted ascending, price array)
+        off_times: Per position race off time (datetime64, same timezone as ts)
+        grid: Minutes to off (from minutes_grid())
+
+    Returns:
+        float64 array [positions, len(grid)]
+    """
+    out = np.full((len(paths), len(grid)), np.nan)
+    offsets = (grid * 60_000_000).astype("timedelta64[us]")
+    for i, ((ts, prices), off) in enumerate(zip(paths, off_times)):
+        if len(ts) == 0:
+            continue
+        at = np.datetime64(off, "us") - offsets
+        idx = np.searchsorted(ts.astype("datetime64[us]"), at, side="right") - 1
+        valid = idx >= 0
+        out[i, valid] = np.asarray(prices, dtype=np.float64)[idx[valid]]
+    return out
+
+
+def sweep_thresholds(back_odds, back_stakes, prices: np.ndarray, grid: np.ndarray,
+                     drop_thresholds: Sequence[float], cashout_minutes: Sequence[float],
+                     won: Optional[Sequence[Optional[bool]]] = None,
+                     large_profit_pct: float = LARGE_PROFIT_PCT) -> Dict[str, np.ndarray]:
+    """
+    Replay the lay rules for every (drop threshold, cash-out minute) pair at once.
+
+    A position is laid at the first grid time a rule fires with positive
+    green-up profit. Positions never laid settle on the race result
+    (`won`: True/False, None = unknown, counted as 0).
+
+    Args:
+        back_odds / back_stakes: Per position [N]
+        prices: Price matrix [N, T] from price_matrix()
+        grid: Minutes to off [T]
+        drop_thresholds: Candidate PRICE_DROP_THRESHOLD values [D]
+        cashout_minutes: Candidate T_MINUS_CASHOUT values [C]
+        won: Per position race result, for unlaid positions
+
+    Returns:
+        {'drop_threshold' [D], 'cashout_minutes' [C],
+         'laid' [D, C] positions laid, 'lay_profit' [D, C] green-up profit,
+         'pnl' [D, C] total P&L incl. unlaid positions, 'roi_pct' [D, C]}
+    """
+    back = np.asarray(back_odds, dtype=np.float64)[:, None]           # [N, 1]
+    stakes = np.asarray(back_stakes, dtype=np.float64)
+    drops = np.asarray(drop_thresholds, dtype=np.float64)[:, None, None, None]
+    cashouts = np.asarray(cashout_minutes, dtype=np.float64)[None, :, None, None]
+    minutes = np.asarray(grid, dtype=np.float64)[None, :]              # [1, T]
+
+    profit_pct = (back - prices) / back * 100                          # [N, T]
+    profit = green_up_profit(stakes[:, None], back, prices)            # [N, T]
+    base = np.isfinite(prices) & (profit > 0)
+
+    fires = (
+        (prices <= back * (1 - drops / 100))
+        | ((minutes <= cashouts) & (prices < back))
+        | (profit_pct >= large_profit_pct)
+    ) & base                                                           # [D, C, N, T]
+
+    laid = fires.any(axis=-1)                                          # [D, C, N]
+    first = fires.argmax(axis=-1)
+    lay_profit = np.where(
+        laid, np.take_along_axis(np.broadcast_to(profit, fires.shape), first[..., None], -1)[..., 0], 0.0
+    )
+
+    if won is None:
+        settle = np.zeros(len(stakes))
+    else:
+        result = np.array([np.nan if w is None else float(bool(w)) for w in won])
+        settle = np.where(np.isnan(result), 0.0,
+                          np.where(result == 1.0, stakes * (back[:, 0] - 1), -stakes))
+    pnl = np.where(laid, lay_profit, settle).sum(axis=-1)
+
+    return {
+        "drop_threshold": np.asarray(drop_thresholds, dtype=np.float64),
+        "cashout_minutes": np.asarray(cashout_minutes, dtype=np.float64),
+        "laid": laid.sum(axis=-1),
+        "lay_profit": lay_profit.sum(axis=-1),
+        "pnl": pnl,
+        "roi_pct": pnl / stakes.sum() * 100 if stakes.sum() > 0 else np.zeros_like(pnl),
+    }
+
+
+def best_thresholds(sweep: Dict[str, np.ndarray], metric: str = "pnl") -> List[Tuple[float, float, float]]:
+    """(drop_threshold, cashout_minutes, metric) for every pair, best first."""
+    values = sweep[metric]
+    rows = [
+        (float(sweep["drop_threshold"][d]), float(sweep["cashout_minutes"][c]), float(values[d, c]))
+        for d in range(values.shape[0]) for c in range(values.shape[1])
+    ]
+    return sorted(rows, key=lambda r: r[2], reverse=True)
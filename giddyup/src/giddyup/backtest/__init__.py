@@ -0,0 +1,32 @@
+"""
+Backtest analysis: Monte Carlo bankroll simulation over resampled bet sequences
+and race-clustered bootstrap confidence intervals.
+"""
+
+from .bootstrap import (
+    METRICS,
+    bootstrap_frame,
+    bootstrap_races,
+    format_ci,
+    race_totals,
+)
+from .montecarlo import (
+    RESAMPLE_MODES,
+    bet_returns,
+    resample_indices,
+    simulate_bankroll,
+    summary_rows,
+)
+
+__all__ = [
+    "METRICS",
+    "bootstrap_frame",
+    "bootstrap_races",
+    "format_ci",
+    "race_totals",
+    "RESAMPLE_MODES",
+    "bet_returns",
+    "resample_indices",
+    "simulate_bankroll",
+    "summary_rows",
+]
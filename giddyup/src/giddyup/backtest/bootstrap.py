@@ -0,0 +1,123 @@
+"""
+Race-clustered bootstrap confidence intervals for backtest results.
+
+Bets in the same race are not independent (one winner at most, shared
+going/pace), so the race is the resampling unit. Bets are first collapsed
+into per-race totals (stake, P&L, bets, wins); each replicate then draws
+races with replacement, and its totals are a weighted sum of the race
+totals - the draw counts are the weights, so every replicate in a chunk
+is one matrix product:
+
+    counts[b, r] = times race r was drawn in replicate b
+    sums[b]      = counts[b] @ race_totals             # stake, pnl, bets, wins
+
+Metrics:
+    roi        P&L / stake * 100
+    hit_rate   wins / bets
+    yield      P&L per bet (units)
+
+Example:
+    >>> res = bootstrap_races(df["stake_units"], df["pnl"], df["race_id"], df["won"])
+    >>> print(format_ci(res))
+    ROI +4.2% (95% CI -1.3% to +9.8%, P(profit) 93%, 1,204 races)
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import polars as pl
+
+from giddyup.price.arrays import _values, race_segments
+
+METRICS = ("roi", "hit_rate", "yield")
+
+# Replicates are drawn in chunks of about this many (replicate, race) cells
+CHUNK_CELLS = 5_000_000
+
+
+def race_totals(stake, pnl, race_ids, won=None) -> np.ndarray:
+    """Per-race [stake, pnl, bets, wins] - shape [races, 4]."""
+    segment, n_races = race_segments(race_ids)
+    wins = np.zeros(len(segment)) if won is None else _values(won)
+    columns = (_values(stake), _values(pnl), np.ones(len(segment)), wins)
+    return np.stack([np.bincount(segment, weights=c, minlength=n_races) for c in columns], axis=1)
+
+
+def _metrics(sums: np.ndarray) -> Dict[str, np.ndarray]:
+    stake, pnl, bets, wins = (sums[..., i] for i in range(4))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "roi": np.where(stake > 0, pnl / stake * 100, 0.0),
+            "hit_rate": np.where(bets > 0, wins / bets, 0.0),
+            "yield": np.where(bets > 0, pnl / bets, 0.0),
+        }
+
+
+def bootstrap_races(stake, pnl, race_ids, won=None, n_boot: int = 5000,
+                    ci: float = 0.95, seed: Optional[int] = None) -> Dict:
+    """
+    Bootstrap ROI, hit rate and yield by resampling whole races.
+
+    Args:
+        stake: Stake per bet
+        pnl: P&L per bet (after commission)
+        race_ids: Race of each bet
+        won: Win flag per bet (hit rate is 0 without it)
+        n_boot: Replicates
+        ci: Confidence level for the percentile interval
+        seed: RNG seed
+
+    Returns:
+        {metric: point estimate, metric_lo / metric_hi: interval bounds,
+         'p_profit': share of replicates with positive P&L,
+         'samples': {metric: [n_boot] array}, plus n_races, n_bets, n_boot, ci}
+    """
+    totals = race_totals(stake, pnl, race_ids, won)
+    n_races = len(totals)
+    if n_races == 0:
+        raise ValueError("No bets to bootstrap")
+
+    rng = np.random.default_rng(seed)
+    sums = np.empty((n_boot, 4))
+    chunk = max(1, CHUNK_CELLS // n_races)
+    for start in range(0, n_boot, chunk):
+        b = min(chunk, n_boot - start)
+        idx = rng.integers(0, n_races, size=(b, n_races))
+        cells = (np.arange(b)[:, None] * n_races + idx).ravel()
+        counts = np.bincount(cells, minlength=b * n_races).reshape(b, n_races)
+        sums[start:start + b] = counts.astype(np.float64) @ totals
+
+    point = _metrics(totals.sum(axis=0))
+    samples = _metrics(sums)
+    alpha = (1.0 - ci) / 2.0
+
+    result = {"n_races": n_races, "n_bets": int(totals[:, 2].sum()), "n_boot": n_boot, "ci": ci}
+    for name in METRICS:
+        lo, hi = np.quantile(samples[name], [alpha, 1.0 - alpha])
+        result[name] = float(point[name])
+        result[f"{name}_lo"] = float(lo)
+        result[f"{name}_hi"] = float(hi)
+    result["p_profit"] = float((sums[:, 1] > 0).mean())
+    result["samples"] = samples
+    return result
+
+
+def bootstrap_frame(df: pl.DataFrame, stake_col: str = "stake_units", pnl_col: str = "pnl",
+                    race_col: str = "race_id", won_col: Optional[str] = "won", **kwargs) -> Dict:
+    """bootstrap_races on the columns of a bets DataFrame."""
+    won = df[won_col].cast(pl.Float64) if won_col and won_col in df.columns else None
+    return bootstrap_races(df[stake_col], df[pnl_col], df[race_col], won, **kwargs)
+
+
+def format_ci(result: Dict, metric: str = "roi") -> str:
+    """One-line summary, e.g. for the backtest reports."""
+    level = f"{result['ci']:.0%}"
+    if metric == "roi":
+        body = f"ROI {result['roi']:+.1f}% ({level} CI {result['roi_lo']:+.1f}% to {result['roi_hi']:+.1f}%"
+    elif metric == "hit_rate":
+        body = (f"Hit rate {result['hit_rate']:.1%} ({level} CI {result['hit_rate_lo']:.1%} "
+                f"to {result['hit_rate_hi']:.1%}")
+    else:
+        body = (f"Yield {result['yield']:+.3f}/bet ({level} CI {result['yield_lo']:+.3f} "
+                f"to {result['yield_hi']:+.3f}")
+    return f"{body}, P(profit) {result['p_profit']:.0%}, {result['n_races']:,} races)"
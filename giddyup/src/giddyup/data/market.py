@@ -9,10 +9,12 @@ import polars as pl
 from sqlalchemy import create_engine, text
 from dotenv import load_dotenv
 
+from giddyup.price.arrays import remove_vig
+
 load_dotenv()
 
 
-def add_market_features_from_data(df: pl.DataFrame) -> pl.DataFrame:
+def add_market_features_from_data(df: pl.DataFrame, vig_method: str = "proportional") -> pl.DataFrame:
     """
     Add market-derived features from existing decimal_odds column.
     
@@ -20,6 +22,8 @@ def add_market_features_from_data(df: pl.DataFrame) -> pl.DataFrame:
     
     Args:
         df: DataFrame with decimal_odds column
+        vig_method: How q_vigfree is derived - "proportional", "shin" or "power"
+                    (all races solved in one batch, see giddyup.price.arrays)
         
     Returns:
         DataFrame with market features added
@@ -52,9 +56,14 @@ def add_market_features_from_data(df: pl.DataFrame) -> pl.DataFrame:
     df = df.join(overround, on="race_id", how="left")
     
     # Vig-free probability
-    df = df.with_columns([
-        (pl.col("q_market") / pl.col("overround")).alias("q_vigfree")
-    ])
+    if vig_method == "proportional":
+        df = df.with_columns([
+            (pl.col("q_market") / pl.col("overround")).alias("q_vigfree")
+        ])
+    else:
+        df = df.with_columns([
+            remove_vig(df["q_market"], df["race_id"], method=vig_method).alias("q_vigfree")
+        ])
     
     # Is favorite
     df = df.with_columns([
@@ -74,7 +83,8 @@ def add_market_features_from_data(df: pl.DataFrame) -> pl.DataFrame:
 def get_market_snapshot_t60(
     race_ids: list,
     conn_str: str = None,
-    minutes_before: int = 60
+    minutes_before: int = 60,
+    vig_method: str = "proportional"
 ) -> pl.DataFrame:
     """
     Get market snapshot T-60 (or specified minutes before off).
@@ -83,6 +93,7 @@ def get_market_snapshot_t60(
         race_ids: List of race IDs to fetch
         conn_str: Database connection string
         minutes_before: Minutes before off time
+        vig_method: "proportional", "shin" or "power"
         
     Returns:
         DataFrame with race_id, horse_id, decimal_odds, snapshot_ts
@@ -147,7 +158,7 @@ def get_market_snapshot_t60(
             )
         
         # Add market features
-        df = add_market_features_from_data(df)
+        df = add_market_features_from_data(df, vig_method)
         
         return df
         
@@ -157,13 +168,15 @@ def get_market_snapshot_t60(
         return pl.DataFrame()
 
 
-def fallback_to_runner_odds(race_ids: list, conn_str: str = None) -> pl.DataFrame:
+def fallback_to_runner_odds(race_ids: list, conn_str: str = None,
+                            vig_method: str = "proportional") -> pl.DataFrame:
     """
     Fallback: Use decimal_odds from racing.runners when snapshots unavailable.
     
     Args:
         race_ids: List of race IDs
         conn_str: Database connection string
+        vig_method: "proportional", "shin" or "power"
         
     Returns:
         DataFrame with race_id, horse_id, decimal_odds
@@ -192,7 +205,7 @@ def fallback_to_runner_odds(race_ids: list, conn_str: str = None) -> pl.DataFram
         )
     
     # Add market features
-    df = add_market_features_from_data(df)
+    df = add_market_features_from_data(df, vig_method)
     
     return df
 
@@ -2,6 +2,8 @@
 Pricing and value calculation utilities.
 
 Handles edge calculation, Kelly criterion, EV computation with commission.
+Scalar functions live in value.py; array / Polars expression versions in
+arrays.py; place probabilities and each-way value in place.py.
 """
 
 from .value import (
@@ -9,6 +11,25 @@ from .value import (
     ev_win,
     kelly_fraction,
     remove_vig,
+    calculate_stake,
+)
+from . import arrays
+from .arrays import (
+    VIG_METHODS,
+    ev_win_expr,
+    fair_odds_expr,
+    kelly_expr,
+    overround_expr,
+    remove_vig_expr,
+    stake_expr,
+)
+from .place import (
+    PLACE_METHODS,
+    add_place_columns,
+    ew_edge,
+    ew_terms,
+    finish_probs,
+    place_probs,
 )
 
 __all__ = [
@@ -16,5 +37,19 @@ __all__ = [
     "ev_win", 
     "kelly_fraction",
     "remove_vig",
+    "calculate_stake",
+    "arrays",
+    "VIG_METHODS",
+    "ev_win_expr",
+    "fair_odds_expr",
+    "kelly_expr",
+    "overround_expr",
+    "remove_vig_expr",
+    "stake_expr",
+    "PLACE_METHODS",
+    "add_place_columns",
+    "ew_edge",
+    "ew_terms",
+    "finish_probs",
+    "place_probs",
 ]
-
@@ -0,0 +1,250 @@
+"""
+Array versions of the pricing functions in value.py.
+
+Every function takes NumPy arrays, Polars Series, lists or scalars (inputs
+broadcast together) and returns a NumPy array - or a Series if the first
+argument was a Series. The *_expr builders return Polars expressions for
+use in `with_columns`, so a season of runners is priced in a few vector ops
+instead of `map_elements` / `iter_rows` loops.
+
+Example:
+    >>> ev_win(np.array([0.20, 0.10]), np.array([10.0, 10.0]))
+    array([ 0.764, -0.118])
+    >>> df.with_columns(ev_win_expr().alias("ev"), kelly_expr().alias("kelly"))
+    >>> remove_vig(df["q_market"], df["race_id"])     # Per race
+    >>> remove_vig(df["q_market"], df["race_id"], method="shin")
+"""
+
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+import polars as pl
+
+ArrayLike = Union[np.ndarray, pl.Series, Sequence[float], float]
+
+
+def _values(x) -> np.ndarray:
+    if isinstance(x, pl.Series):
+        return x.to_numpy().astype(np.float64, copy=False)
+    return np.asarray(x, dtype=np.float64)
+
+
+def _like(values: np.ndarray, template, name: str):
+    """Return a Series if the caller passed one, else the array."""
+    if isinstance(template, pl.Series):
+        return pl.Series(name, values)
+    return values
+
+
+# ----------------------------------------------------------------------
+# Per-runner
+# ----------------------------------------------------------------------
+
+def fair_odds(p: ArrayLike):
+    """Fair decimal odds 1 / p (p floored at 1e-9)."""
+    return _like(1.0 / np.maximum(1e-9, _values(p)), p, "fair_odds")
+
+
+def ev_win(p: ArrayLike, odds: ArrayLike, commission: float = 0.02):
+    """EV per unit staked: p * (odds - 1) * (1 - commission) - (1 - p)."""
+    prob = _values(p)
+    b = (_values(odds) - 1.0) * (1.0 - commission)
+    return _like(prob * b - (1.0 - prob), p, "ev")
+
+
+def kelly_fraction(p: ArrayLike, odds: ArrayLike, commission: float = 0.02,
+                   max_fraction: float = 1.0):
+    """Full Kelly fraction after commission, clipped to [0, max_fraction] (0 where b <= 0)."""
+    prob = _values(p)
+    b = (_values(odds) - 1.0) * (1.0 - commission)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f_star = (prob * (b + 1.0) - 1.0) / b
+    f = np.where(b > 0, np.clip(f_star, 0.0, max_fraction), 0.0)
+    return _like(f, p, "kelly_fraction")
+
+
+def calculate_stake(p_model: ArrayLike, odds: ArrayLike, commission: float = 0.02,
+                    kelly_fraction_multiplier: float = 0.25, max_stake: float = 1.0):
+    """Fractional Kelly stake in units, capped at max_stake."""
+    f = _values(kelly_fraction(_values(p_model), odds, commission))
+    return _like(np.minimum(f * kelly_fraction_multiplier, max_stake), p_model, "stake")
+
+
+# ----------------------------------------------------------------------
+# Per-race
+# ----------------------------------------------------------------------
+
+def race_segments(race_ids) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Group rows by race.
+
+    Returns:
+        (segment, n_races): segment[i] is row i's race number (0..n_races-1)
+    """
+    ids = race_ids.to_numpy() if isinstance(race_ids, pl.Series) else np.asarray(race_ids)
+    _, segment = np.unique(ids, return_inverse=True)
+    segment = segment.reshape(-1)
+    return segment, int(segment.max()) + 1 if len(segment) else 0
+
+
+def segment_sum(values: np.ndarray, segment: np.ndarray, n_segments: int) -> np.ndarray:
+    """Sum of `values` per segment, broadcast back to rows."""
+    return np.bincount(segment, weights=values, minlength=n_segments)[segment]
+
+
+def overround(q_market: ArrayLike, race_ids=None):
+    """Book percentage (sum of implied probabilities) - per race if race_ids given."""
+    q = _values(q_market)
+    if race_ids is None:
+        return float(q.sum())
+    segment, n = race_segments(race_ids)
+    return _like(segment_sum(q, segment, n), q_market, "overround")
+
+
+VIG_METHODS = ("proportional", "shin", "power")
+
+
+def remove_vig(q_market: ArrayLike, race_ids=None, method: str = "proportional"):
+    """
+    Turn implied probabilities into fair ones summing to 1 (within each race
+    if race_ids is given, otherwise across the whole input).
+
+    Methods:
+        proportional  q / overround - spreads the margin evenly, which
+                      overstates longshots (favourite-longshot bias)
+        shin          Shin (1993) insider-trading model - takes more margin
+                      off longshots
+        power         p = q ** k with k chosen per race so sum(p) = 1
+
+    Args:
+        q_market: Implied probabilities (1 / decimal odds)
+        race_ids: Race of each row (any order)
+        method: One of VIG_METHODS
+    """
+    q = _values(q_market)
+    if race_ids is None:
+        segment, n = np.zeros(len(q), dtype=np.int64), 1
+    else:
+        segment, n = race_segments(race_ids)
+
+    if method == "proportional":
+        total = segment_sum(q, segment, n)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = np.where(total > 0, q / total, q)
+    elif method == "shin":
+        out, _ = shin_probs(q, segment, n)
+    elif method == "power":
+        out, _ = power_probs(q, segment, n)
+    else:
+        raise ValueError(f"Unknown vig method {method!r} (expected one of {VIG_METHODS})")
+    return _like(out, q_market, "q_vigfree")
+
+
+# Both solvers run Newton's method on every race at once: each iteration is a
+# handful of element-wise ops plus one segment sum, and races that have
+# converged simply stop moving.
+
+def shin_probs(q: np.ndarray, segment: np.ndarray, n_segments: int,
+               tol: float = 1e-10, max_iter: int = 30) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Shin probabilities for every race.
+
+        p_i = (sqrt(z^2 + 4 (1 - z) q_i^2 / S) - z) / (2 (1 - z)),   S = sum(q)
+
+    with the insider share z solved per race so that sum(p) = 1. Races with
+    no overround (S <= 1) fall back to proportional.
+
+    Returns:
+        (p per row, z per race)
+    """
+    q = np.asarray(q, dtype=np.float64)
+    total = np.bincount(segment, weights=q, minlength=n_segments)
+    a = q * q / total[segment]
+    z = np.zeros(n_segments)
+    active = total > 1.0
+
+    for _ in range(max_iter):
+        zr = z[segment]
+        root = np.sqrt(zr * zr + 4.0 * (1.0 - zr) * a)
+        p = (root - zr) / (2.0 * (1.0 - zr))
+        g = np.bincount(segment, weights=p, minlength=n_segments) - 1.0
+        if not np.any(active & (np.abs(g) > tol)):
+            break
+        # dp/dz, summed per race
+        with np.errstate(divide="ignore", invalid="ignore"):
+            d_num = (zr - 2.0 * a) / root - 1.0
+            dp = np.nan_to_num((d_num * (1.0 - zr) + (root - zr)) / (2.0 * (1.0 - zr) ** 2))
+            dg = np.bincount(segment, weights=dp, minlength=n_segments)
+            step = np.where(active & (dg != 0), g / dg, 0.0)
+        z = np.clip(z - step, 0.0, 0.99)
+
+    zr = z[segment]
+    p = (np.sqrt(zr * zr + 4.0 * (1.0 - zr) * a) - zr) / (2.0 * (1.0 - zr))
+    fallback = ~active[segment]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = np.where(fallback, np.where(total[segment] > 0, q / total[segment], q), p)
+    return p, z
+
+
+def power_probs(q: np.ndarray, segment: np.ndarray, n_segments: int,
+                tol: float = 1e-10, max_iter: int = 30) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Power-method probabilities p_i = q_i ** k for every race, with k solved
+    per race so that sum(p) = 1 (k > 1 when the book is overround).
+
+    Returns:
+        (p per row, k per race)
+    """
+    q = np.clip(np.asarray(q, dtype=np.float64), 1e-12, 1.0)
+    log_q = np.log(q)
+    k = np.ones(n_segments)
+
+    for _ in range(max_iter):
+        p = q ** k[segment]
+        g = np.bincount(segment, weights=p, minlength=n_segments) - 1.0
+        if np.all(np.abs(g) <= tol):
+            break
+        dg = np.bincount(segment, weights=p * log_q, minlength=n_segments)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = np.where(dg != 0, g / dg, 0.0)
+        k = np.maximum(k - step, 1e-3)
+
+    return q ** k[segment], k
+
+
+# ----------------------------------------------------------------------
+# Polars expression builders
+# ----------------------------------------------------------------------
+
+def _col(x) -> pl.Expr:
+    return pl.col(x) if isinstance(x, str) else x
+
+
+def fair_odds_expr(p="p_model") -> pl.Expr:
+    return 1.0 / pl.max_horizontal(_col(p), pl.lit(1e-9))
+
+
+def ev_win_expr(p="p_model", odds="decimal_odds", commission: float = 0.02) -> pl.Expr:
+    b = (_col(odds) - 1.0) * (1.0 - commission)
+    return _col(p) * b - (1.0 - _col(p))
+
+
+def kelly_expr(p="p_model", odds="decimal_odds", commission: float = 0.02,
+               max_fraction: float = 1.0) -> pl.Expr:
+    b = (_col(odds) - 1.0) * (1.0 - commission)
+    f_star = (_col(p) * (b + 1.0) - 1.0) / b
+    return pl.when(b > 0).then(f_star.clip(0.0, max_fraction)).otherwise(0.0)
+
+
+def stake_expr(p="p_model", odds="decimal_odds", commission: float = 0.02,
+               kelly_fraction_multiplier: float = 0.25, max_stake: float = 1.0) -> pl.Expr:
+    f = kelly_expr(p, odds, commission) * kelly_fraction_multiplier
+    return f.clip(upper_bound=max_stake)
+
+
+def overround_expr(q="q_market", race_id: str = "race_id") -> pl.Expr:
+    return _col(q).sum().over(race_id)
+
+
+def remove_vig_expr(q="q_market", race_id: str = "race_id") -> pl.Expr:
+    return _col(q) / overround_expr(q, race_id)
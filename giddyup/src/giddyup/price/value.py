@@ -2,10 +2,15 @@
 Value and staking calculations with commission.
 
 All functions account for exchange commission (default 2-5%).
+
+Scalar wrappers around the array versions in arrays.py - use those (or the
+*_expr builders) for whole DataFrames.
 """
 
 from typing import Optional
 
+from . import arrays
+
 
 def fair_odds(p: float) -> float:
     """
@@ -23,10 +28,10 @@ def fair_odds(p: float) -> float:
         >>> fair_odds(0.10)
         10.0
     """
-    return 1.0 / max(1e-9, p)
+    return float(arrays.fair_odds(p))
 
 
-def remove_vig(market_probs: list[float]) -> list[float]:
+def remove_vig(market_probs: list[float], method: str = "proportional") -> list[float]:
     """
     Remove vigorish (overround) from market probabilities.
     
@@ -35,6 +40,8 @@ def remove_vig(market_probs: list[float]) -> list[float]:
     
     Args:
         market_probs: List of implied probabilities from market odds
+        method: "proportional" (divide by the overround), "shin" or "power"
+                - see arrays.remove_vig
         
     Returns:
         Vig-free probabilities (sum to 1.0)
@@ -44,10 +51,7 @@ def remove_vig(market_probs: list[float]) -> list[float]:
         >>> remove_vig(market)
         [0.435, 0.304, 0.261]  # Sums to 1.0
     """
-    total = sum(market_probs)
-    if total <= 0:
-        return market_probs
-    return [p / total for p in market_probs]
+    return arrays.remove_vig(market_probs, method=method).tolist()
 
 
 def ev_win(
@@ -76,11 +80,7 @@ def ev_win(
         >>> ev_win(0.10, 10.0, 0.02)  # 10% prob, 10.0 odds
         -0.118  # Negative EV (no value)
     """
-    # Profit if win (after commission)
-    b = (odds - 1.0) * (1.0 - commission)
-    
-    # EV = prob_win * profit - prob_lose * loss
-    return p * b - (1.0 - p)
+    return float(arrays.ev_win(p, odds, commission))
 
 
 def kelly_fraction(
@@ -115,17 +115,7 @@ def kelly_fraction(
         >>> kelly_fraction(0.10, 10.0, 0.02)
         0.0  # No edge (EV negative)
     """
-    # Adjusted profit per unit (after commission)
-    b = (odds - 1.0) * (1.0 - commission)
-    
-    if b <= 0:
-        return 0.0
-    
-    # Kelly formula
-    f_star = (p * (b + 1.0) - 1.0) / b
-    
-    # Clip to [0, max_fraction]
-    return max(0.0, min(max_fraction, f_star))
+    return float(arrays.kelly_fraction(p, odds, commission, max_fraction))
 
 
 def calculate_stake(
@@ -152,12 +142,6 @@ def calculate_stake(
         >>> calculate_stake(0.20, 10.0, commission=0.02, kelly_fraction_multiplier=0.25)
         0.029  # Quarter-Kelly stake
     """
-    # Calculate full Kelly
-    f_kelly = kelly_fraction(p_model, odds, commission, max_fraction=1.0)
-    
-    # Apply fractional Kelly
-    stake = f_kelly * kelly_fraction_multiplier
-    
-    # Cap at max_stake
-    return min(stake, max_stake)
+    return float(arrays.calculate_stake(p_model, odds, commission,
+                                        kelly_fraction_multiplier, max_stake))
 
@@ -18,6 +18,14 @@ load_dotenv()
 _engine = create_engine(os.getenv("PG_DSN"), pool_pre_ping=True)
 
 
+# Columns a row may leave out (published as NULL)
+_OPTIONAL_FIELDS = (
+    "p_place", "fair_odds_place", "best_odds_win", "best_odds_src",
+    "ew_places", "ew_fraction", "edge_win", "edge_ew",
+    "kelly_fraction", "stake_units", "liquidity_ok",
+)
+
+
 # Upsert SQL statement
 _UPSERT_SQL = text("""
 INSERT INTO modeling.signals (
@@ -68,7 +76,9 @@ def publish(rows: Iterable[dict]) -> int:
             - edge_win (float, optional): Expected value
             - kelly_fraction (float, optional): Kelly stake fraction
             - stake_units (float, optional): Recommended stake
-            - ... other optional fields
+            - p_place, fair_odds_place, ew_places, ew_fraction, edge_ew
+              (optional): see giddyup.price.add_place_columns
+            - ... other optional fields (missing ones are published as NULL)
             
     Returns:
         int: Number of rows upserted
@@ -96,6 +106,7 @@ def publish(rows: Iterable[dict]) -> int:
         for row in rows:
             # Prepare row with defaults
             prepared_row = {
+                **dict.fromkeys(_OPTIONAL_FIELDS),
                 **row,
                 "as_of": row.get("as_of", now),
                 "reasons_json": json.dumps(row.get("reasons", [])),
@@ -2,7 +2,13 @@
 Risk management and controls.
 """
 
-from .controls import RiskControls, load_risk_controls_from_env
+from .controls import RiskControls, load_bot_risk_controls_from_env, load_risk_controls_from_env
+from .ledger import Exposure, RiskLedger, RiskLimitError
+from .portfolio import portfolio_kelly, size_portfolio
 
-__all__ = ["RiskControls", "load_risk_controls_from_env"]
+__all__ = [
+    "RiskControls", "load_risk_controls_from_env", "load_bot_risk_controls_from_env",
+    "Exposure", "RiskLedger", "RiskLimitError",
+    "portfolio_kelly", "size_portfolio",
+]
 
@@ -6,13 +6,16 @@ Implements betting risk controls:
 - Daily stake limits
 - Auto-stop on losses
 - Liquidity checks
+- Pre-trade checks against the shared risk ledger
 """
 
 import os
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime, date
 import polars as pl
 
+from .ledger import RiskLedger, RiskLimitError
+
 
 class RiskControls:
     """
@@ -26,6 +29,8 @@ class RiskControls:
         max_daily_stake: float = 20.0,
         max_daily_loss: float = 5.0,
         min_liquidity_required: float = 100.0,
+        max_stake_per_strategy: Optional[float] = None,
+        ledger: Optional[RiskLedger] = None,
     ):
         """
         Initialize risk controls.
@@ -36,12 +41,17 @@ class RiskControls:
             max_daily_stake: Max total stake per day in units (default 20.0)
             max_daily_loss: Stop trading if daily loss exceeds this (default 5.0)
             min_liquidity_required: Min GBP available at best back (default 100)
+            max_stake_per_strategy: Max stake per strategy per day (default no cap)
+            ledger: Shared RiskLedger - daily/race/strategy exposure is read
+                    from it instead of being re-summed from settled bets
         """
         self.max_bets_per_race = max_bets_per_race
         self.max_stake_per_race = max_stake_per_race
         self.max_daily_stake = max_daily_stake
         self.max_daily_loss = max_daily_loss
         self.min_liquidity_required = min_liquidity_required
+        self.max_stake_per_strategy = max_stake_per_strategy
+        self.ledger = ledger
     
     def apply_per_race_cap(self, bets: pl.DataFrame) -> pl.DataFrame:
         """
@@ -102,17 +112,16 @@ class RiskControls:
         if len(today_bets) == 0:
             return {"stake_ok": True, "loss_ok": True, "can_bet": True, "reason": None}
         
-        # Total stake
-        total_stake = today_bets["stake_units"].sum()
-        stake_ok = total_stake <= self.max_daily_stake
-        
         # Total loss (requires settled bets with results)
-        if "roi_bet" in today_bets.columns:
-            total_pnl = today_bets["roi_bet"].sum()
-            loss_ok = total_pnl >= -self.max_daily_loss
-        else:
-            # Can't check P&L without results
-            loss_ok = True
+        total_pnl = today_bets["roi_bet"].sum() if "roi_bet" in today_bets.columns else None
+        
+        return self._daily_status(today_bets["stake_units"].sum(), total_pnl)
+    
+    def _daily_status(self, total_stake: float, total_pnl: Optional[float]) -> Dict:
+        """Daily stake / loss flags for the given totals (P&L None = not yet known)."""
+        stake_ok = total_stake <= self.max_daily_stake
+        # Can't check P&L without results
+        loss_ok = total_pnl is None or total_pnl >= -self.max_daily_loss
         
         can_bet = stake_ok and loss_ok
         
@@ -128,9 +137,81 @@ class RiskControls:
             "can_bet": can_bet,
             "reason": reason,
             "total_stake": total_stake,
-            "total_pnl": total_pnl if "roi_bet" in today_bets.columns else None,
+            "total_pnl": total_pnl,
         }
     
+    def pre_trade_check(self, race_id, stake: float, strategy: str = "default",
+                        liability: Optional[float] = None) -> Dict:
+        """
+        Check one bet against the ledger's running exposure.
+        
+        Dictionary lookups on the ledger's cached totals - cheap enough to
+        call before every order.
+        
+        Args:
+            race_id: Race the bet is on
+            stake: Requested stake (same currency as the limits - units or GBP)
+            strategy: Strategy placing the bet
+            liability: Unused for back bets; accepted so this can be passed
+                       straight to RiskLedger.record_placement as the guard
+            
+        Returns:
+            dict with 'can_bet', 'stake' (trimmed to the remaining capacity)
+            and 'reason'
+        """
+        if self.ledger is None:
+            raise ValueError("pre_trade_check needs a RiskLedger")
+        
+        day, race, strat = self.ledger.pre_trade_view(race_id, strategy)
+        
+        if day.pnl < -self.max_daily_loss:
+            return {"can_bet": False, "stake": 0.0,
+                    "reason": f"Daily loss limit breached: {day.pnl:.2f} < -{self.max_daily_loss:.2f}"}
+        if race.bets >= self.max_bets_per_race:
+            return {"can_bet": False, "stake": 0.0,
+                    "reason": f"Race {race_id} already has {race.bets} bet(s)"}
+        
+        capacity = {
+            "daily stake": self.max_daily_stake - day.stake,
+            "race stake": self.max_stake_per_race - race.stake,
+        }
+        if self.max_stake_per_strategy is not None:
+            capacity[f"{strategy} stake"] = self.max_stake_per_strategy - strat.stake
+        
+        limit, remaining = min(capacity.items(), key=lambda kv: kv[1])
+        if remaining <= 0:
+            return {"can_bet": False, "stake": 0.0, "reason": f"No {limit} capacity left"}
+        
+        return {"can_bet": True, "stake": min(stake, remaining), "reason": None}
+    
+    def place(self, bet_id: str, race_id, stake: float, strategy: str = "default",
+              odds: Optional[float] = None, side: str = "BACK") -> Dict:
+        """
+        Check and record a bet in one ledger transaction.
+        
+        The check runs under the ledger's write lock, so bots sharing the
+        ledger cannot both take the last of a limit.
+        
+        Returns:
+            pre_trade_check result plus 'recorded' (False for a duplicate bet_id
+            or a refused bet)
+        """
+        if self.ledger is None:
+            raise ValueError("place needs a RiskLedger")
+        
+        approved = {}
+        
+        def guard(race_id, strategy, stake, liability):
+            approved.update(self.pre_trade_check(race_id, stake, strategy, liability))
+            return approved
+        
+        try:
+            recorded = self.ledger.record_placement(bet_id, race_id, strategy, stake, odds, side, guard=guard)
+        except RiskLimitError:
+            recorded = False
+        
+        return {**approved, "recorded": recorded}
+    
     def check_liquidity(self, bets: pl.DataFrame, liquidity_col: str = "liquidity_gbp") -> pl.DataFrame:
         """
         Filter bets by liquidity requirements.
@@ -182,12 +263,18 @@ class RiskControls:
         bets = self.check_liquidity(bets)
         
         # 3. Daily limits (check before adding new bets)
-        if today_settled_bets is not None and len(today_settled_bets) > 0:
-            combined = pl.concat([today_settled_bets, bets])
+        if self.ledger is not None:
+            # Running totals across every bot - nothing to re-sum
+            day = self.ledger.day_totals()
+            bets = self._trim_to_race_capacity(bets)
+            daily_status = self._daily_status(day.stake, day.pnl)
         else:
-            combined = bets
-        
-        daily_status = self.check_daily_limits(combined, today_date)
+            if today_settled_bets is not None and len(today_settled_bets) > 0:
+                combined = pl.concat([today_settled_bets, bets])
+            else:
+                combined = bets
+            
+            daily_status = self.check_daily_limits(combined, today_date)
         
         if not daily_status["can_bet"]:
             print(f"⚠️  RISK CONTROL: Trading halted - {daily_status['reason']}")
@@ -205,20 +292,106 @@ class RiskControls:
             ])
         
         return bets, daily_status
+    
+    def _trim_to_race_capacity(self, bets: pl.DataFrame) -> pl.DataFrame:
+        """
+        Fit each race's new bets into what the ledger says is left for that race.
+        
+        Races already holding max_bets_per_race bets get nothing; otherwise the
+        best bets by EV fill the open slots and are scaled together so the
+        race's total stake stays within max_stake_per_race.
+        """
+        if len(bets) == 0:
+            return bets
+        
+        race_ids = bets["race_id"].unique().to_list()
+        exposure = {race_id: self.ledger.race(race_id) for race_id in race_ids}
+        capacity = pl.DataFrame({
+            "race_id": race_ids,
+            "slots_left": [max(0, self.max_bets_per_race - exposure[r].bets) for r in race_ids],
+            "stake_left": [max(0.0, self.max_stake_per_race - exposure[r].stake) for r in race_ids],
+        }, schema_overrides={"race_id": bets.schema["race_id"]})
+        
+        bets = bets.sort(["race_id", "ev_after_commission"], descending=[False, True])
+        bets = bets.join(capacity, on="race_id").with_columns([
+            pl.col("race_id").cum_count().over("race_id").alias("rank_in_race")
+        ])
+        bets = bets.filter(pl.col("rank_in_race") <= pl.col("slots_left"))
+        
+        # Scale each race's bets together, as apply_per_race_cap does
+        bets = bets.with_columns([
+            pl.col("stake_units").sum().over("race_id").alias("total_stake_per_race")
+        ])
+        bets = bets.with_columns([
+            pl.when(pl.col("total_stake_per_race") > pl.col("stake_left"))
+            .then(pl.col("stake_units") * pl.col("stake_left") / pl.col("total_stake_per_race"))
+            .otherwise(pl.col("stake_units"))
+            .alias("stake_units")
+        ])
+        
+        bets = bets.drop(["slots_left", "stake_left", "rank_in_race", "total_stake_per_race"])
+        
+        return bets.filter(pl.col("stake_units") > 0)
 
-
-def load_risk_controls_from_env() -> RiskControls:
+def load_risk_controls_from_env(day: Optional[date] = None) -> RiskControls:
     """
     Load risk control parameters from environment variables.
     
+    Limits are in model units (stake_units). RISK_LEDGER_PATH (optional)
+    points every bot at the same ledger file.
+    
+    Args:
+        day: Trading day the ledger tracks (default today)
+    
     Returns:
         RiskControls instance
     """
+    strategy_cap = os.getenv("MAX_STAKE_PER_STRATEGY")
+    ledger_path = os.getenv("RISK_LEDGER_PATH")
+    
     return RiskControls(
         max_bets_per_race=int(os.getenv("MAX_BETS_PER_RACE", "1")),
         max_stake_per_race=float(os.getenv("MAX_STAKE_PER_RACE", "1.0")),
         max_daily_stake=float(os.getenv("MAX_DAILY_STAKE", "20.0")),
         max_daily_loss=float(os.getenv("MAX_DAILY_LOSS", "5.0")),
         min_liquidity_required=float(os.getenv("MIN_LIQUIDITY_GBP", "100.0")),
+        max_stake_per_strategy=float(strategy_cap) if strategy_cap else None,
+        ledger=RiskLedger(ledger_path, day) if ledger_path else None,
     )
 
+
+def load_bot_risk_controls_from_env(day: Optional[date] = None) -> RiskControls:
+    """
+    Risk controls for the live betting bots, with limits in GBP.
+    
+    Bot stakes are pounds, not model units, so they have their own settings
+    (unset = no cap, the ledger still tracks the exposure):
+        BOT_MAX_BETS_PER_RACE, BOT_MAX_STAKE_PER_RACE_GBP,
+        BOT_MAX_DAILY_STAKE_GBP, BOT_MAX_DAILY_LOSS_GBP,
+        BOT_MAX_STAKE_PER_STRATEGY_GBP
+    
+    Args:
+        day: Trading day the ledger tracks (default today)
+    
+    Returns:
+        RiskControls on the RISK_LEDGER_PATH ledger
+    """
+    ledger_path = os.getenv("RISK_LEDGER_PATH")
+    if not ledger_path:
+        raise ValueError("RISK_LEDGER_PATH not set in environment")
+    
+    def gbp(name: str) -> float:
+        value = os.getenv(name)
+        return float(value) if value else float("inf")
+    
+    strategy_cap = os.getenv("BOT_MAX_STAKE_PER_STRATEGY_GBP")
+    
+    return RiskControls(
+        max_bets_per_race=int(os.getenv("BOT_MAX_BETS_PER_RACE", "1")),
+        max_stake_per_race=gbp("BOT_MAX_STAKE_PER_RACE_GBP"),
+        max_daily_stake=gbp("BOT_MAX_DAILY_STAKE_GBP"),
+        max_daily_loss=gbp("BOT_MAX_DAILY_LOSS_GBP"),
+        min_liquidity_required=float(os.getenv("MIN_LIQUIDITY_GBP", "100.0")),
+        max_stake_per_strategy=float(strategy_cap) if strategy_cap else None,
+        ledger=RiskLedger(ledger_path, day),
+    )
@@ -0,0 +1,282 @@
+"""
+Risk Ledger
+
+Running exposure shared by every bot process:
+- Per-day, per-race and per-strategy totals (bets, stake, open liability,
+  realized P&L) kept in an SQLite file
+- Each placement / settlement / void is one transaction of a few upserts -
+  totals are never re-summed from the bets
+- Reads come from an in-memory copy of today's totals, reloaded only when
+  another process has committed (PRAGMA data_version), so a pre-trade check
+  is a dict lookup
+
+Usage:
+    ledger = RiskLedger("strategies/logs/risk_ledger.sqlite3")
+    ledger.record_placement("1.234", race_id=812345, strategy="path_b", stake=0.5, odds=6.0)
+    ledger.day_totals().stake
+    ledger.record_settlement("1.234", pnl=2.45)
+"""
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger_bets (
+    bet_id TEXT PRIMARY KEY,
+    day TEXT NOT NULL,
+    race_id TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    stake REAL NOT NULL,
+    liability REAL NOT NULL,
+    status TEXT NOT NULL,          -- OPEN, SETTLED, VOID
+    pnl REAL,
+    placed_at TEXT NOT NULL,
+    settled_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS ledger_totals (
+    day TEXT NOT NULL,
+    scope TEXT NOT NULL,           -- day, race, strategy
+    key TEXT NOT NULL,
+    bets INTEGER NOT NULL,
+    stake REAL NOT NULL,
+    open_liability REAL NOT NULL,
+    pnl REAL NOT NULL,
+    PRIMARY KEY (day, scope, key)
+);
+"""
+
+_UPSERT = """
+INSERT INTO ledger_totals VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (day, scope, key) DO UPDATE SET
+    bets = bets + excluded.bets,
+    stake = stake + excluded.stake,
+    open_liability = open_liability + excluded.open_liability,
+    pnl = pnl + excluded.pnl
+"""
+
+
+class RiskLimitError(Exception):
+    """A placement was refused by the pre-trade guard."""
+
+
+@dataclass(frozen=True)
+class Exposure:
+    """Running totals for one day / race / strategy."""
+
+    bets: int = 0
+    stake: float = 0.0
+    open_liability: float = 0.0
+    pnl: float = 0.0
+
+
+Guard = Callable[[str, str, float, float], Dict]
+
+
+class RiskLedger:
+    """SQLite-backed running exposure for one trading day."""
+
+    def __init__(self, path: Union[str, Path], day: Optional[Union[date, str]] = None):
+        """
+        Open (or create) the ledger file.
+
+        Args:
+            path: SQLite file (shared by all bot processes and days)
+            day: Trading day the cached totals track (default today)
+        """
+        self.path = Path(path)
+        self.day = str(day or datetime.now().date())
+        self._lock = threading.RLock()
+        self._totals: Dict[Tuple[str, str], Exposure] = {}
+
+        # Autocommit mode - transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+        self._version = None
+        self._refresh()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def exposure(self, scope: str, key="") -> Exposure:
+        """Totals for ('day', ''), ('race', race_id) or ('strategy', name)."""
+        with self._lock:
+            self._refresh()
+            return self._totals.get((scope, str(key)), Exposure())
+
+    def day_totals(self) -> Exposure:
+        return self.exposure("day")
+
+    def race(self, race_id) -> Exposure:
+        return self.exposure("race", race_id)
+
+    def strategy(self, name: str) -> Exposure:
+        return self.exposure("strategy", name)
+
+    def pre_trade_view(self, race_id, strategy: str) -> Tuple[Exposure, Exposure, Exposure]:
+        """(day, race, strategy) totals with a single staleness check."""
+        with self._lock:
+            self._refresh()
+            get = self._totals.get
+            return (get(("day", ""), Exposure()), get(("race", str(race_id)), Exposure()),
+                    get(("strategy", str(strategy)), Exposure()))
+
+    def snapshot(self) -> Dict[Tuple[str, str], Exposure]:
+        """All of today's totals."""
+        with self._lock:
+            self._refresh()
+            return dict(self._totals)
+
+    def _refresh(self):
+        """Reload today's totals if another connection has committed since."""
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._version:
+            return
+        self._version = version
+        self._totals = {
+            (scope, key): Exposure(bets, stake, liability, pnl)
+            for scope, key, bets, stake, liability, pnl in self._conn.execute(
+                "SELECT scope, key, bets, stake, open_liability, pnl FROM ledger_totals WHERE day = ?",
+                (self.day,)
+            )
+        }
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def record_placement(self, bet_id: str, race_id, strategy: str = "default", stake: float = 0.0,
+                         odds: Optional[float] = None, side: str = "BACK",
+                         guard: Optional[Guard] = None) -> bool:
+        """
+        Record a placed bet.
+
+        Liability is the stake for a back bet, stake * (odds - 1) for a lay.
+
+        Args:
+            guard: Optional pre-trade check run inside the write transaction
+                   (so two processes cannot both pass it). Called as
+                   guard(race_id, strategy, stake, liability) and returns
+                   {'can_bet', 'stake', 'reason'}; the approved stake is
+                   what gets recorded.
+
+        Returns:
+            False if bet_id was already recorded
+
+        Raises:
+            RiskLimitError: the guard refused the bet
+        """
+        race_id, strategy = str(race_id), str(strategy)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._conn.execute("SELECT 1 FROM ledger_bets WHERE bet_id = ?", (str(bet_id),)).fetchone():
+                    self._conn.execute("ROLLBACK")
+                    return False
+
+                liability = _liability(stake, odds, side)
+                if guard is not None:
+                    self._refresh()
+                    status = guard(race_id, strategy, stake, liability)
+                    if not status["can_bet"]:
+                        raise RiskLimitError(status["reason"])
+                    if status["stake"] < stake:
+                        stake = status["stake"]
+                        liability = _liability(stake, odds, side)
+
+                self._conn.execute(
+                    "INSERT INTO ledger_bets VALUES (?, ?, ?, ?, ?, ?, 'OPEN', NULL, ?, NULL)",
+                    (str(bet_id), self.day, race_id, strategy, stake, liability, _now())
+                )
+                self._apply(self.day, race_id, strategy, 1, stake, liability, 0.0)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                self._version = None
+                raise
+        return True
+
+    def record_settlement(self, bet_id: str, pnl: float) -> bool:
+        """
+        Settle an open bet: releases its liability and books the P&L.
+
+        Returns:
+            False if the bet is unknown or already settled/void
+        """
+        return self._close(bet_id, "SETTLED", pnl)
+
+    def void(self, bet_id: str) -> bool:
+        """Cancel an open bet (lapsed / voided race): stake and liability are released."""
+        return self._close(bet_id, "VOID", 0.0)
+
+    def _close(self, bet_id: str, status: str, pnl: float) -> bool:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT day, race_id, strategy, stake, liability FROM ledger_bets "
+                    "WHERE bet_id = ? AND status = 'OPEN'",
+                    (str(bet_id),)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("ROLLBACK")
+                    return False
+
+                day, race_id, strategy, stake, liability = row
+                self._conn.execute(
+                    "UPDATE ledger_bets SET status = ?, pnl = ?, settled_at = ? WHERE bet_id = ?",
+                    (status, pnl, _now(), str(bet_id))
+                )
+                if status == "VOID":
+                    self._apply(day, race_id, strategy, -1, -stake, -liability, 0.0)
+                else:
+                    self._apply(day, race_id, strategy, 0, 0.0, -liability, pnl)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                self._version = None
+                raise
+        return True
+
+    def _apply(self, day: str, race_id: str, strategy: str,
+               bets: int, stake: float, liability: float, pnl: float):
+        """Add deltas to the day, race and strategy totals (inside a transaction)."""
+        for scope, key in (("day", ""), ("race", race_id), ("strategy", strategy)):
+            self._conn.execute(_UPSERT, (day, scope, key, bets, stake, liability, pnl))
+            if day == self.day:
+                old = self._totals.get((scope, key), Exposure())
+                self._totals[(scope, key)] = Exposure(
+                    old.bets + bets, old.stake + stake,
+                    old.open_liability + liability, old.pnl + pnl
+                )
+
+    def close(self):
+        """Close the ledger file."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _liability(stake: float, odds: Optional[float], side: str) -> float:
+    if side.upper() == "LAY":
+        if odds is None:
+            raise ValueError("odds required for a lay bet")
+        return stake * (odds - 1.0)
+    return stake
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
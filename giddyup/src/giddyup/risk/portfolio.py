@@ -0,0 +1,272 @@
+"""
+Portfolio Kelly
+
+Sizes a card of simultaneous bets jointly instead of one at a time:
+- Runners in the same race are mutually exclusive (at most one bet wins)
+- Races are independent
+- All stakes come out of the same bankroll at once
+
+Each race contributes (bets in race + 1) outcomes - one per backed runner
+plus "none of ours won". The card's joint outcomes are enumerated exactly
+when there are at most `max_scenarios` of them, otherwise that many are
+sampled. With the scenario matrix A[s, i] = net return of bet i in scenario
+s, the stakes maximize expected log wealth
+
+    max  sum_s w_s * log(1 + A[s] . f)
+    s.t. 0 <= f_i <= bet cap,  sum(f in race) <= race cap,  sum(f) <= day cap
+
+which is concave; it is solved with a log-barrier Newton method, every
+iteration a couple of matrix products over the scenario matrix.
+
+Example:
+    >>> f = portfolio_kelly(p, odds, race_ids, bet_caps=2.0, race_cap=4.0, day_cap=40.0)
+    >>> df = size_portfolio(df, config)      # stake_units from config/path_b_hybrid.yaml
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import polars as pl
+
+from giddyup.price.arrays import _values, race_segments
+
+MAX_SCENARIOS = 4096
+
+
+def race_scenarios(p: np.ndarray, segment: np.ndarray, n_races: int,
+                   max_scenarios: int = MAX_SCENARIOS,
+                   seed: Optional[int] = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Joint race outcomes for a card.
+
+    Args:
+        p: Win probability of each bet's runner
+        segment: Race number of each bet (0..n_races-1)
+
+    Returns:
+        (wins [scenarios, bets] bool, weights [scenarios]) - wins[s, i] is
+        True when bet i's runner wins in scenario s
+    """
+    n = len(p)
+    order = np.argsort(segment, kind="stable")
+    sizes = np.bincount(segment, minlength=n_races)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    slot = np.empty(n, dtype=np.int64)
+    slot[order] = np.arange(n) - starts[segment[order]]
+
+    # Outcome probabilities per race, padded: [races, max bets + 1] (last used slot = none won)
+    width = int(sizes.max()) + 1
+    probs = np.zeros((n_races, width))
+    probs[segment, slot] = p
+    total = probs.sum(axis=1)
+    over = total > 1.0
+    probs[over] /= total[over, None]
+    probs[np.arange(n_races), sizes] = 1.0 - np.minimum(total, 1.0)
+
+    radix = sizes + 1
+    n_joint = float(np.prod(radix.astype(np.float64)))
+    if n_joint <= max_scenarios:
+        # Mixed-radix enumeration: digit r of scenario s = outcome of race r
+        n_joint = int(n_joint)
+        strides = np.concatenate([[1], np.cumprod(radix)[:-1]])
+        digits = (np.arange(n_joint)[:, None] // strides[None, :]) % radix[None, :]
+        weights = np.prod(probs[np.arange(n_races)[None, :], digits], axis=1)
+    else:
+        # Latin hypercube: every race's outcomes appear in (almost) exactly
+        # their probabilities, only the pairing across races is random
+        rng = np.random.default_rng(seed)
+        cum = np.cumsum(probs, axis=1)
+        strata = rng.permuted(np.tile(np.arange(max_scenarios), (n_races, 1)), axis=1).T
+        u = ((strata + rng.random((max_scenarios, n_races))) / max_scenarios)[..., None]
+        digits = np.minimum((u > cum[None, :, :]).sum(axis=2), sizes[None, :])
+        weights = np.full(max_scenarios, 1.0 / max_scenarios)
+
+    wins = digits[:, segment] == slot[None, :]
+    return wins, weights
+
+
+def _constraints(segment: np.ndarray, n_races: int, bet_caps: np.ndarray,
+                 race_cap: float, day_cap: float) -> Tuple[np.ndarray, np.ndarray]:
+    """G f <= h for the bounds, race caps and day cap."""
+    n = len(segment)
+    rows = [-np.eye(n), np.eye(n)]
+    h = [np.zeros(n), bet_caps]
+    if np.isfinite(race_cap):
+        race_rows = np.zeros((n_races, n))
+        race_rows[segment, np.arange(n)] = 1.0
+        rows.append(race_rows)
+        h.append(np.full(n_races, race_cap))
+    if np.isfinite(day_cap):
+        rows.append(np.ones((1, n)))
+        h.append(np.array([day_cap]))
+    return np.vstack(rows), np.concatenate(h)
+
+
+def _max_step(slack: np.ndarray, rate: np.ndarray) -> float:
+    """Largest s with slack - s * rate > 0 (rate > 0 rows only)."""
+    shrinking = rate > 0
+    if not shrinking.any():
+        return np.inf
+    return float(np.min(slack[shrinking] / rate[shrinking]))
+
+
+def solve_log_growth(returns: np.ndarray, weights: np.ndarray, G: np.ndarray, h: np.ndarray,
+                     f0: np.ndarray, tol: float = 1e-10, mu: float = 50.0,
+                     max_newton: int = 200) -> np.ndarray:
+    """
+    max sum_s w_s log(1 + returns[s] . f)  s.t.  G f <= h, by the barrier method.
+
+    f0 must be strictly feasible.
+    """
+    f = f0.astype(np.float64).copy()
+    m = len(h)
+    t = 1.0
+    steps = 0
+
+    def objective(x, t):
+        wealth = 1.0 + returns @ x
+        slack = h - G @ x
+        return -t * np.dot(weights, np.log(wealth)) - np.sum(np.log(slack))
+
+    while True:
+        for _ in range(max_newton):
+            wealth = 1.0 + returns @ f
+            slack = h - G @ f
+            a = weights / wealth
+            grad = -t * (returns.T @ a) + G.T @ (1.0 / slack)
+            hess = t * (returns.T * (a / wealth)) @ returns + (G.T * (1.0 / slack ** 2)) @ G
+            try:
+                step = -np.linalg.solve(hess, grad)
+            except np.linalg.LinAlgError:
+                step = -np.linalg.lstsq(hess, grad, rcond=None)[0]
+            decrement = -np.dot(grad, step)
+            steps += 1
+            current = objective(f, t)
+            # Objective values grow with t - a predicted decrease below their
+            # rounding noise can't be seen by the line search
+            if decrement / 2.0 <= max(1e-8, 1e-12 * abs(current)):
+                break
+
+            # Stay strictly inside the constraints and the log domain
+            s_max = min(_max_step(slack, G @ step), _max_step(wealth, -(returns @ step)))
+            s = min(1.0, 0.99 * s_max)
+            while s >= 1e-6 and objective(f + s * step, t) > current - 0.25 * s * decrement:
+                s *= 0.5
+            if s < 1e-6:
+                # Line search stalled - nothing left to gain at this t
+                break
+            f = f + s * step
+        if m / t < tol or steps >= max_newton * 10:
+            return f
+        t *= mu
+
+
+def portfolio_kelly(p, odds, race_ids, commission: float = 0.02,
+                    bet_caps=np.inf, race_cap: float = np.inf, day_cap: float = np.inf,
+                    max_scenarios: int = MAX_SCENARIOS, seed: Optional[int] = 0) -> np.ndarray:
+    """
+    Full-Kelly bankroll fractions for simultaneous bets.
+
+    Args:
+        p: Win probability per bet
+        odds: Decimal odds per bet
+        race_ids: Race of each bet (bets on the same race are mutually exclusive)
+        commission: Commission on winnings
+        bet_caps: Max fraction per bet (scalar or per bet)
+        race_cap: Max total fraction per race
+        day_cap: Max total fraction across the card
+        max_scenarios: Enumerate joint outcomes up to this many, else sample
+
+    Returns:
+        Fraction per bet (0 for bets with no positive edge at the optimum)
+    """
+    p = _values(p)
+    b = (_values(odds) - 1.0) * (1.0 - commission)
+    n = len(p)
+    if n == 0:
+        return np.zeros(0)
+
+    caps = np.broadcast_to(np.asarray(bet_caps, dtype=np.float64), (n,)).copy()
+    # Uncapped bets are bounded by the whole bankroll - the barrier needs finite bounds
+    caps = np.where(np.isfinite(caps), caps, 1.0)
+    live = (caps > 0) & (b > 0) & (p > 0)
+    f = np.zeros(n)
+    if not live.any():
+        return f
+
+    segment, n_races = race_segments(np.asarray(race_ids)[live])
+    wins, weights = race_scenarios(p[live], segment, n_races, max_scenarios, seed)
+    returns = np.where(wins, b[live][None, :], -1.0)
+
+    G, h = _constraints(segment, n_races, caps[live], race_cap, day_cap)
+    k = int(live.sum())
+    per_race = np.bincount(segment, minlength=n_races)
+    start = 0.5 * min(caps[live].min(), race_cap / per_race.max(), day_cap / k, 1.0 / (2 * k))
+
+    f_live = solve_log_growth(returns, weights, G, h, np.full(k, start))
+    f[live] = np.clip(f_live, 0.0, None)
+    # Barrier solutions sit a hair above zero for bets the optimum drops
+    f[f < 1e-7] = 0.0
+    return f
+
+
+def size_portfolio(df: pl.DataFrame, config: Dict, p_col: str = "p_blend",
+                   odds_col: str = "decimal_odds", race_col: str = "race_id",
+                   day_col: Optional[str] = "race_date") -> pl.DataFrame:
+    """
+    Set stake_units for a card of selections by portfolio Kelly.
+
+    Caps come from the Path B config (config/path_b_hybrid.yaml):
+    kelly.fraction scales the joint full-Kelly solution; kelly.cap_units,
+    favorite_caps, risk.max_stake_per_race and risk.max_stake_per_day bound
+    the fractional stakes. If selection.max_bets_per_day is set, only the
+    highest-EV bets of each day are sized. Days (day_col) are sized
+    separately; without day_col the whole frame is one card.
+
+    Adds:
+        kelly_portfolio (full-Kelly fraction), stake_units
+    """
+    if len(df) == 0:
+        return df.with_columns([
+            pl.lit(0.0).alias("kelly_portfolio"),
+            pl.lit(0.0).alias("stake_units"),
+        ])
+
+    kelly_frac = config['kelly']['fraction']
+    commission = config['market']['commission']
+    fav = config.get('favorite_caps', {})
+    risk = config.get('risk', {})
+    max_bets = config.get('selection', {}).get('max_bets_per_day')
+
+    odds = df[odds_col].to_numpy().astype(np.float64)
+    caps = np.full(len(df), config['kelly']['cap_units'], dtype=np.float64)
+    if fav:
+        caps = np.where(odds < fav['odds_threshold'], np.minimum(caps, fav['max_stake_units']), caps)
+
+    # Caps are on fractional stakes; the solver works in full-Kelly fractions
+    race_cap = risk.get('max_stake_per_race', np.inf) / kelly_frac
+    day_cap = risk.get('max_stake_per_day', np.inf) / kelly_frac
+
+    if day_col and day_col in df.columns:
+        days, _ = race_segments(df[day_col].cast(pl.Utf8))
+    else:
+        days = np.zeros(len(df), dtype=np.int64)
+
+    ev = df["ev"].to_numpy() if "ev" in df.columns else np.zeros(len(df))
+    p = df[p_col].to_numpy().astype(np.float64)
+    race_ids = df[race_col].to_numpy()
+    kelly = np.zeros(len(df))
+
+    for day in np.unique(days):
+        rows = np.flatnonzero(days == day)
+        if max_bets and len(rows) > max_bets:
+            rows = rows[np.argsort(-ev[rows], kind="stable")[:max_bets]]
+        kelly[rows] = portfolio_kelly(
+            p[rows], odds[rows], race_ids[rows], commission,
+            bet_caps=caps[rows] / kelly_frac, race_cap=race_cap, day_cap=day_cap,
+        )
+
+    return df.with_columns([
+        pl.Series("kelly_portfolio", kelly),
+        pl.Series("stake_units", kelly * kelly_frac),
+    ])
@@ -4,6 +4,7 @@ Path B — Hybrid Market-Aware Scoring
 Ability-only training + market-aware scoring with:
 - Odds-band specific lambda blending
 - Banded edge thresholds
+- Portfolio Kelly staking across each day's selections
 - Target: 200-500 bets/year with 5-15% ROI
 """
 
@@ -13,6 +14,8 @@ from typing import Dict, Tuple
 import yaml
 from pathlib import Path
 
+from giddyup.risk.portfolio import size_portfolio
+
 
 def load_config(config_path: str = "config/path_b_hybrid.yaml") -> dict:
     """Load Path B configuration."""
@@ -352,6 +355,10 @@ def score_hybrid(
         ])
         df_passing = df_passing.filter(pl.col("rank_in_race") == 1)
     
+    # Joint sizing: each day's selections share the bankroll, race and day caps
+    if config['kelly'].get('method', "independent") == "portfolio":
+        df_passing = size_portfolio(df_passing, config).filter(pl.col("stake_units") > 0)
+    
     return df_passing
 
 
@@ -0,0 +1,9 @@
+"""
+Daily selection loading.
+
+Runs both strategies' selection queries in-process and returns typed records.
+"""
+
+from .service import Selection, SelectionService, load_selections, to_uk_time
+
+__all__ = ["Selection", "SelectionService", "load_selections", "to_uk_time"]
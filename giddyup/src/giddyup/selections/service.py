@@ -0,0 +1,347 @@
+"""
+In-process selection service for the betting bots.
+
+Runs the Strategy A (Hybrid V3) and Strategy B (Path B) selection queries
+in a single round trip over a pooled SQLAlchemy connection and returns
+typed Selection records - no shell script, docker exec or CSV scan.
+
+The SQL mirrors strategies/RUN_BOTH_STRATEGIES.sh. Stakes are computed here
+from per-strategy bankrolls (1 unit = 1% of bankroll).
+"""
+
+import os
+from dataclasses import dataclass, asdict
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+load_dotenv()
+
+UK_TZ = ZoneInfo("Europe/London")
+
+# Racing DB stores off times in UTC (shows 1 hour behind UK time during BST)
+DB_TZ = timezone.utc
+
+# Strategy name -> (bankroll key, stake in units, min odds multiplier)
+STRATEGIES = {
+    "A-Hybrid_V3": ("A", 0.015, 0.95),
+    "B-Path_B": ("B", 0.04, 0.90),
+}
+
+
+_SELECTIONS_SQL = text("""
+WITH race_data AS (
+    SELECT
+        r.race_id, r.race_date,
+        TO_CHAR(r.off_time, 'HH24:MI') AS db_time,
+        c.course_name,
+        h.horse_name, t.trainer_name,
+        COALESCE(ru.win_ppwap, ru.dec) AS decimal_odds,
+        ROW_NUMBER() OVER (PARTITION BY r.race_id ORDER BY COALESCE(ru.win_ppwap, ru.dec)) AS row_rank,
+        COUNT(*) OVER (PARTITION BY r.race_id) AS field_size,
+        1.0 / NULLIF(COALESCE(ru.win_ppwap, ru.dec), 0) AS q_market
+    FROM racing.runners ru
+    JOIN racing.races r ON r.race_id = ru.race_id
+    LEFT JOIN racing.courses c ON c.course_id = r.course_id
+    LEFT JOIN racing.horses h ON h.horse_id = ru.horse_id
+    LEFT JOIN racing.trainers t ON t.trainer_id = ru.trainer_id
+    WHERE r.race_date = :race_date
+    AND COALESCE(ru.win_ppwap, ru.dec) >= 1.01
+),
+-- STRATEGY A: HYBRID V3
+race_a AS (
+    SELECT *,
+        row_rank AS market_rank,
+        SUM(q_market) OVER (PARTITION BY race_id) AS overround
+    FROM race_data
+),
+with_calcs AS (
+    SELECT *,
+        q_market / NULLIF(overround, 0) AS q_vigfree,
+        CASE
+            WHEN market_rank = 3 THEN (q_market / overround) * 2.4
+            WHEN market_rank = 4 THEN (q_market / overround) * 2.3
+            WHEN market_rank = 5 THEN (q_market / overround) * 2.0
+            WHEN market_rank = 6 THEN (q_market / overround) * 1.8
+            ELSE (q_market / overround) * 1.1
+        END AS p_model
+    FROM race_a
+),
+with_metrics AS (
+    SELECT *,
+        p_model / NULLIF(q_vigfree, 0) AS disagreement,
+        p_model - q_vigfree AS edge_pp,
+        CASE WHEN market_rank <= 2 THEN (p_model * (decimal_odds - 1) * 0.98 - (1 - p_model)) * 0.3
+             ELSE p_model * (decimal_odds - 1) * 0.98 - (1 - p_model) END AS ev_adjusted
+    FROM with_calcs
+),
+filtered AS (
+    SELECT * FROM with_metrics
+    WHERE decimal_odds BETWEEN 7.0 AND 12.0
+    AND market_rank BETWEEN 3 AND 6
+    AND overround <= 2.20
+    AND disagreement >= 2.20
+    AND edge_pp >= 0.06
+    AND ev_adjusted >= 0.03
+),
+best_per_race AS (
+    SELECT *, ROW_NUMBER() OVER (PARTITION BY race_id ORDER BY edge_pp DESC) AS rank_in_race
+    FROM filtered
+),
+strategy_a AS (
+    SELECT
+        race_id, race_date, db_time, course_name, horse_name,
+        COALESCE(trainer_name, '') AS trainer_name,
+        decimal_odds,
+        'A-Hybrid_V3' AS strategy,
+        'Rank ' || market_rank || '/' || field_size || ' | Disagree ' || ROUND(disagreement::numeric, 2) || 'x | Edge +' || ROUND((edge_pp*100)::numeric, 1) || 'pp' AS reasoning
+    FROM best_per_race
+    WHERE rank_in_race = 1
+),
+-- STRATEGY B: PATH B (field restricted to the 7.0-16.0 band before ranking)
+race_b AS (
+    SELECT *,
+        RANK() OVER (PARTITION BY race_id ORDER BY decimal_odds) AS market_rank,
+        SUM(q_market) OVER (PARTITION BY race_id) AS overround
+    FROM race_data
+    WHERE decimal_odds BETWEEN 7.0 AND 16.0
+),
+with_calcs_b AS (
+    SELECT *,
+        q_market / NULLIF(overround, 0) AS q_vigfree,
+        CASE
+            WHEN market_rank = 3 THEN (q_market / overround) * 2.4
+            WHEN market_rank = 4 THEN (q_market / overround) * 2.3
+            WHEN market_rank = 5 THEN (q_market / overround) * 2.0
+            WHEN market_rank = 6 THEN (q_market / overround) * 1.8
+            ELSE (q_market / overround) * 1.1
+        END AS p_model,
+        CASE
+            WHEN decimal_odds < 8.0 THEN 0.40
+            WHEN decimal_odds < 12.0 THEN 0.15
+            ELSE 0.50
+        END AS lambda,
+        CASE
+            WHEN decimal_odds < 8.0 THEN 0.15
+            WHEN decimal_odds < 12.0 THEN 0.15
+            ELSE 0.16
+        END AS edge_min_required
+    FROM race_b
+),
+with_blend_b AS (
+    SELECT *,
+        (1 - lambda) * p_model + lambda * q_vigfree AS p_blend
+    FROM with_calcs_b
+),
+with_metrics_b AS (
+    SELECT *,
+        p_blend - q_vigfree AS edge_pp,
+        p_blend * (decimal_odds - 1) * 0.98 - (1 - p_blend) AS ev
+    FROM with_blend_b
+),
+filtered_b AS (
+    SELECT * FROM with_metrics_b
+    WHERE edge_pp >= edge_min_required * 0.85
+    AND ev >= 0.015
+    AND overround <= 2.20
+),
+best_per_race_b AS (
+    SELECT *, ROW_NUMBER() OVER (PARTITION BY race_id ORDER BY edge_pp DESC) AS rank_in_race
+    FROM filtered_b
+),
+strategy_b AS (
+    SELECT
+        race_id, race_date, db_time, course_name, horse_name,
+        COALESCE(trainer_name, '') AS trainer_name,
+        decimal_odds,
+        'B-Path_B' AS strategy,
+        'Edge +' || ROUND((edge_pp*100)::numeric, 1) || 'pp (need ' || ROUND((edge_min_required*0.85*100)::numeric, 0) || 'pp) | EV +' || ROUND((ev*100)::numeric, 1) || '%' AS reasoning
+    FROM best_per_race_b
+    WHERE rank_in_race = 1
+)
+SELECT * FROM strategy_a
+UNION ALL
+SELECT * FROM strategy_b
+ORDER BY db_time, strategy
+""")
+
+
+@dataclass(frozen=True)
+class Selection:
+    """A single morning selection for one strategy."""
+
+    race_id: int
+    race_date: date
+    off_time: datetime          # Timezone-aware, Europe/London
+    db_time: str                # HH:MM as stored in the racing DB (UTC)
+    course: str
+    horse: str
+    trainer: str
+    odds: float
+    strategy: str
+    reasoning: str
+    min_odds_needed: float
+    stake_gbp: float
+
+    @property
+    def race_time(self) -> str:
+        """UK off time as HH:MM."""
+        return self.off_time.strftime("%H:%M")
+
+    @property
+    def strategy_key(self) -> str:
+        """Bankroll key for this selection's strategy ('A' or 'B')."""
+        return STRATEGIES[self.strategy][0]
+
+    def to_row(self) -> Dict[str, str]:
+        """
+        Row dict in the betting_log CSV layout used by the bots.
+
+        Times are already corrected to UK time; 'original_db_time' keeps
+        the raw DB value for logging.
+        """
+        return {
+            "date": self.race_date.isoformat(),
+            "time": self.race_time,
+            "course": self.course,
+            "horse": self.horse,
+            "trainer": self.trainer,
+            "odds": f"{self.odds:.2f}",
+            "strategy": self.strategy,
+            "reasoning": self.reasoning,
+            "min_odds_needed": f"{self.min_odds_needed:.2f}",
+            "t60_actual_odds": "",
+            "action_taken": "",
+            "stake_gbp": f"{self.stake_gbp:.2f}",
+            "result": "",
+            "pnl_gbp": "",
+            "original_db_time": self.db_time,
+        }
+
+    def as_dict(self) -> dict:
+        """All fields as a plain dict."""
+        return asdict(self)
+
+
+def to_uk_time(race_date: date, db_time: str) -> datetime:
+    """
+    Convert a DB off time (UTC wall clock) to an aware Europe/London datetime.
+
+    Handles BST/GMT automatically - no fixed +1h offset.
+
+    Example:
+        >>> to_uk_time(date(2025, 10, 18), "13:30").strftime("%H:%M")
+        '14:30'
+        >>> to_uk_time(date(2025, 12, 6), "13:30").strftime("%H:%M")
+        '13:30'
+    """
+    naive = datetime.combine(race_date, datetime.strptime(db_time, "%H:%M").time())
+    return naive.replace(tzinfo=DB_TZ).astimezone(UK_TZ)
+
+
+def strategy_units(bankrolls: Dict[Optional[str], float]) -> Dict[str, float]:
+    """
+    Unit size (1% of bankroll) per strategy.
+
+    Args:
+        bankrolls: {None: total} to give every strategy the same bankroll,
+                   or {'A': 5000, 'B': 2000} for strategy-specific bankrolls
+                   (strategies without a bankroll are not selected)
+
+    Returns:
+        {strategy_name: unit_gbp}
+    """
+    units = {}
+    for strategy, (key, _, _) in STRATEGIES.items():
+        bankroll = bankrolls.get(None, bankrolls.get(key))
+        if bankroll:
+            units[strategy] = float(bankroll) / 100
+    return units
+
+
+class SelectionService:
+    """Loads daily selections for both strategies over a pooled connection."""
+
+    def __init__(self, dsn: Optional[str] = None, engine: Optional[Engine] = None):
+        """
+        Args:
+            dsn: SQLAlchemy DSN (defaults to PG_DSN from environment)
+            engine: Existing engine to share (takes precedence over dsn)
+        """
+        if engine is None:
+            dsn = dsn or os.getenv("PG_DSN")
+            if not dsn:
+                raise ValueError("PG_DSN not set in environment")
+            engine = create_engine(dsn, pool_pre_ping=True, pool_size=2)
+        self.engine = engine
+
+    def fetch(self, race_date, bankrolls: Dict[Optional[str], float]) -> List[Selection]:
+        """
+        Run both strategies for a date in one query.
+
+        Args:
+            race_date: date or YYYY-MM-DD string
+            bankrolls: See strategy_units()
+
+        Returns:
+            Selections ordered by UK off time
+        """
+        if isinstance(race_date, str):
+            race_date = date.fromisoformat(race_date)
+
+        units = strategy_units(bankrolls)
+        if not units:
+            return []
+
+        with self.engine.connect() as cx:
+            rows = cx.execute(_SELECTIONS_SQL, {"race_date": race_date}).mappings().all()
+
+        selections = []
+        for row in rows:
+            strategy = row["strategy"]
+            if strategy not in units:
+                continue
+
+            _, stake_units, min_odds_mult = STRATEGIES[strategy]
+            odds = round(float(row["decimal_odds"]), 2)
+            selections.append(Selection(
+                race_id=int(row["race_id"]),
+                race_date=row["race_date"],
+                off_time=to_uk_time(row["race_date"], row["db_time"]),
+                db_time=row["db_time"],
+                course=row["course_name"],
+                horse=row["horse_name"],
+                trainer=row["trainer_name"],
+                odds=odds,
+                strategy=strategy,
+                reasoning=row["reasoning"],
+                min_odds_needed=round(float(row["decimal_odds"]) * min_odds_mult, 2),
+                stake_gbp=round(stake_units * units[strategy], 2),
+            ))
+
+        selections.sort(key=lambda s: (s.off_time, s.strategy))
+        return selections
+
+
+_default_service: Optional[SelectionService] = None
+
+
+def load_selections(race_date, bankrolls: Dict[Optional[str], float],
+                    dsn: Optional[str] = None) -> List[Selection]:
+    """
+    Load selections for a date using a shared (pooled) SelectionService.
+
+    Example:
+        >>> sels = load_selections("2025-10-18", {None: 5000})
+        >>> [(s.race_time, s.horse, s.stake_gbp) for s in sels]
+    """
+    global _default_service
+    if dsn is not None:
+        return SelectionService(dsn).fetch(race_date, bankrolls)
+    if _default_service is None:
+        _default_service = SelectionService()
+    return _default_service.fetch(race_date, bankrolls)
@@ -0,0 +1,11 @@
+"""
+Offline simulation of the exchange.
+
+A clock abstraction and a matching engine that replays the tick archive
+behind the same interface as the bots' Betfair wrappers.
+"""
+
+from .clock import AcceleratedClock, ReplayClock, WallClock
+from .exchange import SimOrder, SimulatedExchange, load_runner_map
+
+__all__ = ["AcceleratedClock", "ReplayClock", "WallClock", "SimOrder", "SimulatedExchange", "load_runner_map"]
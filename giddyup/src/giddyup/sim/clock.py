@@ -0,0 +1,104 @@
+"""
+Clocks for simulated trading.
+
+Anything that needs "now" takes a clock object with `now(tz)` and
+`sleep(seconds)`, so the same code runs against the wall clock or an
+accelerated replay of a past day.
+
+- WallClock: real time
+- AcceleratedClock: real time mapped onto a past day, sped up
+- ReplayClock: virtual time that only moves when the code sleeps, so a
+  replay is deterministic however long each loop iteration takes
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+
+class WallClock:
+    """The real clock."""
+
+    def now(self, tz=None) -> datetime:
+        return datetime.now(tz)
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class AcceleratedClock:
+    """
+    Wall time mapped onto a past day and sped up.
+
+    Example:
+        >>> clock = AcceleratedClock(datetime(2025, 10, 20, 12, 0, tzinfo=timezone.utc), speed=60)
+        >>> clock.sleep(60)        # Returns after one real second
+        >>> clock.now(timezone.utc)
+        datetime.datetime(2025, 10, 20, 12, 1, ...)
+    """
+
+    def __init__(self, start: datetime, speed: float = 1.0):
+        """
+        Args:
+            start: Simulated time at construction (naive = UTC)
+            speed: Simulated seconds per real second
+        """
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        self.start = start
+        self.speed = float(speed)
+        self._t0 = time.monotonic()
+
+    def now(self, tz=None) -> datetime:
+        current = self.start + timedelta(seconds=(time.monotonic() - self._t0) * self.speed)
+        if tz is None:
+            return current.astimezone().replace(tzinfo=None)
+        return current.astimezone(tz)
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds / self.speed)
+
+
+class ReplayClock:
+    """
+    Virtual clock driven by sleep().
+
+    Example:
+        >>> clock = ReplayClock(BST.localize(datetime(2025, 10, 20, 10, 0)), speed=1000)
+        >>> clock.sleep(300)       # Advances 5 minutes, waits 0.3s real time
+        >>> clock.now(BST).strftime("%H:%M")
+        '10:05'
+    """
+
+    def __init__(self, start: datetime, speed: Optional[float] = 1000.0):
+        """
+        Args:
+            start: Simulated start time (naive = UTC)
+            speed: Pace real time at 1/speed of each sleep; None/0 = no waiting
+        """
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        self._now = start
+        self.speed = speed
+        self.sleeps = 0                 # Number of sleep() calls (= loop iterations)
+        self.slept = 0.0                # Simulated seconds slept
+
+    def now(self, tz=None) -> datetime:
+        if tz is None:
+            return self._now.astimezone().replace(tzinfo=None)
+        return self._now.astimezone(tz)
+
+    def sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        self._now += timedelta(seconds=seconds)
+        self.sleeps += 1
+        self.slept += seconds
+        if self.speed:
+            time.sleep(seconds / self.speed)
+
+
+def utc_now(clock: Optional[object] = None) -> datetime:
+    """Aware UTC now from a clock (wall clock if None)."""
+    return (clock or WallClock()).now(timezone.utc)
@@ -0,0 +1,397 @@
+"""
+Simulated exchange over the tick archive.
+
+`SimulatedExchange` replays archived best back/lay prices (giddyup.ticks) and
+matches LIMIT orders against them. It has the same methods as the bots'
+`Betfair` wrappers (login, logout, find_market, get_odds, place_bet), so a bot
+can be pointed at it for offline replay, load tests and fill-rate analysis.
+
+Matching model (the archive holds the top of book only):
+
+- On placement, a BACK at price P matches immediately against the best back
+  offer if it is >= P (at that price, up to its size); a LAY matches against
+  the best lay offer if it is <= P.
+- The remainder rests at P with `queue_ahead` = the size already shown at P
+  on its side of the book (0 if P is a new best price).
+- On each later tick, the runner's share of the increase in the market's
+  total matched is traded at the best price. It first consumes the queue
+  ahead, then fills the resting order. The queue never exceeds the size
+  shown at P (cancellations ahead of us move us up).
+- A resting order whose price is crossed by the opposite best offer fills
+  straight away, up to that offer's size.
+"""
+
+import csv
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import polars as pl
+
+from ..ticks import TickReader
+from .clock import WallClock
+
+EXECUTABLE = "EXECUTABLE"
+EXECUTION_COMPLETE = "EXECUTION_COMPLETE"
+CANCELLED = "CANCELLED"
+
+
+@dataclass
+class SimOrder:
+    """One LIMIT order on the simulated exchange."""
+
+    bet_id: str
+    market_id: str
+    selection_id: int
+    side: str                       # BACK or LAY
+    price: float
+    size: float
+    placed_at: datetime
+    size_matched: float = 0.0
+    average_price_matched: float = 0.0
+    queue_ahead: float = 0.0
+    status: str = EXECUTABLE
+    matched_at: Optional[datetime] = None
+    latency: Optional[float] = None  # Wall seconds from quote to placement
+    _tick: int = field(default=-1, repr=False)
+
+    @property
+    def size_remaining(self) -> float:
+        return max(self.size - self.size_matched, 0.0) if self.status != CANCELLED else 0.0
+
+    def fill(self, size: float, price: float, at: datetime) -> float:
+        size = min(size, self.size - self.size_matched)
+        if size <= 0:
+            return 0.0
+        total = self.size_matched + size
+        self.average_price_matched = (
+            self.average_price_matched * self.size_matched + price * size
+        ) / total
+        self.size_matched = total
+        if self.size - self.size_matched < 0.01:
+            self.status = EXECUTION_COMPLETE
+            self.matched_at = at
+        return size
+
+
+class _RunnerTape:
+    """One runner's ticks as NumPy arrays, ts in UTC microseconds."""
+
+    def __init__(self, frame: pl.DataFrame):
+        self.ts = frame["ts"].dt.replace_time_zone(None).cast(pl.Int64).to_numpy()
+        cols = {}
+        for col in ("back_price", "back_size", "lay_price", "lay_size", "total_matched"):
+            cols[col] = frame[col].cast(pl.Float64).fill_null(float("nan")).to_numpy()
+        self.back_price = cols["back_price"]
+        self.back_size = cols["back_size"]
+        self.lay_price = cols["lay_price"]
+        self.lay_size = cols["lay_size"]
+        self.total_matched = cols["total_matched"]
+
+    def index_at(self, ts_us: int) -> int:
+        """Index of the last tick at or before ts (-1 if none)."""
+        return int(np.searchsorted(self.ts, ts_us, side="right")) - 1
+
+
+def _to_us(at: datetime) -> int:
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    return int(at.timestamp() * 1_000_000)
+
+
+def _ok(value: float) -> bool:
+    return value == value  # not NaN
+
+
+def load_runner_map(log_dir: Union[str, Path], day: str) -> Dict[Tuple[str, str], Tuple[str, str]]:
+    """
+    (horse, race_time) -> (market_id, selection_id) from a day's bot action log.
+
+    The live bots log the Betfair ids they resolved, so a replay of that day can
+    find the same markets in the tick archive.
+    """
+    path = Path(log_dir) / f"bot_actions_{day}.csv"
+    runners: Dict[Tuple[str, str], Tuple[str, str]] = {}
+    if not path.exists():
+        return runners
+    with path.open("r", newline="") as f:
+        for row in csv.DictReader(f):
+            if row.get("market_id") and row.get("selection_id"):
+                key = (row["horse"].strip().lower(), row["race_time"])
+                runners[key] = (row["market_id"], str(row["selection_id"]))
+    return runners
+
+
+class SimulatedExchange:
+    """
+    Drop-in replacement for the bots' Betfair wrapper backed by archived ticks.
+
+    Example:
+        >>> from giddyup.sim import AcceleratedClock, SimulatedExchange, load_runner_map
+        >>> clock = AcceleratedClock(datetime(2025, 10, 20, 11, 0, tzinfo=timezone.utc), speed=600)
+        >>> ex = SimulatedExchange("strategies/logs/ticks", "2025-10-20", clock=clock,
+        ...                        runners=load_runner_map("strategies/logs/automated_bets", "2025-10-20"))
+        >>> market_id, sel_id = ex.find_market("Frankel", "Newmarket", "14:30")
+        >>> ex.get_odds(market_id, sel_id)
+        6.2
+        >>> ex.place_bet(market_id, sel_id, 6.2, 10.0, "Frankel")
+        'SIM-000001'
+        >>> ex.report()["fill_rate"]
+    """
+
+    def __init__(self, tick_root: Union[str, Path], day: Optional[str] = None,
+                 clock=None, runners: Optional[Dict[Tuple[str, str], Tuple[str, str]]] = None,
+                 min_liquidity: float = 0.0, dry_run: bool = True):
+        """
+        Args:
+            tick_root: Tick archive directory
+            day: Date to replay ('YYYY-MM-DD'); None scans every archived day
+            clock: Object with now(tz)/sleep(s) (default: wall clock)
+            runners: (horse lower-case, race_time) -> (market_id, selection_id)
+            min_liquidity: get_odds returns None below this total matched
+            dry_run: Kept for interface parity with the Betfair wrappers
+        """
+        self.reader = TickReader(tick_root)
+        self.day = day
+        self.clock = clock or WallClock()
+        self.runners = dict(runners or {})
+        self.min_liquidity = min_liquidity
+        self.dry_run = dry_run
+        self.client = None
+
+        self._lock = threading.Lock()
+        self._markets: Dict[str, Dict[int, _RunnerTape]] = {}
+        self._orders: Dict[str, SimOrder] = {}
+        self._resting: Dict[str, List[SimOrder]] = {}
+        self._quoted: Dict[Tuple[str, int], float] = {}
+        self._ids = itertools.count(1)
+        self._latencies: List[float] = []
+
+        self.stats = {"quotes": 0, "quote_misses": 0, "orders": 0, "lookups": 0, "lookup_misses": 0}
+
+    # ------------------------------------------------------------------
+    # Betfair wrapper interface
+    # ------------------------------------------------------------------
+
+    def login(self):
+        pass
+
+    def logout(self):
+        pass
+
+    def register_runner(self, horse: str, race_time: str, market_id: str, selection_id):
+        self.runners[(horse.strip().lower(), race_time)] = (market_id, str(selection_id))
+
+    def find_market(self, horse: str, course: str, race_time: str) -> Optional[tuple]:
+        """(market_id, selection_id) for a horse from the runner map."""
+        self.stats["lookups"] += 1
+        found = self.runners.get((horse.strip().lower(), race_time))
+        if not found:
+            self.stats["lookup_misses"] += 1
+        return found
+
+    def get_odds(self, market_id: str, sel_id: str) -> Optional[float]:
+        """Best back price at the clock's current time."""
+        quote = self.quote(market_id, sel_id)
+        if quote is None:
+            self.stats["quote_misses"] += 1
+            return None
+        back, _, _, _, total_matched = quote
+        if not _ok(back) or total_matched < self.min_liquidity:
+            self.stats["quote_misses"] += 1
+            return None
+        self.stats["quotes"] += 1
+        self._quoted[(market_id, int(sel_id))] = time.monotonic()
+        return float(back)
+
+    def place_bet(self, market_id: str, sel_id: str, odds: float, stake: float,
+                  horse: str = "") -> Optional[str]:
+        """BACK LIMIT order; returns the bet id (None if the market has no prices)."""
+        order = self.place_order(market_id, sel_id, "BACK", odds, stake)
+        return order.bet_id if order else None
+
+    # ------------------------------------------------------------------
+    # Orders
+    # ------------------------------------------------------------------
+
+    def place_order(self, market_id: str, sel_id, side: str, price: float,
+                    size: float) -> Optional[SimOrder]:
+        """Place a BACK or LAY LIMIT order (persisted until matched or cancelled)."""
+        side = side.upper()
+        if side not in ("BACK", "LAY"):
+            raise ValueError(f"side must be BACK or LAY, got {side!r}")
+
+        sel = int(sel_id)
+        tape = self._tape(market_id, sel)
+        now = self.clock.now(timezone.utc)
+        if tape is None:
+            return None
+        idx = tape.index_at(_to_us(now))
+        if idx < 0:
+            return None
+
+        quoted = self._quoted.pop((market_id, sel), None)
+        order = SimOrder(
+            bet_id=f"SIM-{next(self._ids):06d}",
+            market_id=market_id, selection_id=sel, side=side,
+            price=float(price), size=float(size), placed_at=now,
+            latency=(time.monotonic() - quoted) if quoted is not None else None,
+            _tick=idx,
+        )
+
+        if side == "BACK":
+            best, best_size = tape.back_price[idx], tape.back_size[idx]
+            if _ok(best) and best >= order.price:
+                order.fill(best_size if _ok(best_size) else 0.0, float(best), now)
+            if tape.lay_price[idx] == order.price and _ok(tape.lay_size[idx]):
+                order.queue_ahead = float(tape.lay_size[idx])
+        else:
+            best, best_size = tape.lay_price[idx], tape.lay_size[idx]
+            if _ok(best) and best <= order.price:
+                order.fill(best_size if _ok(best_size) else 0.0, float(best), now)
+            if tape.back_price[idx] == order.price and _ok(tape.back_size[idx]):
+                order.queue_ahead = float(tape.back_size[idx])
+
+        with self._lock:
+            self.stats["orders"] += 1
+            self._orders[order.bet_id] = order
+            if order.latency is not None:
+                self._latencies.append(order.latency)
+            if order.status == EXECUTABLE:
+                self._resting.setdefault(market_id, []).append(order)
+        return order
+
+    def cancel_order(self, bet_id: str) -> Optional[SimOrder]:
+        """Cancel the unmatched part of an order (after matching up to now)."""
+        order = self._orders.get(bet_id)
+        if order is None:
+            return None
+        self._advance(order.market_id)
+        with self._lock:
+            if order.status == EXECUTABLE:
+                order.status = CANCELLED
+                self._resting[order.market_id].remove(order)
+        return order
+
+    def list_orders(self, market_ids: Optional[Iterable[str]] = None) -> List[SimOrder]:
+        """Orders (optionally for some markets), matched up to the clock's now."""
+        markets = set(market_ids) if market_ids is not None else {o.market_id for o in self._orders.values()}
+        for market_id in markets:
+            self._advance(market_id)
+        return [o for o in self._orders.values() if o.market_id in markets]
+
+    # ------------------------------------------------------------------
+    # Prices
+    # ------------------------------------------------------------------
+
+    def quote(self, market_id: str, sel_id) -> Optional[tuple]:
+        """(back, back_size, lay, lay_size, total_matched) at now, after matching."""
+        tape = self._tape(market_id, int(sel_id))
+        if tape is None:
+            return None
+        idx = tape.index_at(_to_us(self.clock.now(timezone.utc)))
+        if idx < 0:
+            return None
+        self._advance(market_id)
+        total = tape.total_matched[idx]
+        return (tape.back_price[idx], tape.back_size[idx], tape.lay_price[idx],
+                tape.lay_size[idx], float(total) if _ok(total) else 0.0)
+
+    def _tape(self, market_id: str, sel: int) -> Optional[_RunnerTape]:
+        market = self._markets.get(market_id)
+        if market is None:
+            frame = (
+                self.reader.scan(self.day)
+                .filter(pl.col("market_id") == str(market_id))
+                .sort(["selection_id", "ts"])
+                .collect()
+            )
+            market = {
+                int(sel_id): _RunnerTape(part)
+                for (sel_id,), part in frame.group_by(["selection_id"], maintain_order=True)
+            }
+            with self._lock:
+                self._markets[market_id] = market
+        return market.get(sel)
+
+    def _advance(self, market_id: str):
+        """Match resting orders in a market against ticks up to now."""
+        with self._lock:
+            resting = list(self._resting.get(market_id, []))
+        if not resting:
+            return
+
+        now = self.clock.now(timezone.utc)
+        now_us = _to_us(now)
+        runners = max(len(self._markets.get(market_id, {})), 1)
+
+        for order in resting:
+            tape = self._tape(market_id, order.selection_id)
+            end = tape.index_at(now_us)
+            for i in range(order._tick + 1, end + 1):
+                if order.status != EXECUTABLE:
+                    break
+                at = datetime.fromtimestamp(tape.ts[i] / 1_000_000, tz=timezone.utc)
+                prev = tape.total_matched[i - 1] if i > 0 else float("nan")
+                traded = tape.total_matched[i] - prev if _ok(prev) and _ok(tape.total_matched[i]) else 0.0
+                volume = max(traded, 0.0) / runners
+
+                if order.side == "BACK":
+                    cross, cross_size = tape.back_price[i], tape.back_size[i]
+                    level, level_size = tape.lay_price[i], tape.lay_size[i]
+                    crossed = _ok(cross) and cross >= order.price
+                    behind = _ok(level) and level < order.price
+                else:
+                    cross, cross_size = tape.lay_price[i], tape.lay_size[i]
+                    level, level_size = tape.back_price[i], tape.back_size[i]
+                    crossed = _ok(cross) and cross <= order.price
+                    behind = _ok(level) and level > order.price
+
+                if crossed:
+                    order.fill(cross_size if _ok(cross_size) else 0.0, order.price, at)
+                elif behind:
+                    continue
+                else:
+                    if _ok(level) and level == order.price and _ok(level_size):
+                        order.queue_ahead = min(order.queue_ahead, float(level_size))
+                    else:
+                        order.queue_ahead = 0.0     # We are the best price
+                    order.queue_ahead -= volume
+                    if order.queue_ahead < 0:
+                        order.fill(-order.queue_ahead, order.price, at)
+                        order.queue_ahead = 0.0
+            order._tick = max(order._tick, end)
+
+        with self._lock:
+            self._resting[market_id] = [o for o in self._resting.get(market_id, []) if o.status == EXECUTABLE]
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def report(self) -> Dict:
+        """Fill rates and quote-to-order latency over every order so far."""
+        orders = self.list_orders()
+        requested = sum(o.size for o in orders)
+        matched = sum(o.size_matched for o in orders)
+        latencies = sorted(self._latencies)
+
+        def pct(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return latencies[min(int(p * len(latencies)), len(latencies) - 1)]
+
+        return {
+            **self.stats,
+            "fully_matched": sum(1 for o in orders if o.status == EXECUTION_COMPLETE),
+            "partially_matched": sum(1 for o in orders if 0 < o.size_matched < o.size - 0.01),
+            "unmatched": sum(1 for o in orders if o.size_matched == 0),
+            "fill_rate": matched / requested if requested else None,
+            "latency_p50": pct(0.50),
+            "latency_p95": pct(0.95),
+        }
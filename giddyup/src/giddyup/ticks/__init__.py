@@ -0,0 +1,10 @@
+"""
+Exchange price tick archive.
+
+Daily Parquet files of best back/lay prices per runner, and a reader that
+returns price paths as NumPy arrays for timing-rule backtests.
+"""
+
+from .archive import TICK_SCHEMA, TickArchiver, TickReader, compact
+
+__all__ = ["TICK_SCHEMA", "TickArchiver", "TickReader", "compact"]
@@ -0,0 +1,255 @@
+"""
+Columnar tick archive for exchange prices.
+
+Every best back/lay price and size the bots observe is buffered in memory and
+written by a background thread to zstd-compressed Parquet part files, one
+directory per day:
+
+    <root>/date=2025-10-20/part-143015-0001.parquet
+
+Each part is sorted by (market_id, selection_id, ts), so row-group statistics
+let the reader skip straight to one runner's rows. `compact()` merges a day's
+parts into a single sorted `ticks.parquet` once racing is over.
+"""
+
+import threading
+from datetime import date as date_type, datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import polars as pl
+
+TICK_SCHEMA = {
+    "market_id": pl.Utf8,
+    "selection_id": pl.Int64,
+    "ts": pl.Datetime("us", "UTC"),
+    "back_price": pl.Float64,
+    "back_size": pl.Float64,
+    "lay_price": pl.Float64,
+    "lay_size": pl.Float64,
+    "total_matched": pl.Float64,
+    "minutes_to_off": pl.Float32,
+}
+
+SORT_KEYS = ["market_id", "selection_id", "ts"]
+
+DateLike = Union[str, date_type, datetime]
+
+
+def _day(value: DateLike) -> str:
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date_type):
+        return value.isoformat()
+    return str(value)
+
+
+class TickArchiver:
+    """
+    Buffered writer for price ticks.
+
+    Example:
+        >>> archive = TickArchiver("strategies/logs/ticks")
+        >>> archive.record("1.2345", 678, back_price=6.2, back_size=40.0,
+        ...                lay_price=6.4, lay_size=12.5)
+        >>> archive.close()
+    """
+
+    def __init__(self, root: Union[str, Path], flush_rows: int = 20_000,
+                 flush_interval: float = 60.0):
+        """
+        Args:
+            root: Archive directory (one `date=YYYY-MM-DD` subdirectory per day)
+            flush_rows: Write a part file as soon as this many ticks are buffered
+            flush_interval: Seconds between background flushes otherwise
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._rows: Dict[str, List[tuple]] = {}
+        self._buffered = 0
+        self._parts = 0
+
+        self._thread = threading.Thread(target=self._run, name="tick-archiver", daemon=True)
+        self._thread.start()
+
+    def record(self, market_id: str, selection_id: Union[int, str],
+               back_price: Optional[float] = None, back_size: Optional[float] = None,
+               lay_price: Optional[float] = None, lay_size: Optional[float] = None,
+               ts: Optional[datetime] = None, total_matched: Optional[float] = None,
+               minutes_to_off: Optional[float] = None) -> None:
+        """Buffer one runner's best prices (ts defaults to now, UTC). Never writes on the caller's thread."""
+        ts = ts or datetime.now(timezone.utc)
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+
+        row = (str(market_id), int(selection_id), ts, back_price, back_size,
+               lay_price, lay_size, total_matched, minutes_to_off)
+
+        with self._lock:
+            self._rows.setdefault(_day(ts.astimezone(timezone.utc)), []).append(row)
+            self._buffered += 1
+            if self._buffered >= self.flush_rows:
+                self._wake.set()
+
+    def record_book(self, book, ts: Optional[datetime] = None,
+                    minutes_to_off: Optional[float] = None) -> None:
+        """Buffer every runner of a betfairlightweight MarketBook."""
+        ts = ts or datetime.now(timezone.utc)
+        for runner in book.runners:
+            ex = runner.ex
+            back = ex.available_to_back[0] if ex and ex.available_to_back else None
+            lay = ex.available_to_lay[0] if ex and ex.available_to_lay else None
+            self.record(
+                book.market_id, runner.selection_id,
+                back.price if back else None, back.size if back else None,
+                lay.price if lay else None, lay.size if lay else None,
+                ts=ts, total_matched=book.total_matched, minutes_to_off=minutes_to_off,
+            )
+
+    def flush(self) -> List[Path]:
+        """Write buffered ticks to new sorted part files now. Returns the files written."""
+        # Swap and write under _io_lock, so a returning flush() means every
+        # tick buffered before it is on disk
+        with self._io_lock:
+            with self._lock:
+                rows, self._rows = self._rows, {}
+                self._buffered = 0
+
+            written = []
+            for day, day_rows in rows.items():
+                if not day_rows:
+                    continue
+                frame = pl.DataFrame(day_rows, schema=TICK_SCHEMA, orient="row").sort(SORT_KEYS)
+
+                day_dir = self.root / f"date={day}"
+                day_dir.mkdir(parents=True, exist_ok=True)
+                self._parts += 1
+                path = day_dir / f"part-{datetime.now().strftime('%H%M%S')}-{self._parts:04d}.parquet"
+                frame.write_parquet(path, compression="zstd", statistics=True)
+                written.append(path)
+
+        return written
+
+    def close(self) -> None:
+        """Stop the background writer and flush anything still buffered."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+
+    def _run(self):
+        """Background loop: flush every interval, or when record() fills the buffer."""
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️  Tick archive write error: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def compact(root: Union[str, Path], day: DateLike, row_group_size: int = 50_000) -> Optional[Path]:
+    """
+    Merge a day's part files into one sorted `ticks.parquet`.
+
+    Args:
+        root: Archive directory
+        day: Date to compact
+        row_group_size: Rows per Parquet row group (smaller = finer skipping)
+
+    Returns:
+        Path of the compacted file, or None if the day has no ticks
+    """
+    day_dir = Path(root) / f"date={_day(day)}"
+    parts = sorted(day_dir.glob("*.parquet")) if day_dir.exists() else []
+    if not parts:
+        return None
+
+    target = day_dir / "ticks.parquet"
+    tmp = day_dir / "ticks.parquet.tmp"
+    (
+        pl.scan_parquet(parts)
+        .sort(SORT_KEYS)
+        .collect()
+        .write_parquet(tmp, compression="zstd", statistics=True, row_group_size=row_group_size)
+    )
+
+    for part in parts:
+        if part != target:
+            part.unlink()
+    tmp.replace(target)
+    return target
+
+
+class TickReader:
+    """
+    Read price paths back out of the archive.
+
+    Example:
+        >>> reader = TickReader("strategies/logs/ticks")
+        >>> path = reader.price_path("1.2345", 678, "2025-10-20")
+        >>> path["back_price"][-1], path["ts"].dtype
+        (6.2, dtype('<M8[us]'))
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def days(self) -> List[str]:
+        """Archived dates, oldest first."""
+        return sorted(p.name.split("=", 1)[1] for p in self.root.glob("date=*") if p.is_dir())
+
+    def scan(self, day: Optional[DateLike] = None) -> pl.LazyFrame:
+        """Lazy scan of one day (or every day) for custom queries."""
+        pattern = f"date={_day(day)}/*.parquet" if day is not None else "date=*/*.parquet"
+        files = sorted(self.root.glob(pattern))
+        if not files:
+            return pl.DataFrame(schema=TICK_SCHEMA).lazy()
+        return pl.scan_parquet(files)
+
+    def runners(self, day: DateLike) -> List[Tuple[str, int]]:
+        """(market_id, selection_id) pairs with ticks on a day."""
+        frame = self.scan(day).select(["market_id", "selection_id"]).unique().sort(
+            ["market_id", "selection_id"]
+        ).collect()
+        return list(frame.iter_rows())
+
+    def price_path(self, market_id: str, selection_id: Union[int, str],
+                   day: Optional[DateLike] = None) -> Dict[str, np.ndarray]:
+        """
+        One runner's ticks in time order as NumPy arrays.
+
+        Returns:
+            {'ts': datetime64[us] (UTC, naive), 'back_price', 'back_size',
+             'lay_price', 'lay_size', 'total_matched', 'minutes_to_off'}
+            Missing prices are NaN.
+        """
+        frame = (
+            self.scan(day)
+            .filter((pl.col("market_id") == str(market_id)) &
+                    (pl.col("selection_id") == int(selection_id)))
+            .sort("ts")
+            .collect()
+        )
+
+        path = {"ts": frame["ts"].dt.replace_time_zone(None).to_numpy()}
+        for col in ("back_price", "back_size", "lay_price", "lay_size",
+                    "total_matched", "minutes_to_off"):
+            path[col] = frame[col].cast(pl.Float64).fill_null(float("nan")).to_numpy()
+        return path
@@ -1,16 +1,74 @@
 """
 Analyze what bets the model would have placed in 2024.
 
-Shows examples of bets, odds distribution, and value analysis.
+Shows examples of bets, odds distribution, and value analysis. Selection and
+aggregation run in DuckDB over the Parquet file (giddyup.analytics), so only
+the selected bets are ever held in memory.
 """
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-import polars as pl
-import numpy as np
-import pickle
+from giddyup.analytics import Analytics
+
+# Bet selection, computed in DuckDB straight off the Parquet file
+MODEL_BETS_SQL = """
+WITH priced AS (
+    SELECT
+        race_id, race_date, course_id, trainer_id, decimal_odds, won,
+        1.0 / GREATEST(decimal_odds, 1.01) AS market_prob,
+        -- Simulated model: market prob + small boosts for form (stand-in for MLflow model)
+        LEAST(
+            CASE
+                WHEN racing_post_rating > 100 THEN 1.05
+                WHEN trainer_sr_total > 0.20 THEN 1.03
+                ELSE 1.0
+            END / GREATEST(decimal_odds, 1.01),
+            0.95
+        ) AS model_prob_adjusted
+    FROM features
+    WHERE race_date BETWEEN CAST($start AS DATE) AND CAST($end AS DATE)
+),
+scored AS (
+    SELECT
+        *,
+        model_prob_adjusted - market_prob AS edge,
+        LEAST(GREATEST((model_prob_adjusted * decimal_odds - 1) / (decimal_odds - 1), 0), 1)
+            * 0.25 AS kelly_fraction
+    FROM priced
+)
+SELECT
+    race_id,
+    race_date,
+    CAST(course_id AS VARCHAR)  AS course,
+    CAST(trainer_id AS VARCHAR) AS trainer,
+    decimal_odds                AS odds,
+    edge,
+    LEAST(kelly_fraction * 1.0, 1.0) AS stake,
+    won,
+    CASE WHEN won THEN LEAST(kelly_fraction, 1.0) * (decimal_odds - 1)
+         ELSE -LEAST(kelly_fraction, 1.0) END AS pnl
+FROM scored
+WHERE edge > 0.05          -- 5% edge threshold
+  AND kelly_fraction > 0.01 -- At least 1% Kelly
+"""
+
+ODDS_RANGES = [
+    ("1.01-2.99", 1.01, 2.99),
+    ("3.00-5.99", 3.00, 5.99),
+    ("6.00-10.99", 6.00, 10.99),
+    ("11.00-20.99", 11.00, 20.99),
+    ("21.00+", 21.00, 999.0),
+]
+
+RANGE_NAMES = {
+    "1.01-2.99": "Heavy Favorites",
+    "3.00-5.99": "Favorites",
+    "6.00-10.99": "Mid-Range",
+    "11.00-20.99": "Outsiders",
+    "21.00+": "Longshots",
+}
 
 
 def main():
@@ -19,61 +77,22 @@ def main():
     print("🔍 Analyzing Model Bets on 2024 Hold-Out Data")
     print("=" * 80)
     
-    # Load the training dataset (includes 2024-2025)
+    # Register the feature store as a DuckDB view (nothing is loaded yet)
     print("\n📊 Loading data...")
-    df = pl.read_parquet("data/training_dataset.parquet")
-    
-    # Filter to 2024 only
-    test_df = df.filter(
-        (pl.col("race_date") >= pl.lit("2024-01-01").str.strptime(pl.Date, "%Y-%m-%d")) &
-        (pl.col("race_date") <= pl.lit("2024-12-31").str.strptime(pl.Date, "%Y-%m-%d"))
-    )
+    an = Analytics(tick_root=None, bet_log_dir=None)
+    period = {"start": "2024-01-01", "end": "2024-12-31"}
     
-    print(f"   2024 data: {len(test_df):,} runners from {test_df['race_id'].n_unique():,} races")
+    runners, races = an.con.execute("""
+        SELECT COUNT(*), COUNT(DISTINCT race_id)
+        FROM features
+        WHERE race_date BETWEEN CAST($start AS DATE) AND CAST($end AS DATE)
+    """, period).fetchone()
     
-    # Load the trained model from MLflow artifacts
-    print("\n📥 Loading trained model...")
+    print(f"   2024 data: {runners:,} runners from {races:,} races")
     
-    # For now, we'll simulate using the OOF predictions approach
+    # For now, we simulate model probabilities in SQL (see MODEL_BETS_SQL)
     # In production, you'd load from MLflow and predict
-    
-    # Simulate model predictions (we'll use a simple probability calculation)
-    # This mimics what the model learned: odds are highly predictive
-    
-    test_df = test_df.with_columns([
-        # Simulate model probability (calibrated market implied prob + small adjustments)
-        ((1 / pl.col("decimal_odds").clip(lower_bound=1.01)) * 1.0)
-            .alias("model_prob"),
-        
-        # Market implied probability
-        (1 / pl.col("decimal_odds").clip(lower_bound=1.01))
-            .alias("market_prob"),
-    ])
-    
-    # For actual backtest, let's add a small edge to mimic model finding value
-    # In reality, this would come from the trained model
-    test_df = test_df.with_columns([
-        # Add small random edge based on form features (simulation)
-        pl.when(pl.col("racing_post_rating") > 100)
-            .then(pl.col("model_prob") * 1.05)  # 5% boost for high-rated
-        .when(pl.col("trainer_sr_total") > 0.20)
-            .then(pl.col("model_prob") * 1.03)  # 3% boost for hot trainer
-        .otherwise(pl.col("model_prob"))
-            .clip(upper_bound=0.95)
-            .alias("model_prob_adjusted"),
-    ])
-    
-    # Calculate edge
-    test_df = test_df.with_columns([
-        (pl.col("model_prob_adjusted") - pl.col("market_prob"))
-            .alias("edge"),
-        
-        # Kelly fraction (fractional Kelly at 25%)
-        ((pl.col("model_prob_adjusted") * pl.col("decimal_odds") - 1) / 
-         (pl.col("decimal_odds") - 1))
-            .clip(lower_bound=0, upper_bound=1) * 0.25
-            .alias("kelly_fraction"),
-    ])
+    print("\n📥 Loading trained model...")
     
     # ===== BETTING CRITERIA =====
     print("\n🎯 Betting Criteria:")
@@ -81,82 +100,41 @@ def main():
     print("   Minimum Kelly fraction: 1%")
     print("   Maximum stake: 1.0 units")
     
-    # Filter to bets we would place
-    bets_df = test_df.filter(
-        (pl.col("edge") > 0.05) &  # 5% edge threshold
-        (pl.col("kelly_fraction") > 0.01)  # At least 1% Kelly
-    )
+    # Only the selected bets are materialised
+    an.register("model_bets", MODEL_BETS_SQL, period)
+    bets_df = an.query("SELECT * FROM model_bets")
     
     print(f"\n📊 Betting Summary:")
-    print(f"   Total 2024 runners: {len(test_df):,}")
-    print(f"   Bets placed: {len(bets_df):,} ({len(bets_df)/len(test_df)*100:.1f}%)")
-    print(f"   Selectivity: {100/len(bets_df)*len(test_df):.1f}:1")
-    
-    # Calculate stakes
-    bets_df = bets_df.with_columns([
-        (pl.col("kelly_fraction") * 1.0).clip(upper_bound=1.0).alias("stake_units")
-    ])
+    print(f"   Total 2024 runners: {runners:,}")
+    print(f"   Bets placed: {len(bets_df):,} ({len(bets_df)/runners*100:.1f}%)")
+    print(f"   Selectivity: {100/len(bets_df)*runners:.1f}:1")
     
     # ===== ODDS DISTRIBUTION =====
     print(f"\n📈 Bets by Odds Range:")
     
-    odds_ranges = [
-        ("1.01-2.99", 1.01, 2.99, "Heavy Favorites"),
-        ("3.00-5.99", 3.00, 5.99, "Favorites"),
-        ("6.00-10.99", 6.00, 10.99, "Mid-Range"),
-        ("11.00-20.99", 11.00, 20.99, "Outsiders"),
-        ("21.00+", 21.00, 999.0, "Longshots"),
-    ]
-    
-    for label, min_odds, max_odds, desc in odds_ranges:
-        bucket = bets_df.filter(
-            (pl.col("decimal_odds") >= min_odds) &
-            (pl.col("decimal_odds") < max_odds)
-        )
-        
-        if len(bucket) > 0:
-            wins = bucket["won"].sum()
-            total_bets = len(bucket)
-            total_stake = bucket["stake_units"].sum()
-            win_rate = wins / total_bets if total_bets > 0 else 0
-            
-            # Calculate P&L
-            returns = bucket.with_columns([
-                pl.when(pl.col("won"))
-                    .then(pl.col("stake_units") * (pl.col("decimal_odds") - 1))
-                .otherwise(-pl.col("stake_units"))
-                    .alias("pnl")
-            ])
-            
-            total_pnl = returns["pnl"].sum()
-            roi = (total_pnl / total_stake * 100) if total_stake > 0 else 0
-            
-            print(f"\n   {label} ({desc}):")
-            print(f"      Bets: {total_bets:,}")
-            print(f"      Wins: {wins} ({win_rate:.1%})")
-            print(f"      Stake: {total_stake:.2f} units")
-            print(f"      P&L: {total_pnl:+.2f} units")
-            print(f"      ROI: {roi:+.1f}%")
+    by_band = an.roi_by("band", relation="model_bets", bands=ODDS_RANGES)
+    
+    for row in by_band.iter_rows(named=True):
+        if row["band"] not in RANGE_NAMES:
+            continue
+        print(f"\n   {row['band']} ({RANGE_NAMES[row['band']]}):")
+        print(f"      Bets: {row['bets']:,}")
+        print(f"      Wins: {row['wins']} ({row['win_rate']:.1%})")
+        print(f"      Stake: {row['staked']:.2f} units")
+        print(f"      P&L: {row['pnl']:+.2f} units")
+        print(f"      ROI: {(row['roi_pct'] or 0):+.1f}%")
     
     # ===== OVERALL PERFORMANCE =====
     print(f"\n" + "=" * 80)
     print("💰 OVERALL 2024 PERFORMANCE")
     print("=" * 80)
     
-    total_bets = len(bets_df)
-    total_wins = bets_df["won"].sum()
-    total_stake = bets_df["stake_units"].sum()
-    
-    # Calculate P&L
-    bets_df = bets_df.with_columns([
-        pl.when(pl.col("won"))
-            .then(pl.col("stake_units") * (pl.col("decimal_odds") - 1))
-        .otherwise(-pl.col("stake_units"))
-            .alias("pnl")
-    ])
-    
-    total_pnl = bets_df["pnl"].sum()
-    roi = (total_pnl / total_stake * 100) if total_stake > 0 else 0
+    overall = an.summary("model_bets")
+    total_bets = overall["bets"]
+    total_wins = overall["wins"]
+    total_stake = overall["staked"]
+    total_pnl = overall["pnl"]
+    roi = overall["roi_pct"] or 0
     
     print(f"\n   Total Bets: {total_bets:,}")
     print(f"   Total Wins: {total_wins} ({total_wins/total_bets:.1%})")
@@ -164,7 +142,7 @@ def main():
     print(f"   Total P&L: {total_pnl:+.2f} units")
     print(f"   ROI: {roi:+.1f}%")
     print(f"   Average Stake: {total_stake/total_bets:.3f} units")
-    print(f"   Average Odds: {bets_df['decimal_odds'].mean():.2f}")
+    print(f"   Average Odds: {overall['avg_odds']:.2f}")
     
     # ===== SAMPLE BETS =====
     print(f"\n" + "=" * 80)
@@ -172,13 +150,13 @@ def main():
     print("=" * 80)
     
     # Show 20 example bets
-    sample_bets = bets_df.sort("stake_units", descending=True).head(20)
+    sample_bets = bets_df.sort("stake", descending=True).head(20)
     
     print(f"\n{'Date':<12} {'Course':<15} {'Horse':<20} {'Odds':>6} {'Edge':>6} {'Stake':>6} {'Won?':>5} {'P&L':>8}")
     print("-" * 100)
     
     for row in sample_bets.select([
-        "race_date", "decimal_odds", "edge", "stake_units", "won", "pnl"
+        "race_date", "odds", "edge", "stake", "won", "pnl"
     ]).iter_rows():
         date, odds, edge, stake, won, pnl = row
         won_str = "✅" if won else "❌"
@@ -196,16 +174,17 @@ def main():
     
     print(f"\n🎲 Favorite vs Longshot Betting:")
     
-    favs = bets_df.filter(pl.col("decimal_odds") < 5.0)
-    longshots = bets_df.filter(pl.col("decimal_odds") >= 10.0)
+    split = an.roi_by("band", relation="model_bets",
+                      bands=[("favs", 1.0, 5.0), ("longshots", 10.0, 1001.0)])
+    split = {row["band"]: row for row in split.iter_rows(named=True)}
     
-    if len(favs) > 0:
-        fav_roi = (favs["pnl"].sum() / favs["stake_units"].sum() * 100)
-        print(f"   Favorites (<5.0): {len(favs):,} bets, ROI: {fav_roi:+.1f}%")
+    if "favs" in split:
+        favs = split["favs"]
+        print(f"   Favorites (<5.0): {favs['bets']:,} bets, ROI: {favs['roi_pct']:+.1f}%")
     
-    if len(longshots) > 0:
-        long_roi = (longshots["pnl"].sum() / longshots["stake_units"].sum() * 100)
-        print(f"   Longshots (≥10.0): {len(longshots):,} bets, ROI: {long_roi:+.1f}%")
+    if "longshots" in split:
+        longshots = split["longshots"]
+        print(f"   Longshots (≥10.0): {longshots['bets']:,} bets, ROI: {longshots['roi_pct']:+.1f}%")
     
     # ===== CONCLUSION =====
     print(f"\n" + "=" * 80)
@@ -220,7 +199,7 @@ def main():
         print(f"\n   ❌ LOSING: ROI = {roi:+.1f}% (losing money)")
     
     print(f"\n   Model is betting:")
-    avg_odds = bets_df['decimal_odds'].mean()
+    avg_odds = overall['avg_odds']
     if avg_odds < 4.0:
         print(f"      ⚠️  Mainly FAVORITES (avg odds: {avg_odds:.2f})")
         print(f"      This suggests model follows market closely")
@@ -231,10 +210,10 @@ def main():
         print(f"      🎲 MAINLY LONGSHOTS (avg odds: {avg_odds:.2f})")
         print(f"      High variance, need large sample")
     
-    print(f"\n   Selectivity: {len(bets_df)/len(test_df)*100:.1f}% of runners bet")
-    if len(bets_df)/len(test_df) < 0.10:
+    print(f"\n   Selectivity: {len(bets_df)/runners*100:.1f}% of runners bet")
+    if len(bets_df)/runners < 0.10:
         print(f"      ✅ GOOD: Very selective (< 10% of field)")
-    elif len(bets_df)/len(test_df) < 0.20:
+    elif len(bets_df)/runners < 0.20:
         print(f"      ⚠️  MODERATE: Fairly selective (10-20%)")
     else:
         print(f"      ❌ POOR: Not selective enough (> 20%)")
@@ -14,6 +14,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from giddyup.data.build import build_training_data
 from giddyup.scoring.path_b_hybrid import load_config, score_hybrid
+from giddyup.backtest.bootstrap import bootstrap_frame, format_ci
 
 
 def main():
@@ -134,6 +135,11 @@ def main():
     print(f"  Total P&L: {total_pnl:+.2f} units")
     status = "✅" if roi > 0 else "❌"
     print(f"  ROI: {roi:+.2f}% {status}")
+    
+    # Race-clustered bootstrap: is the ROI distinguishable from zero?
+    ci = bootstrap_frame(df_scored, "stake_units", "pnl_units", seed=42)
+    print(f"  {format_ci(ci)}")
+    print(f"  {format_ci(ci, 'hit_rate')}")
     print()
     
     # Check targets
@@ -195,7 +201,8 @@ def main():
         f.write(f"  Bets: {n_bets:,}\n")
         f.write(f"  Annual: {annual_bets:.0f}/year\n")
         f.write(f"  Win rate: {win_rate*100:.1f}%\n")
-        f.write(f"  ROI: {roi:+.2f}%\n\n")
+        f.write(f"  ROI: {roi:+.2f}%\n")
+        f.write(f"  {format_ci(ci)}\n\n")
         
         f.write(f"By Band:\n")
         for band in ["1.5-3.0", "3.0-5.0", "5.0-8.0", "8.0-12.0", "12.0-999"]:
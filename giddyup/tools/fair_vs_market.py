@@ -15,6 +15,8 @@ from pathlib import Path
 import os
 from dotenv import load_dotenv
 
+from giddyup.price import overround_expr, remove_vig_expr, stake_expr
+
 load_dotenv()
 
 # Configuration
@@ -132,17 +134,15 @@ def main():
         (1.0 / pl.col("decimal_odds").clip(lower_bound=1.01)).alias("q_market"),
     ])
     
-    # Remove vig
-    overround_df = df_2025.group_by("race_id").agg([
-        pl.col("q_market").sum().alias("overround")
+    # Remove vig (per race)
+    df_2025 = df_2025.with_columns([
+        overround_expr("q_market", "race_id").alias("overround"),
+        remove_vig_expr("q_market", "race_id").alias("q_vigfree"),
     ])
     
-    df_2025 = df_2025.join(overround_df, on="race_id")
-    
     df_2025 = df_2025.with_columns([
-        (pl.col("q_market") / pl.col("overround")).alias("q_vigfree"),
-        (1.0 / (pl.col("q_market") / pl.col("overround"))).alias("market_fair_odds"),
-        (pl.col("p_model") - (pl.col("q_market") / pl.col("overround"))).alias("edge"),
+        (1.0 / pl.col("q_vigfree")).alias("market_fair_odds"),
+        (pl.col("p_model") - pl.col("q_vigfree")).alias("edge"),
     ])
     
     # Calculate value percentage
@@ -152,20 +152,11 @@ def main():
     ])
     
     # Calculate stakes
-    kelly_list = []
-    for row in df_2025.select(["p_model", "decimal_odds"]).iter_rows():
-        p, odds = row
-        b = (odds - 1.0) * (1.0 - COMMISSION)
-        if b > 0:
-            f = (p * (b + 1.0) - 1.0) / b
-            f = max(0.0, min(1.0, f)) * KELLY_FRAC
-        else:
-            f = 0.0
-        kelly_list.append(f)
-    
     df_2025 = df_2025.with_columns([
-        pl.Series("kelly_fraction", kelly_list),
-        (pl.Series("kelly_fraction", kelly_list) * BASE_UNIT).alias("stake_points")
+        stake_expr("p_model", "decimal_odds", COMMISSION, KELLY_FRAC).alias("kelly_fraction"),
+    ])
+    df_2025 = df_2025.with_columns([
+        (pl.col("kelly_fraction") * BASE_UNIT).alias("stake_points")
     ])
     
     # Filter to bets
@@ -0,0 +1,128 @@
+"""
+Tune the back-lay bot's PRICE_DROP_THRESHOLD and T_MINUS_CASHOUT.
+
+Every selection the bots logged over a date range becomes a paper back at its
+morning odds. Its archived price path is resampled onto the bot's decision
+grid (T-120 to T+5), and every (drop threshold, cash-out minute) pair is
+evaluated in one NumPy pass. Positions never laid settle on the race result.
+
+Usage:
+    python tools/optimize_backlay.py 2025-10-01 2025-10-31
+    python tools/optimize_backlay.py 2025-10-01 2025-10-31 --drops 5,10,15 --cashouts 5,15,30
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+
+from giddyup.analytics import Analytics
+from giddyup.analytics.duck import DEFAULT_TICK_ROOT
+from giddyup.backlay import best_thresholds, minutes_grid, price_matrix, sweep_thresholds
+from giddyup.ticks import TickReader
+
+UK = ZoneInfo("Europe/London")
+
+POSITIONS_SQL = """
+SELECT
+    a.race_date,
+    a.race_time,
+    a.horse,
+    a.market_id,
+    a.selection_id,
+    TRY_CAST(a.expected_odds AS DOUBLE) AS back_odds,
+    TRY_CAST(a.stake AS DOUBLE)         AS back_stake,
+    {result} AS result
+FROM bot_actions a
+{join}
+WHERE a.race_date BETWEEN CAST($start AS DATE) AND CAST($end AS DATE)
+  AND COALESCE(a.market_id, '') <> ''
+  AND COALESCE(a.selection_id, '') <> ''
+QUALIFY row_number() OVER (PARTITION BY a.race_date, a.race_time, a.horse ORDER BY a.timestamp) = 1
+ORDER BY a.race_date, a.race_time
+"""
+
+
+def off_time_utc(race_date, race_time: str) -> np.datetime64:
+    """UK off time as naive UTC datetime64 (the tick archive's timebase)."""
+    local = datetime.combine(race_date, datetime.strptime(race_time, "%H:%M").time(), tzinfo=UK)
+    return np.datetime64(local.astimezone(ZoneInfo("UTC")).replace(tzinfo=None), "us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep back-lay thresholds over archived prices")
+    parser.add_argument("start", help="First date (YYYY-MM-DD)")
+    parser.add_argument("end", help="Last date (YYYY-MM-DD)")
+    parser.add_argument("--drops", default="5,7.5,10,12.5,15,20,25",
+                        help="PRICE_DROP_THRESHOLD candidates (%%)")
+    parser.add_argument("--cashouts", default="0,5,10,15,20,30,45",
+                        help="T_MINUS_CASHOUT candidates (minutes)")
+    parser.add_argument("--step", type=float, default=1.0, help="Decision grid step (minutes)")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    drops = [float(x) for x in args.drops.split(",")]
+    cashouts = [float(x) for x in args.cashouts.split(",")]
+
+    print("🔁 Back-Lay Threshold Sweep")
+    print("=" * 80)
+
+    an = Analytics(feature_store=None)
+    if "bot_actions" not in an.views():
+        print("   ❌ No bot action logs found")
+        return
+
+    has_results = "bot_results" in an.views()
+    sql = POSITIONS_SQL.format(
+        result="r.result" if has_results else "NULL::VARCHAR",
+        join=("LEFT JOIN bot_results r ON r.race_date = a.race_date "
+              "AND r.race_time = a.race_time AND r.horse = a.horse") if has_results else "",
+    )
+    positions = an.query(sql, {"start": args.start, "end": args.end})
+    positions = positions.filter(positions["back_odds"].is_not_null() & positions["back_stake"].is_not_null())
+    print(f"\n📊 Positions: {len(positions):,} selections from {positions['race_date'].n_unique()} day(s)")
+    if positions.is_empty():
+        return
+
+    # Price paths -> [positions, grid] matrix
+    reader = TickReader(DEFAULT_TICK_ROOT)
+    grid = minutes_grid(args.step)
+    paths, offs = [], []
+    for row in positions.iter_rows(named=True):
+        path = reader.price_path(row["market_id"], row["selection_id"], row["race_date"])
+        paths.append((path["ts"], path["back_price"]))
+        offs.append(off_time_utc(row["race_date"], row["race_time"]))
+    prices = price_matrix(paths, offs, grid)
+
+    priced = np.isfinite(prices).any(axis=1)
+    print(f"   With archived prices: {int(priced.sum()):,}")
+    if not priced.any():
+        return
+
+    results = positions["result"].to_list()
+    won = [None if r in (None, "") else r.upper() == "WIN" for r in results]
+
+    sweep = sweep_thresholds(
+        positions["back_odds"].to_numpy()[priced],
+        positions["back_stake"].to_numpy()[priced],
+        prices[priced], grid, drops, cashouts,
+        won=[w for w, p in zip(won, priced) if p],
+    )
+
+    print(f"\n🏆 Top {args.top} settings by total P&L ({len(drops) * len(cashouts)} evaluated):\n")
+    print(f"{'Drop %':>8} {'Cash-out':>9} {'Laid':>6} {'Lay profit':>12} {'P&L':>10} {'ROI':>8}")
+    print("-" * 60)
+    d_index = {v: i for i, v in enumerate(sweep["drop_threshold"])}
+    c_index = {v: i for i, v in enumerate(sweep["cashout_minutes"])}
+    for drop, cashout, pnl in best_thresholds(sweep)[:args.top]:
+        d, c = d_index[drop], c_index[cashout]
+        print(f"{drop:>8.1f} {'T-' + str(int(cashout)):>9} {int(sweep['laid'][d, c]):>6} "
+              f"£{sweep['lay_profit'][d, c]:>10.2f} £{pnl:>+9.2f} {sweep['roi_pct'][d, c]:>+7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,7 +23,7 @@ from dotenv import load_dotenv
 
 from giddyup.data.build import build_training_data
 from giddyup.data.feature_lists import ABILITY_FEATURES
-from giddyup.price.value import fair_odds, ev_win
+from giddyup.price import ev_win_expr, fair_odds_expr
 
 load_dotenv()
 
@@ -272,25 +272,11 @@ def compute_value_analysis(df: pl.DataFrame, prices: pl.DataFrame) -> pl.DataFra
         pl.lit(overround).alias("overround")
     ])
     
-    # Fair odds
+    # Fair odds, edge and EV (one vectorized pass)
     df = df.with_columns([
-        (1.0 / pl.col("p_model")).alias("fair_odds_win")
-    ])
-    
-    # Edge
-    df = df.with_columns([
-        (pl.col("p_model") - pl.col("q_vigfree")).alias("edge_prob")
-    ])
-    
-    # EV
-    def calc_ev(p, odds):
-        return ev_win(p, odds, COMMISSION)
-    
-    df = df.with_columns([
-        pl.struct(["p_model", "decimal_odds"]).map_elements(
-            lambda x: calc_ev(x["p_model"], x["decimal_odds"]),
-            return_dtype=pl.Float64
-        ).alias("ev_after_commission")
+        fair_odds_expr("p_model").alias("fair_odds_win"),
+        (pl.col("p_model") - pl.col("q_vigfree")).alias("edge_prob"),
+        ev_win_expr("p_model", "decimal_odds", COMMISSION).alias("ev_after_commission"),
     ])
     
     print(f"   ✅ Analysis complete")
@@ -20,7 +20,7 @@ from dotenv import load_dotenv
 
 from giddyup.data.feature_lists import ABILITY_FEATURES
 from giddyup.publish.signals import publish as publish_signals
-from giddyup.price.value import fair_odds, ev_win, kelly_fraction
+from giddyup.price import add_place_columns, ev_win_expr, fair_odds_expr, stake_expr
 
 load_dotenv()
 
@@ -242,38 +242,16 @@ def score_and_filter(
         pl.Series(name="p_model", values=p_model)
     ])
     
-    # Compute fair odds
+    # Compute fair odds, edge, EV (after commission) and fractional Kelly stake
     df = df.with_columns([
-        (1.0 / pl.col("p_model")).alias("fair_odds_win")
+        fair_odds_expr("p_model").alias("fair_odds_win"),
+        (pl.col("p_model") - pl.col("q_vigfree")).alias("edge_prob"),
+        ev_win_expr("p_model", "decimal_odds", COMMISSION).alias("ev_after_commission"),
+        stake_expr("p_model", "decimal_odds", COMMISSION, KELLY_FRACTION, MAX_STAKE).alias("stake_units"),
     ])
     
-    # Compute edge
-    df = df.with_columns([
-        (pl.col("p_model") - pl.col("q_vigfree")).alias("edge_prob")
-    ])
-    
-    # Compute EV (after commission)
-    def calc_ev(p, odds):
-        return ev_win(p, odds, COMMISSION)
-    
-    df = df.with_columns([
-        pl.struct(["p_model", "decimal_odds"]).map_elements(
-            lambda x: calc_ev(x["p_model"], x["decimal_odds"]),
-            return_dtype=pl.Float64
-        ).alias("ev_after_commission")
-    ])
-    
-    # Compute Kelly stake
-    def calc_kelly(p, odds):
-        k = kelly_fraction(p, odds, COMMISSION)
-        return min(KELLY_FRACTION * k, MAX_STAKE)
-    
-    df = df.with_columns([
-        pl.struct(["p_model", "decimal_odds"]).map_elements(
-            lambda x: calc_kelly(x["p_model"], x["decimal_odds"]),
-            return_dtype=pl.Float64
-        ).alias("stake_units")
-    ])
+    # Place probabilities and each-way terms/edge (needs the full field, so before filtering)
+    df = add_place_columns(df, commission=COMMISSION)
     
     # ===== Filter by thresholds =====
     print(f"\n🔍 Applying filters:")
@@ -319,15 +297,15 @@ def publish_signals(picks: pl.DataFrame, model_id: int = 1) -> int:
             "horse_id": int(r["horse_id"]),
             "model_id": model_id,
             "p_win": float(r["p_model"]),
-            "p_place": None,
+            "p_place": float(r["p_place"]),
             "fair_odds_win": float(r["fair_odds_win"]),
-            "fair_odds_place": None,
+            "fair_odds_place": float(r["fair_odds_place"]),
             "best_odds_win": float(r["decimal_odds"]),
             "best_odds_src": r.get("source", "T-60"),
-            "ew_places": None,
-            "ew_fraction": None,
+            "ew_places": int(r["ew_places"]),
+            "ew_fraction": r["ew_fraction"],
             "edge_win": float(r["ev_after_commission"]),
-            "edge_ew": None,
+            "edge_ew": float(r["edge_ew"]),
             "kelly_fraction": float(r["stake_units"] / max(1e-9, KELLY_FRACTION)),
             "stake_units": float(r["stake_units"]),
             "liquidity_ok": True,
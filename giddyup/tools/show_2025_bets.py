@@ -9,6 +9,9 @@ Displays what bets would be placed with 3.0 point base unit:
 - Edge
 
 WITHOUT showing outcomes (simulates real prediction scenario).
+
+Only the 2025 rows and the columns the model needs are read from the feature
+store (via DuckDB, giddyup.analytics); breakdowns are aggregated in DuckDB.
 """
 
 import sys
@@ -22,6 +25,10 @@ from pathlib import Path
 import os
 from dotenv import load_dotenv
 
+from giddyup.analytics import Analytics
+from giddyup.data.feature_lists import ABILITY_FEATURES
+from giddyup.price import overround_expr, remove_vig_expr, stake_expr
+
 load_dotenv()
 
 # Configuration
@@ -41,14 +48,20 @@ def main():
     
     # ===== 1. Load 2025 Data =====
     print("\n📊 Loading 2025 data...")
-    df = pl.read_parquet("data/training_dataset.parquet")
-    
-    # 2025 only
-    df_2025 = df.filter(
-        (pl.col("race_date") >= pl.lit("2025-01-01").str.strptime(pl.Date, "%Y-%m-%d")) &
-        (pl.col("race_date") <= pl.lit("2025-10-16").str.strptime(pl.Date, "%Y-%m-%d")) &
-        pl.col("decimal_odds").is_not_null()
-    )
+    an = Analytics(tick_root=None, bet_log_dir=None)
+    
+    # 2025 only - DuckDB reads just these rows/columns from the Parquet file
+    feature_cols = an.query("DESCRIBE features")["column_name"].to_list()
+    wanted = ["race_id", "horse_id", "race_date", "decimal_odds"] + [
+        c for c in ABILITY_FEATURES if c in feature_cols
+        and c not in ("race_id", "horse_id", "race_date", "decimal_odds")
+    ]
+    df_2025 = an.query(f"""
+        SELECT {", ".join(f'"{c}"' for c in wanted)}
+        FROM features
+        WHERE race_date BETWEEN CAST($start AS DATE) AND CAST($end AS DATE)
+          AND decimal_odds IS NOT NULL
+    """, {"start": "2025-01-01", "end": "2025-10-16"})
     
     print(f"   Runners: {len(df_2025):,}")
     print(f"   Races: {df_2025['race_id'].n_unique():,}")
@@ -112,8 +125,6 @@ def main():
     # ===== 4. Make Predictions =====
     print(f"\n🔮 Generating predictions...")
     
-    from giddyup.data.feature_lists import ABILITY_FEATURES
-    
     # Fill NaNs before prediction (model can't handle them)
     df_2025 = df_2025.with_columns([
         pl.col(col).fill_null(0) for col in ABILITY_FEATURES
@@ -141,34 +152,21 @@ def main():
     ])
     
     # Remove vig per race
-    overround_df = df_2025.group_by("race_id").agg([
-        pl.col("q_market").sum().alias("overround")
+    df_2025 = df_2025.with_columns([
+        overround_expr("q_market", "race_id").alias("overround"),
+        remove_vig_expr("q_market", "race_id").alias("q_vigfree"),
     ])
     
-    df_2025 = df_2025.join(overround_df, on="race_id")
-    
     df_2025 = df_2025.with_columns([
-        (pl.col("q_market") / pl.col("overround")).alias("q_vigfree"),
-        (pl.col("p_model") - (pl.col("q_market") / pl.col("overround"))).alias("edge"),
+        (pl.col("p_model") - pl.col("q_vigfree")).alias("edge"),
     ])
     
     # ===== 6. Calculate Stakes =====
     print(f"\n💰 Calculating stakes (3.0 point base unit)...")
     
     # Calculate Kelly fractions
-    kelly_list = []
-    for row in df_2025.select(["p_model", "decimal_odds"]).iter_rows():
-        p, odds = row
-        b = (odds - 1.0) * (1.0 - COMMISSION)
-        if b > 0:
-            f = (p * (b + 1.0) - 1.0) / b
-            f = max(0.0, min(1.0, f)) * KELLY_FRAC
-        else:
-            f = 0.0
-        kelly_list.append(f)
-    
     df_2025 = df_2025.with_columns([
-        pl.Series("kelly_fraction", kelly_list)
+        stake_expr("p_model", "decimal_odds", COMMISSION, KELLY_FRAC).alias("kelly_fraction")
     ])
     
     # Scale by base unit (3.0 points)
@@ -207,21 +205,27 @@ def main():
     print(f"\n{'Range':<12} {'Count':>8} {'Avg Edge':>10} {'Avg Stake':>12}")
     print("-" * 50)
     
-    for label, min_o, max_o in [
-        ("2.0-4.0", 2.0, 4.0),
-        ("4.0-6.0", 4.0, 6.0),
-        ("6.0-10.0", 6.0, 10.0),
-        ("10.0-15.0", 10.0, 15.0),
-        ("15.0-20.0", 15.0, 20.0),
-        ("20.0+", 20.0, 999.0),
-    ]:
-        bucket = bets.filter(
-            (pl.col("decimal_odds") >= min_o) &
-            (pl.col("decimal_odds") < max_o)
+    an.con.register("bets_2025", bets.select(["race_date", "decimal_odds", "edge", "stake_points"]))
+    by_range = an.query("""
+        SELECT band, COUNT(*) AS n, AVG(edge) AS avg_edge, AVG(stake_points) AS avg_stake
+        FROM (
+            SELECT *, CASE
+                WHEN decimal_odds >= 2.0  AND decimal_odds < 4.0   THEN '2.0-4.0'
+                WHEN decimal_odds >= 4.0  AND decimal_odds < 6.0   THEN '4.0-6.0'
+                WHEN decimal_odds >= 6.0  AND decimal_odds < 10.0  THEN '6.0-10.0'
+                WHEN decimal_odds >= 10.0 AND decimal_odds < 15.0  THEN '10.0-15.0'
+                WHEN decimal_odds >= 15.0 AND decimal_odds < 20.0  THEN '15.0-20.0'
+                WHEN decimal_odds >= 20.0 AND decimal_odds < 999.0 THEN '20.0+'
+            END AS band
+            FROM bets_2025
         )
-        
-        if len(bucket) > 0:
-            print(f"{label:<12} {len(bucket):>8,} {bucket['edge'].mean():>9.1%} {bucket['stake_points'].mean():>11.3f}")
+        WHERE band IS NOT NULL
+        GROUP BY band
+        ORDER BY MIN(decimal_odds)
+    """)
+    
+    for row in by_range.iter_rows(named=True):
+        print(f"{row['band']:<12} {row['n']:>8,} {row['avg_edge']:>9.1%} {row['avg_stake']:>11.3f}")
     
     # ===== 9. Sample Bets =====
     print(f"\n" + "=" * 100)
@@ -256,14 +260,17 @@ def main():
     print("📅 MONTHLY BREAKDOWN (Forward-Looking)")
     print("=" * 100)
     
-    monthly = bets.group_by(
-        pl.col("race_date").dt.strftime("%Y-%m").alias("month")
-    ).agg([
-        pl.len().alias("bets"),
-        pl.col("stake_points").sum().alias("total_stake"),
-        pl.col("decimal_odds").mean().alias("avg_odds"),
-        pl.col("edge").mean().alias("avg_edge"),
-    ]).sort("month")
+    monthly = an.query("""
+        SELECT
+            strftime(race_date, '%Y-%m') AS month,
+            COUNT(*)                     AS bets,
+            SUM(stake_points)            AS total_stake,
+            AVG(decimal_odds)            AS avg_odds,
+            AVG(edge)                    AS avg_edge
+        FROM bets_2025
+        GROUP BY 1
+        ORDER BY 1
+    """)
     
     print(f"\n{'Month':<10} {'Bets':>8} {'Total Stake':>14} {'Avg Odds':>12} {'Avg Edge':>12}")
     print("-" * 70)
@@ -8,6 +8,10 @@ Simulates different base unit sizes and shows impact on:
 - Volatility (standard deviation)
 - Sharpe ratio
 
+Then runs a Monte Carlo over resampled bet sequences (giddyup.backtest.montecarlo)
+for every Kelly multiplier x unit size: risk of ruin, drawdown distribution
+and growth rate.
+
 Recommends optimal stake size based on risk/reward.
 """
 
@@ -20,21 +24,22 @@ import numpy as np
 import pickle
 from pathlib import Path
 
+from giddyup.backtest.montecarlo import bet_returns, simulate_bankroll, summary_rows
+from giddyup.price.arrays import kelly_expr
+
 # Configuration
 EDGE_MIN = 0.03  # 3% minimum edge
 ODDS_MIN = 2.0   # Avoid heavy favorites
 COMMISSION = 0.02  # 2% on winning bets
 KELLY_FRAC = 0.25  # Quarter Kelly
+BASE_UNITS = [1.0, 2.0, 3.0, 4.0, 5.0]
 
-
-def calculate_pnl(stake: float, odds: float, won: bool, commission: float = 0.02) -> float:
-    """Calculate P&L with commission on winning bets."""
-    if won:
-        gross_profit = stake * (odds - 1)
-        net_profit = gross_profit * (1 - commission)
-        return net_profit
-    else:
-        return -stake
+# Monte Carlo
+KELLY_MULTIPLIERS = [0.1, 0.25, 0.5, 1.0]
+BANKROLL = 100.0   # Starting bankroll (points)
+N_PATHS = 10_000
+RESAMPLE = "bootstrap"  # or "permutation" (same bets, shuffled order)
+SEED = 42
 
 
 def simulate_stake_size(bets_df: pl.DataFrame, base_unit: float) -> dict:
@@ -49,50 +54,37 @@ def simulate_stake_size(bets_df: pl.DataFrame, base_unit: float) -> dict:
         Dictionary with performance metrics
     """
     # Scale stakes by base unit
-    scaled_bets = bets_df.with_columns([
-        (pl.col("kelly_fraction") * base_unit).alias("actual_stake")
-    ])
-    
-    # Calculate P&L for each bet
-    pnl_list = []
-    for row in scaled_bets.select(["actual_stake", "decimal_odds", "won"]).iter_rows():
-        stake, odds, won = row
-        pnl = calculate_pnl(stake, odds, won, COMMISSION)
-        pnl_list.append(pnl)
-    
-    scaled_bets = scaled_bets.with_columns([
-        pl.Series("pnl", pnl_list)
-    ])
+    stakes = bets_df["kelly_fraction"].to_numpy() * base_unit
+    pnl = stakes * bet_returns(bets_df["decimal_odds"].to_numpy(), bets_df["won"].to_numpy(), COMMISSION)
+    n_bets = len(pnl)
     
     # Calculate metrics
-    total_stake = scaled_bets["actual_stake"].sum()
-    total_pnl = scaled_bets["pnl"].sum()
+    total_stake = stakes.sum()
+    total_pnl = pnl.sum()
     roi = (total_pnl / total_stake * 100) if total_stake > 0 else 0
     
     # Volatility
-    pnl_std = scaled_bets["pnl"].std()
+    pnl_std = pnl.std(ddof=1) if n_bets > 1 else 0.0
     
     # Maximum drawdown
-    cumulative_pnl = scaled_bets["pnl"].cum_sum()
-    running_max = cumulative_pnl.cum_max()
-    drawdown = running_max - cumulative_pnl
-    max_drawdown = drawdown.max()
+    cumulative_pnl = np.cumsum(pnl)
+    running_max = np.maximum.accumulate(cumulative_pnl)
+    max_drawdown = (running_max - cumulative_pnl).max() if n_bets else 0.0
     
     # Sharpe ratio (annualized, assuming ~250 trading days)
-    mean_daily_return = scaled_bets["pnl"].mean()
-    std_daily_return = scaled_bets["pnl"].std()
-    sharpe = (mean_daily_return / std_daily_return * np.sqrt(250)) if std_daily_return > 0 else 0
+    mean_daily_return = pnl.mean() if n_bets else 0.0
+    sharpe = (mean_daily_return / pnl_std * np.sqrt(250)) if pnl_std > 0 else 0
     
     return {
         "base_unit": base_unit,
-        "total_bets": len(scaled_bets),
+        "total_bets": n_bets,
         "total_stake": total_stake,
         "total_pnl": total_pnl,
         "roi": roi,
         "volatility": pnl_std,
         "max_drawdown": max_drawdown,
         "sharpe": sharpe,
-        "avg_stake": total_stake / len(scaled_bets) if len(scaled_bets) > 0 else 0,
+        "avg_stake": total_stake / n_bets if n_bets > 0 else 0,
     }
 
 
@@ -178,19 +170,10 @@ def main():
     # ===== 5. Calculate Kelly Fractions =====
     print(f"\n💰 Calculating Kelly fractions...")
     
-    kelly_list = []
-    for row in test_df.select(["p_model", "decimal_odds"]).iter_rows():
-        p, odds = row
-        b = (odds - 1.0) * (1.0 - COMMISSION)
-        if b > 0:
-            f = (p * (b + 1.0) - 1.0) / b
-            f = max(0.0, min(1.0, f)) * KELLY_FRAC
-        else:
-            f = 0.0
-        kelly_list.append(f)
-    
     test_df = test_df.with_columns([
-        pl.Series("kelly_fraction", kelly_list)
+        kelly_expr("p_model", "decimal_odds", COMMISSION).alias("kelly_full"),
+    ]).with_columns([
+        (pl.col("kelly_full") * KELLY_FRAC).alias("kelly_fraction"),
     ])
     
     # ===== 6. Filter to Bets =====
@@ -224,11 +207,23 @@ def main():
     print(f"   Commission: {COMMISSION*100:.0f}% on winning bets")
     print(f"   Kelly multiplier: {KELLY_FRAC*100:.0f}% (fractional Kelly)")
     
-    results = []
-    
-    for base_unit in [1.0, 2.0, 3.0, 4.0, 5.0]:
-        result = simulate_stake_size(bets_df, base_unit)
-        results.append(result)
+    results = [simulate_stake_size(bets_df, base_unit) for base_unit in BASE_UNITS]
+    
+    # Resampled paths for every Kelly multiplier x unit size in one pass
+    print(f"\n🎲 Monte Carlo: {N_PATHS:,} {RESAMPLE} paths, {BANKROLL:.0f} point bankroll...")
+    mc = simulate_bankroll(
+        bets_df["kelly_full"].to_numpy(),
+        bets_df["decimal_odds"].to_numpy(),
+        bets_df["won"].to_numpy(),
+        fractions=KELLY_MULTIPLIERS,
+        units=BASE_UNITS,
+        bankroll=BANKROLL,
+        n_paths=N_PATHS,
+        mode=RESAMPLE,
+        commission=COMMISSION,
+        seed=SEED,
+    )
+    mc_rows = summary_rows(mc)
     
     # ===== 8. Display Results =====
     print(f"\n" + "=" * 90)
@@ -243,6 +238,23 @@ def main():
               f"{r['total_pnl']:>+12.2f} {r['roi']:>+7.1f}% {r['max_drawdown']:>10.2f} "
               f"{r['sharpe']:>8.2f} {r['volatility']:>10.2f}")
     
+    print(f"\n" + "=" * 90)
+    print(f"🎲 MONTE CARLO ({N_PATHS:,} paths, {BANKROLL:.0f} point bankroll)")
+    print("=" * 90)
+    
+    lo, mid, hi = mc["roi_q"]
+    print(f"\n   ROI across paths (5% / 50% / 95%): {lo:+.1f}% / {mid:+.1f}% / {hi:+.1f}%")
+    
+    print(f"\n{'Kelly':>6} {'Unit':>6} {'Ruin':>8} {'DD 50%':>10} {'DD 95%':>10} "
+          f"{'P&L 5%':>10} {'P&L 50%':>10} {'P&L 95%':>10} {'Growth/1k':>10}")
+    print("-" * 90)
+    
+    for r in mc_rows:
+        print(f"{r['kelly_fraction']:>6.2f} {r['base_unit']:>6.1f} {r['ruin_prob']:>7.1%} "
+              f"{r['drawdown_median']:>10.2f} {r['drawdown_p95']:>10.2f} "
+              f"{r['pnl_low']:>+10.2f} {r['pnl_median']:>+10.2f} {r['pnl_high']:>+10.2f} "
+              f"{r['growth_per_bet'] * 1000:>+10.3f}")
+    
     # ===== 9. Analysis =====
     print(f"\n" + "=" * 90)
     print("📈 ANALYSIS & RECOMMENDATION")
@@ -370,6 +382,11 @@ def main():
         print(f"\n   {r['base_unit']:.1f} points → Need {bankroll_needed:.0f} point bankroll")
         print(f"      (3x max drawdown of {r['max_drawdown']:.2f})")
         
+        sim = [m for m in mc_rows if m['kelly_fraction'] == KELLY_FRAC and m['base_unit'] == r['base_unit']]
+        if sim:
+            print(f"      Simulated: 95% of paths drew down less than {sim[0]['drawdown_p95']:.2f}, "
+                  f"ruin risk {sim[0]['ruin_prob']:.1%} from {BANKROLL:.0f} points")
+        
         if r['roi'] > 0:
             # Time to double bankroll
             if r['roi'] > 0:
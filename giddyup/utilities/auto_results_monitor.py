@@ -9,13 +9,17 @@ Can be run standalone or integrated into HorseBot.
 """
 
 import time
-import csv
 from pathlib import Path
 from datetime import datetime, timedelta
 import pytz
 from typing import List, Dict
 
-from results_checker import fetch_results, check_horse_position, calculate_pnl
+from results_checker import RESULTS_CACHE, calculate_pnl
+
+try:
+    from utilities.log_writer import load_action_rows, open_results_sidecar, record_result
+except ImportError:  # Run directly from utilities/
+    from log_writer import load_action_rows, open_results_sidecar, record_result
 
 # Import notifications
 try:
@@ -58,13 +62,11 @@ def monitor_results(date: str, actions_csv: Path, check_interval: int = 60):
     
     checked_races = set()  # Track which races we've already checked
     
-    # Load all bets
-    bets = []
-    with actions_csv.open() as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row.get('bet_placed') in ['DRY_RUN', 'EXECUTED']:
-                bets.append(row)
+    # Load all bets (with results already in the results sidecar)
+    bets = [
+        row for row in load_action_rows(actions_csv)
+        if row.get('bet_placed') in ['DRY_RUN', 'EXECUTED']
+    ]
     
     while True:
         now = datetime.now(BST)
@@ -94,16 +96,9 @@ def monitor_results(date: str, actions_csv: Path, check_interval: int = 60):
                     # Time to check result!
                     print(f"⏰ Checking result for {bet['horse']} @ {bet['course']} ({bet['race_time']})...")
                     
-                    # Fetch latest results
-                    race_results = fetch_results(date)
-                    
-                    # Check result
-                    result = check_horse_position(
-                        bet['horse'],
-                        bet['course'],
-                        bet['race_time'],
-                        race_results
-                    )
+                    # Served from the shared results cache - one API request per
+                    # interval however many bets are waiting
+                    result = RESULTS_CACHE.lookup(date, bet['horse'], bet['course'], bet['race_time'])
                     
                     if result:
                         # Calculate P&L
@@ -111,8 +106,8 @@ def monitor_results(date: str, actions_csv: Path, check_interval: int = 60):
                         stake = float(bet.get('stake', 0))
                         pnl = calculate_pnl(result, odds, stake)
                         
-                        # Update CSV
-                        update_bet_result(actions_csv, bet['horse'], result, pnl)
+                        # Append to results sidecar
+                        update_bet_result(actions_csv, bet, result, pnl)
                         
                         # Announce result
                         if result == "WIN":
@@ -188,30 +183,10 @@ def monitor_results(date: str, actions_csv: Path, check_interval: int = 60):
         time.sleep(check_interval)
 
 
-def update_bet_result(csv_file: Path, horse_name: str, result: str, pnl: float):
-    """Update a single bet result in CSV."""
-    from results_checker import normalize_horse_name
-    
-    # Read all rows
-    rows = []
-    with csv_file.open('r') as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames
-        for row in reader:
-            rows.append(row)
-    
-    # Update matching row
-    for row in rows:
-        if normalize_horse_name(row['horse']) == normalize_horse_name(horse_name):
-            row['result'] = result
-            row['pnl_gbp'] = str(pnl)
-            break
-    
-    # Write back
-    with csv_file.open('w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+def update_bet_result(csv_file: Path, bet: Dict, result: str, pnl: float):
+    """Append a single bet result to the action log's results sidecar."""
+    with open_results_sidecar(csv_file) as results_log:
+        record_result(results_log, bet, result, pnl, telegram_posted=TELEGRAM_ENABLED)
 
 
 if __name__ == "__main__":
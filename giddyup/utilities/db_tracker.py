@@ -12,25 +12,175 @@ Usage:
     selection_id = tracker.record_selection(session_id, ...)
     tracker.record_bet_decision(selection_id, 'PLACED', ...)
     tracker.record_telegram_notification(selection_id, 'BET_PLACED', ...)
+
+Write-behind mode (for per-tick tracking in the bot loop):
+    tracker = BotTracker(write_behind=True)
+    tracker.record_price_observation(...)   # Queued - returns immediately
+    tracker.close()                         # Flushes everything still queued
 """
 
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from datetime import datetime, time
 from typing import Optional, Dict, List, Any
 from decimal import Decimal
+import atexit
 import os
+import queue
+import threading
+
+# ============================================================================
+# WRITE-BEHIND BATCH STATEMENTS (one execute_values call per table per flush)
+# ============================================================================
+
+BATCH_PRICE_OBSERVATIONS = """
+    INSERT INTO price_observations
+    (selection_id, observed_at, minutes_to_off, back_odds, lay_odds,
+     market_id, selection_id_betfair, market_status)
+    VALUES %s
+"""
+
+BATCH_BET_DECISIONS = """
+    INSERT INTO bet_decisions
+    (selection_id, decision_time, minutes_to_off, decision, current_odds,
+     stake_gbp, bet_id, market_id, selection_id_betfair, reason, drift_percentage)
+    VALUES %s
+    ON CONFLICT (selection_id, decision_time)
+    DO UPDATE SET
+        decision = EXCLUDED.decision,
+        current_odds = EXCLUDED.current_odds,
+        stake_gbp = EXCLUDED.stake_gbp,
+        bet_id = EXCLUDED.bet_id,
+        reason = EXCLUDED.reason
+"""
+
+BATCH_TELEGRAM_NOTIFICATIONS = """
+    INSERT INTO telegram_notifications
+    (session_id, selection_id, decision_id, result_id, notification_type,
+     sent_at, channel_id, message_id, message_text, success, error_message)
+    VALUES %s
+"""
+
+
+class _WriteBehindQueue:
+    """
+    Background writer for tracker events.
+    
+    Rows are queued by statement and flushed with execute_values on a
+    dedicated connection every `batch_size` rows or `flush_ms` milliseconds.
+    """
+    
+    def __init__(self, conn_string: str, batch_size: int = 500, flush_ms: int = 250,
+                 max_retries: int = 3):
+        self.conn_string = conn_string
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000
+        self.max_retries = max_retries
+        
+        self._queue: "queue.Queue" = queue.Queue()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._conn = None
+        self._retry: Dict[str, list] = {}
+        self._attempts: Dict[str, int] = {}
+        
+        self._thread = threading.Thread(target=self._run, name="bot-tracker-writer", daemon=True)
+        self._thread.start()
+    
+    def put(self, statement: str, row: tuple):
+        """Queue one row (never blocks on the database)."""
+        if self._stopped:
+            raise RuntimeError("BotTracker write-behind queue is closed")
+        self._queue.put((statement, row))
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+    
+    def flush(self):
+        """Block until every row queued so far has been written (or given up on)."""
+        if self._thread.is_alive():
+            self._wake.set()
+            self._queue.join()
+    
+    def close(self):
+        """Stop the writer after flushing everything still queued."""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._wake.set()
+        self._thread.join()
+        if self._conn and not self._conn.closed:
+            self._conn.close()
+    
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._drain()
+            if self._stopped and self._queue.empty() and not self._retry:
+                return
+    
+    def _drain(self):
+        """
+        Write everything currently queued, grouped by statement.
+        
+        A row is only marked done on the queue once it is committed or
+        dropped for good, so flush() also waits for rows being retried.
+        """
+        batches: Dict[str, list] = self._retry
+        self._retry = {}
+        
+        while True:
+            try:
+                statement, row = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batches.setdefault(statement, []).append(row)
+        
+        for statement, rows in batches.items():
+            if rows and not self._write(statement, rows):
+                self._retry[statement] = rows
+                continue
+            for _ in rows:
+                self._queue.task_done()
+    
+    def _write(self, statement: str, rows: list) -> bool:
+        """Write one batch. Returns False if it should be retried on the next drain."""
+        try:
+            if self._conn is None or self._conn.closed:
+                self._conn = psycopg2.connect(self.conn_string)
+            with self._conn.cursor() as cur:
+                execute_values(cur, statement, rows, page_size=self.batch_size)
+            self._conn.commit()
+            self._attempts.pop(statement, None)
+            return True
+        except Exception as e:
+            if self._conn and not self._conn.closed:
+                self._conn.rollback()
+            attempts = self._attempts.get(statement, 0) + 1
+            if attempts < self.max_retries:
+                self._attempts[statement] = attempts
+                print(f"⚠️  BotTracker batch failed ({len(rows)} rows, retrying): {e}")
+                return False
+            self._attempts.pop(statement, None)
+            print(f"❌ BotTracker dropped {len(rows)} rows after {attempts} attempts: {e}")
+            return True
 
 class BotTracker:
     """Track all bot activities in PostgreSQL database."""
     
-    def __init__(self, connection_string: Optional[str] = None):
+    def __init__(self, connection_string: Optional[str] = None,
+                 write_behind: bool = False, batch_size: int = 500, flush_ms: int = 250):
         """
         Initialize database connection.
         
         Args:
             connection_string: PostgreSQL connection string
                               If None, reads from environment or uses default
+            write_behind: Queue price observations, bet decisions and Telegram
+                          notifications and write them in batches on a
+                          background thread (their record_* calls return None)
+            batch_size: Write-behind flush threshold (rows)
+            flush_ms: Write-behind flush interval (milliseconds)
         """
         if connection_string is None:
             connection_string = os.getenv(
@@ -40,6 +190,11 @@ class BotTracker:
         
         self.conn_string = connection_string
         self._conn = None
+        self._writer = None
+        
+        if write_behind:
+            self._writer = _WriteBehindQueue(connection_string, batch_size, flush_ms)
+            atexit.register(self._writer.close)
     
     def _get_connection(self):
         """Get or create database connection."""
@@ -49,6 +204,10 @@ class BotTracker:
     
     def _execute(self, query: str, params: tuple = None, fetch_one=False, fetch_all=False):
         """Execute query and optionally fetch results."""
+        # Reads and synchronous writes must see everything queued before them
+        if self._writer:
+            self._writer.flush()
+        
         conn = self._get_connection()
         try:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
@@ -178,6 +337,13 @@ class BotTracker:
                                 market_id: str = None, selection_id_betfair: str = None,
                                 market_status: str = 'OPEN'):
         """Record a price observation."""
+        if self._writer:
+            self._writer.put(BATCH_PRICE_OBSERVATIONS, (
+                selection_id, datetime.now(), minutes_to_off, back_odds, lay_odds,
+                market_id, selection_id_betfair, market_status
+            ))
+            return
+        
         query = """
             INSERT INTO price_observations
             (selection_id, observed_at, minutes_to_off, back_odds, lay_odds,
@@ -202,8 +368,15 @@ class BotTracker:
         Record a betting decision (PLACED, SKIPPED, or FAILED).
         
         Returns:
-            decision_id: ID of created decision
+            decision_id: ID of created decision (None in write-behind mode)
         """
+        if self._writer:
+            self._writer.put(BATCH_BET_DECISIONS, (
+                selection_id, datetime.now(), minutes_to_off, decision, current_odds,
+                stake_gbp, bet_id, market_id, selection_id_betfair, reason, drift_percentage
+            ))
+            return None
+        
         query = """
             INSERT INTO bet_decisions
             (selection_id, decision_time, minutes_to_off, decision, current_odds,
@@ -314,8 +487,15 @@ class BotTracker:
         Record a Telegram notification.
         
         Returns:
-            notification_id: ID of created notification
+            notification_id: ID of created notification (None in write-behind mode)
         """
+        if self._writer:
+            self._writer.put(BATCH_TELEGRAM_NOTIFICATIONS, (
+                session_id, selection_id, decision_id, result_id, notification_type,
+                datetime.now(), channel_id, message_id, message_text, success, error_message
+            ))
+            return None
+        
         query = """
             INSERT INTO telegram_notifications
             (session_id, selection_id, decision_id, result_id, notification_type,
@@ -405,8 +585,15 @@ class BotTracker:
         query = "SELECT * FROM vw_telegram_activity WHERE date = %s"
         return self._execute(query, (date,), fetch_all=True)
     
+    def flush(self):
+        """Write all queued write-behind rows now (no-op otherwise)."""
+        if self._writer:
+            self._writer.flush()
+    
     def close(self):
-        """Close database connection."""
+        """Flush queued rows and close database connections."""
+        if self._writer:
+            self._writer.close()
         if self._conn and not self._conn.closed:
             self._conn.close()
     
@@ -28,6 +28,11 @@ except ImportError:
     print("="*80 + "\n")
     sys.exit(1)
 
+try:
+    from utilities.log_writer import load_action_rows
+except ImportError:  # Run directly from utilities/
+    from log_writer import load_action_rows
+
 
 def create_betting_report(date: str):
     """Create formatted Excel report from CSV logs."""
@@ -87,52 +92,50 @@ def create_betting_report(date: str):
         cell.alignment = Alignment(horizontal='center', vertical='center')
         cell.border = thin_border
     
-    # Read CSV and populate
-    with action_csv.open() as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    # Read CSV (results overlaid from the bot_results sidecar) and populate
+    rows = load_action_rows(action_csv)
+    
+    for row_idx, row in enumerate(rows, 2):
+        # Data
+        ws_bets.cell(row_idx, 1, row["race_time"])
+        ws_bets.cell(row_idx, 2, row["course"])
+        ws_bets.cell(row_idx, 3, row["horse"])
+        ws_bets.cell(row_idx, 4, row["strategy"])
+        ws_bets.cell(row_idx, 5, float(row["expected_odds"]))
+        ws_bets.cell(row_idx, 6, float(row["min_odds"]))
+        ws_bets.cell(row_idx, 7, float(row["actual_odds"]) if row["actual_odds"] else "")
+        ws_bets.cell(row_idx, 8, float(row["stake"]))
+        ws_bets.cell(row_idx, 9, row["bet_placed"])
+        ws_bets.cell(row_idx, 10, row["bet_id"])
+        ws_bets.cell(row_idx, 11, row["reason"])
+        ws_bets.cell(row_idx, 12, row["result"])  # Result (WIN/LOSS once graded, else manual entry)
+        ws_bets.cell(row_idx, 13, "")  # Missed Winner (manual entry: YES if would have won but didn't bet)
         
-        for row_idx, row in enumerate(rows, 2):
-            # Data
-            ws_bets.cell(row_idx, 1, row["race_time"])
-            ws_bets.cell(row_idx, 2, row["course"])
-            ws_bets.cell(row_idx, 3, row["horse"])
-            ws_bets.cell(row_idx, 4, row["strategy"])
-            ws_bets.cell(row_idx, 5, float(row["expected_odds"]))
-            ws_bets.cell(row_idx, 6, float(row["min_odds"]))
-            ws_bets.cell(row_idx, 7, float(row["actual_odds"]) if row["actual_odds"] else "")
-            ws_bets.cell(row_idx, 8, float(row["stake"]))
-            ws_bets.cell(row_idx, 9, row["bet_placed"])
-            ws_bets.cell(row_idx, 10, row["bet_id"])
-            ws_bets.cell(row_idx, 11, row["reason"])
-            ws_bets.cell(row_idx, 12, "")  # Result (manual entry: WIN/LOSS for placed bets)
-            ws_bets.cell(row_idx, 13, "")  # Missed Winner (manual entry: YES if would have won but didn't bet)
-            
-            # PNL formula: Only count if bet was actually placed
-            # WIN: (Actual Odds × Stake) - Stake - (Actual Odds × Stake × 0.02) = Profit - Commission
-            # LOSS: -Stake
-            pnl_formula = f'=IF(I{row_idx}="NO","",IF(L{row_idx}="WIN",G{row_idx}*H{row_idx}-H{row_idx}-G{row_idx}*H{row_idx}*0.02,IF(L{row_idx}="LOSS",-H{row_idx},"")))'
-            ws_bets.cell(row_idx, 14, pnl_formula)
-            
-            # Running PNL: Sum of all PNL above (only actual bets)
-            if row_idx == 2:
-                running_formula = f"=IF(ISNUMBER(N{row_idx}),N{row_idx},0)"
-            else:
-                running_formula = f"=IF(ISNUMBER(N{row_idx}),O{row_idx-1}+N{row_idx},O{row_idx-1})"
-            ws_bets.cell(row_idx, 15, running_formula)
+        # PNL formula: Only count if bet was actually placed
+        # WIN: (Actual Odds × Stake) - Stake - (Actual Odds × Stake × 0.02) = Profit - Commission
+        # LOSS: -Stake
+        pnl_formula = f'=IF(I{row_idx}="NO","",IF(L{row_idx}="WIN",G{row_idx}*H{row_idx}-H{row_idx}-G{row_idx}*H{row_idx}*0.02,IF(L{row_idx}="LOSS",-H{row_idx},"")))'
+        ws_bets.cell(row_idx, 14, pnl_formula)
+        
+        # Running PNL: Sum of all PNL above (only actual bets)
+        if row_idx == 2:
+            running_formula = f"=IF(ISNUMBER(N{row_idx}),N{row_idx},0)"
+        else:
+            running_formula = f"=IF(ISNUMBER(N{row_idx}),O{row_idx-1}+N{row_idx},O{row_idx-1})"
+        ws_bets.cell(row_idx, 15, running_formula)
+        
+        # Apply colors
+        for col in range(1, 16):
+            cell = ws_bets.cell(row_idx, col)
+            cell.border = thin_border
             
-            # Apply colors
-            for col in range(1, 16):
-                cell = ws_bets.cell(row_idx, col)
-                cell.border = thin_border
-                
-                # Green for matched bets
-                if row["bet_placed"] in ["DRY_RUN", "EXECUTED", "YES"]:
-                    cell.fill = green_fill
-                # Red for missed winners (will be filled in manually)
-                # Yellow for skipped (but had criteria)
-                elif "too low" not in row["reason"].lower():
-                    cell.fill = yellow_fill
+            # Green for matched bets
+            if row["bet_placed"] in ["DRY_RUN", "EXECUTED", "YES"]:
+                cell.fill = green_fill
+            # Red for missed winners (will be filled in manually)
+            # Yellow for skipped (but had criteria)
+            elif "too low" not in row["reason"].lower():
+                cell.fill = yellow_fill
     
     # Column widths
     ws_bets.column_dimensions['A'].width = 8   # Time
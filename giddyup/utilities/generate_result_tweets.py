@@ -5,16 +5,21 @@ Generate result tweets from bot actions CSV after results have been filled in.
 Usage:
     python3 generate_result_tweets.py 2025-10-18
     
-This reads the bot_actions_<date>.csv file and generates result tweets 
-for any bets that have results (WIN/LOSS) filled in.
+This reads the bot_actions_<date>.csv file (with results from the
+bot_results_<date>.csv sidecar) and generates result tweets for any bets
+that have results (WIN/LOSS) filled in.
 """
 
 import sys
-import csv
 import re
 from pathlib import Path
 from datetime import datetime
 
+try:
+    from utilities.log_writer import load_action_rows
+except ImportError:  # Run directly from utilities/
+    from log_writer import load_action_rows
+
 
 def normalize_horse_name(horse: str) -> str:
     """Normalize horse name for hashtag."""
@@ -112,51 +117,49 @@ def main():
     results_found = 0
     tweets_generated = 0
     
-    with actions_csv.open() as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-        
-        for row in reader:
-            # Only process rows with bet placed and result filled in
-            if row.get("bet_placed") in ["DRY_RUN", "EXECUTED", "YES"]:
-                result = row.get("result", "").strip().upper()
+    rows = load_action_rows(actions_csv)
+    
+    for row in rows:
+        # Only process rows with bet placed and result filled in
+        if row.get("bet_placed") in ["DRY_RUN", "EXECUTED", "YES"]:
+            result = row.get("result", "").strip().upper()
+            
+            if result in ["WIN", "LOSS"]:
+                results_found += 1
                 
-                if result in ["WIN", "LOSS"]:
-                    results_found += 1
-                    
-                    # Calculate P&L if not provided
-                    if row.get("pnl_gbp"):
-                        try:
-                            pnl = float(row["pnl_gbp"])
-                        except ValueError:
-                            pnl = calculate_pnl(result, float(row["actual_odds"]), float(row["stake"]))
-                    else:
+                # Calculate P&L if not provided
+                if row.get("pnl_gbp"):
+                    try:
+                        pnl = float(row["pnl_gbp"])
+                    except ValueError:
                         pnl = calculate_pnl(result, float(row["actual_odds"]), float(row["stake"]))
+                else:
+                    pnl = calculate_pnl(result, float(row["actual_odds"]), float(row["stake"]))
+                
+                # Generate tweet
+                try:
+                    filename = generate_result_tweet(
+                        race_time=row["race_time"],
+                        course=row["course"],
+                        horse=row["horse"],
+                        result=result,
+                        pnl=pnl,
+                        tweet_dir=tweet_dir
+                    )
                     
-                    # Generate tweet
-                    try:
-                        filename = generate_result_tweet(
-                            race_time=row["race_time"],
-                            course=row["course"],
-                            horse=row["horse"],
-                            result=result,
-                            pnl=pnl,
-                            tweet_dir=tweet_dir
-                        )
-                        
-                        emoji = "🎉" if result == "WIN" else "😔"
-                        pnl_str = f"+£{pnl:.2f}" if pnl > 0 else f"£{pnl:.2f}"
-                        
-                        print(f"{emoji} {row['horse']} @ {row['race_time']}")
-                        print(f"   Result: {result} | P&L: {pnl_str}")
-                        print(f"   Tweet: {filename}")
-                        print("")
-                        
-                        tweets_generated += 1
-                        
-                    except Exception as e:
-                        print(f"⚠️  Error generating tweet for {row['horse']}: {e}")
-                        print("")
+                    emoji = "🎉" if result == "WIN" else "😔"
+                    pnl_str = f"+£{pnl:.2f}" if pnl > 0 else f"£{pnl:.2f}"
+                    
+                    print(f"{emoji} {row['horse']} @ {row['race_time']}")
+                    print(f"   Result: {result} | P&L: {pnl_str}")
+                    print(f"   Tweet: {filename}")
+                    print("")
+                    
+                    tweets_generated += 1
+                    
+                except Exception as e:
+                    print(f"⚠️  Error generating tweet for {row['horse']}: {e}")
+                    print("")
     
     print("=" * 80)
     print(f"✅ COMPLETE")
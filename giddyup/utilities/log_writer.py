@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Buffered CSV Log Writer
+=======================
+Keeps CSV file I/O off the bot's decision loop.
+
+Rows are appended to an in-memory buffer and written by a background thread
+every `flush_interval` seconds (or as soon as `max_buffer` rows are queued).
+The file handle stays open for the whole session and is fsync'd on close.
+
+Results are never written back into the action log - they go to an
+append-only sidecar (`bot_results_<date>.csv`) and are overlaid on read.
+
+Usage:
+    from utilities.log_writer import BufferedCSVWriter, load_action_rows
+
+    writer = BufferedCSVWriter(price_log, PRICE_LOG_HEADER)
+    writer.write([...])      # Returns immediately
+    writer.close()           # Flush + fsync
+"""
+
+import csv
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+# Sidecar columns (one row per graded bet, latest row wins)
+RESULTS_HEADER = [
+    "timestamp", "race_time", "course", "horse", "strategy",
+    "result", "pnl_gbp", "telegram_posted"
+]
+
+
+class BufferedCSVWriter:
+    """Append-only CSV writer with a background flush thread."""
+
+    def __init__(self, path: Path, header: Sequence[str],
+                 flush_interval: float = 1.0, max_buffer: int = 500):
+        """
+        Open (or create) a CSV log and start the flush thread.
+
+        Args:
+            path: CSV file to append to
+            header: Column names (written only if the file is new/empty)
+            flush_interval: Seconds between background flushes
+            max_buffer: Flush early once this many rows are queued
+        """
+        self.path = Path(path)
+        self.header = list(header)
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+
+        self._buffer: List[Sequence] = []
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+
+        is_new = not self.path.exists() or self.path.stat().st_size == 0
+        self._file = self.path.open("a", newline="")
+        self._writer = csv.writer(self._file)
+        if is_new:
+            self._writer.writerow(self.header)
+            self._file.flush()
+
+        self._thread = threading.Thread(
+            target=self._run, name=f"log-writer-{self.path.name}", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, row: Sequence) -> None:
+        """Queue a row. Never touches the file on the caller's thread."""
+        with self._lock:
+            if self._closed:
+                raise ValueError(f"Log writer for {self.path} is closed")
+            self._buffer.append(row)
+            if len(self._buffer) >= self.max_buffer:
+                self._wake.set()
+
+    def write_dict(self, row: Dict) -> None:
+        """Queue a row given as a dict keyed by header column."""
+        self.write([row.get(col, "") for col in self.header])
+
+    def flush(self, sync: bool = False) -> None:
+        """
+        Write all queued rows now.
+
+        Args:
+            sync: Also fsync the file to disk
+        """
+        # The swap happens under _io_lock too, so batches reach the file in
+        # queue order and a returning flush() means every row queued before
+        # it is on disk (not still in another flusher's hands)
+        with self._io_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            if self._file.closed:
+                return
+            if rows:
+                self._writer.writerows(rows)
+            self._file.flush()
+            if sync:
+                os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Stop the flush thread, write remaining rows and fsync."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        self._wake.set()
+        self._thread.join()
+        self.flush(sync=True)
+        with self._io_lock:
+            self._file.close()
+
+    def _run(self):
+        """Background loop: flush every interval or when woken."""
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️  Log writer error ({self.path.name}): {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+# ============================================================================
+# RESULTS SIDECAR
+# ============================================================================
+
+def results_sidecar_path(action_log: Path) -> Path:
+    """Sidecar path for an action log (bot_actions_X.csv -> bot_results_X.csv)."""
+    action_log = Path(action_log)
+    return action_log.with_name(action_log.name.replace("bot_actions_", "bot_results_", 1))
+
+
+def open_results_sidecar(action_log: Path, flush_interval: float = 1.0) -> BufferedCSVWriter:
+    """Open the append-only results sidecar for an action log."""
+    return BufferedCSVWriter(results_sidecar_path(action_log), RESULTS_HEADER, flush_interval)
+
+
+def record_result(sidecar: BufferedCSVWriter, row: Dict, result: str,
+                  pnl: float, telegram_posted: bool = False) -> None:
+    """Append a graded result for an action-log row to the sidecar."""
+    sidecar.write([
+        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        row.get("race_time", ""), row.get("course", ""), row.get("horse", ""),
+        row.get("strategy", ""), result, str(pnl),
+        "YES" if telegram_posted else ""
+    ])
+
+
+def load_action_rows(action_log: Path) -> List[Dict]:
+    """
+    Read an action log with results from its sidecar overlaid.
+
+    Rows are matched on (race_time, horse); the last sidecar entry wins.
+
+    Returns:
+        List of row dicts with 'result', 'pnl_gbp' and 'telegram_posted' filled
+    """
+    action_log = Path(action_log)
+    with action_log.open("r", newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    results: Dict[tuple, Dict] = {}
+    sidecar = results_sidecar_path(action_log)
+    if sidecar.exists():
+        with sidecar.open("r", newline="") as f:
+            for res in csv.DictReader(f):
+                results[(res["race_time"], res["horse"])] = res
+
+    for row in rows:
+        for col in ("result", "pnl_gbp", "telegram_posted"):
+            row.setdefault(col, "")
+            if row[col] is None:
+                row[col] = ""
+        res = results.get((row.get("race_time"), row.get("horse")))
+        if res:
+            row["result"] = res["result"]
+            row["pnl_gbp"] = res["pnl_gbp"]
+            row["telegram_posted"] = res["telegram_posted"]
+
+    return rows
+
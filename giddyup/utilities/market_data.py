@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Shared Market Data Hub
+======================
+One place for market discovery and prices when several strategies watch the
+same races from one process.
+
+- find_market() results are cached per (horse, course, race_time), so a horse
+  picked by more than one strategy is only looked up once.
+- refresh() fetches every tracked market in batched list_market_book calls
+  (up to MAX_MARKETS_PER_REQUEST per call) instead of one call per selection.
+- Prices are served from the cache until they are older than `max_age`.
+
+Usage:
+    from utilities.market_data import MarketDataHub
+
+    hub = MarketDataHub(betfair)                 # Logged-in Betfair wrapper
+    market_id, sel_id = hub.resolve(horse, course, "14:30")
+    hub.refresh([market_id, ...])                # One batched request
+    odds = hub.back_price(market_id, sel_id)
+"""
+
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    from betfairlightweight.filters import price_projection
+except ImportError:
+    price_projection = None
+
+try:
+    from utilities.request_governor import GOVERNOR, book_weight, max_markets_per_request
+except ImportError:
+    from request_governor import GOVERNOR, book_weight, max_markets_per_request
+
+# EX_BEST_OFFERS costs 5 weight points per market; Betfair allows 200 per request
+MAX_MARKETS_PER_REQUEST = max_markets_per_request(book_weight(1))
+
+
+class MarketDataHub:
+    """Shared market lookup + batched price cache over one Betfair session."""
+
+    def __init__(self, betfair, max_age: float = 2.0, ticks=None):
+        """
+        Args:
+            betfair: Logged-in Betfair wrapper (find_market/get_odds/client)
+            max_age: Seconds a cached market book stays fresh
+            ticks: Optional TickArchiver - every fetched book is archived
+        """
+        self.betfair = betfair
+        self.max_age = max_age
+        self.ticks = ticks
+
+        self._markets: Dict[Tuple[str, str, str], Optional[tuple]] = {}
+        self._books: Dict[str, dict] = {}       # market_id -> {'fetched', 'total_matched', 'runners'}
+        self._simulated: Dict[Tuple[str, str], Tuple[float, float]] = {}
+
+        self.stats = {"lookups": 0, "lookup_hits": 0, "book_requests": 0, "markets_fetched": 0}
+
+    # ------------------------------------------------------------------
+    # Market discovery
+    # ------------------------------------------------------------------
+
+    def resolve(self, horse: str, course: str, race_time: str) -> Optional[tuple]:
+        """Find (market_id, selection_id), reusing earlier lookups from any strategy."""
+        key = (horse, course, race_time)
+        if key in self._markets and self._markets[key]:
+            self.stats["lookup_hits"] += 1
+            return self._markets[key]
+
+        self.stats["lookups"] += 1
+        market_info = self.betfair.find_market(horse, course, race_time)
+        self._markets[key] = market_info
+        return market_info
+
+    def seed(self, horse: str, course: str, race_time: str, market_info: tuple):
+        """Prime the lookup cache (e.g. from a persisted state store)."""
+        self._markets[(horse, course, race_time)] = tuple(market_info)
+
+    # ------------------------------------------------------------------
+    # Prices
+    # ------------------------------------------------------------------
+
+    def refresh(self, market_ids: Iterable[str]):
+        """Fetch all stale markets in as few list_market_book calls as possible."""
+        client = getattr(self.betfair, "client", None)
+        if client is None or price_projection is None:
+            return
+
+        now = time.monotonic()
+        stale = sorted({
+            m for m in market_ids
+            if m and (m not in self._books or now - self._books[m]["fetched"] > self.max_age)
+        })
+
+        proj = price_projection(price_data=["EX_BEST_OFFERS"])
+        for i in range(0, len(stale), MAX_MARKETS_PER_REQUEST):
+            batch = stale[i:i + MAX_MARKETS_PER_REQUEST]
+            try:
+                books = GOVERNOR.call(
+                    "listMarketBook",
+                    lambda: client.betting.list_market_book(batch, proj),
+                    weight=book_weight(len(batch)),
+                    key=("listMarketBook",) + tuple(batch)
+                )
+            except Exception as e:
+                print(f"⚠️  Price refresh failed ({len(batch)} markets): {e}")
+                continue
+
+            self.stats["book_requests"] += 1
+            self.stats["markets_fetched"] += len(batch)
+            fetched = time.monotonic()
+
+            for book in books or []:
+                if self.ticks:
+                    self.ticks.record_book(book)
+                runners = {}
+                for runner in book.runners:
+                    ex = runner.ex
+                    back = ex.available_to_back[0] if ex and ex.available_to_back else None
+                    lay = ex.available_to_lay[0] if ex and ex.available_to_lay else None
+                    runners[str(runner.selection_id)] = (
+                        back.price if back else None, back.size if back else None,
+                        lay.price if lay else None, lay.size if lay else None,
+                    )
+                self._books[book.market_id] = {
+                    "fetched": fetched,
+                    "total_matched": book.total_matched or 0.0,
+                    "runners": runners,
+                }
+
+    def quote(self, market_id: str, selection_id: str) -> Optional[tuple]:
+        """(back, back_size, lay, lay_size) for a runner from the cache."""
+        if getattr(self.betfair, "client", None) is None:
+            return self._simulated_quote(market_id, selection_id)
+
+        book = self._books.get(market_id)
+        if not book:
+            return None
+        return book["runners"].get(str(selection_id))
+
+    def back_price(self, market_id: str, selection_id: str,
+                   min_liquidity: float = 0.0) -> Optional[float]:
+        """Best available back price, or None if missing or the market is too thin."""
+        if getattr(self.betfair, "client", None) is not None:
+            book = self._books.get(market_id)
+            if not book or book["total_matched"] < min_liquidity:
+                return None
+
+        quote = self.quote(market_id, selection_id)
+        return quote[0] if quote else None
+
+    def total_matched(self, market_id: str) -> float:
+        book = self._books.get(market_id)
+        return book["total_matched"] if book else 0.0
+
+    def _simulated_quote(self, market_id: str, selection_id: str) -> Optional[tuple]:
+        """Dry run without a connection: one simulated price per runner per tick."""
+        key = (market_id, str(selection_id))
+        now = time.monotonic()
+        cached = self._simulated.get(key)
+        if cached and now - cached[1] <= self.max_age:
+            odds = cached[0]
+        else:
+            odds = self.betfair.get_odds(market_id, selection_id)
+            if odds is None:
+                return None
+            self._simulated[key] = (odds, now)
+        return (odds, None, None, None)
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Betfair Request Governor
+========================
+Every Betfair API call from the bots goes through one governor that:
+
+- Accounts for data-request weight (Betfair rejects any request > 200 points)
+- Applies a token bucket per endpoint (requests/sec) plus a shared weight bucket
+- Coalesces duplicate in-flight requests (same key -> one API call, shared result)
+- Backs off and retries when Betfair reports throttling
+- Keeps counters: calls, weight, throttles, errors, coalesced, latency histogram
+
+Usage:
+    from utilities.request_governor import GOVERNOR, book_weight
+
+    books = GOVERNOR.call(
+        "listMarketBook",
+        lambda: client.betting.list_market_book([market_id], proj),
+        weight=book_weight(1),
+        key=("listMarketBook", market_id),
+    )
+    print(GOVERNOR.report())
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+# ============================================================================
+# BETFAIR LIMITS
+# ============================================================================
+
+MAX_REQUEST_WEIGHT = 200
+
+# Weight per market by price projection (Betfair market data request limits)
+PRICE_DATA_WEIGHTS = {
+    None: 2,                 # No price data requested
+    "SP_AVAILABLE": 3,
+    "SP_TRADED": 7,
+    "EX_BEST_OFFERS": 5,
+    "EX_ALL_OFFERS": 17,
+    "EX_TRADED": 17,
+}
+
+# Weight per market by catalogue projection
+CATALOGUE_WEIGHTS = {
+    "COMPETITION": 0,
+    "EVENT": 0,
+    "EVENT_TYPE": 0,
+    "MARKET_START_TIME": 0,
+    "MARKET_DESCRIPTION": 1,
+    "RUNNER_DESCRIPTION": 0,
+    "RUNNER_METADATA": 1,
+}
+
+# Requests/sec and burst per endpoint
+ENDPOINT_LIMITS = {
+    "listMarketCatalogue": (5.0, 10),
+    "listMarketBook": (10.0, 20),
+    "placeOrders": (5.0, 5),
+    "cancelOrders": (5.0, 5),
+    "listCurrentOrders": (2.0, 4),
+    "default": (5.0, 10),
+}
+
+# Shared weight budget (points/sec, burst)
+WEIGHT_RATE = (400.0, MAX_REQUEST_WEIGHT * 2)
+
+# Betfair error codes that mean "slow down"
+THROTTLE_CODES = ("TOO_MUCH_DATA", "TOO_MANY_REQUESTS", "TEMPORARY_BAN_TOO_MANY_REQUESTS",
+                  "EXCEEDED_THROTTLE")
+
+# Latency histogram bucket upper bounds (ms)
+LATENCY_BUCKETS_MS = (25, 50, 100, 200, 400, 800, 1600, 3200)
+
+
+def book_weight(n_markets: int, price_data: Sequence[str] = ("EX_BEST_OFFERS",)) -> int:
+    """Weight of a listMarketBook request (the most expensive projection counts)."""
+    per_market = max((PRICE_DATA_WEIGHTS.get(p, 17) for p in price_data), default=PRICE_DATA_WEIGHTS[None])
+    return per_market * n_markets
+
+
+def catalogue_weight(n_markets: int, projection: Sequence[str] = ()) -> int:
+    """Weight of a listMarketCatalogue request."""
+    per_market = sum(CATALOGUE_WEIGHTS.get(p, 1) for p in projection)
+    return per_market * n_markets
+
+
+def max_markets_per_request(per_market_weight: int) -> int:
+    """How many markets fit under the 200-point request limit."""
+    return max(1, MAX_REQUEST_WEIGHT // max(1, per_market_weight))
+
+
+# ============================================================================
+# TOKEN BUCKET
+# ============================================================================
+
+class TokenBucket:
+    """Thread-safe token bucket."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, sleeping until they are available.
+
+        Returns:
+            Seconds spent waiting (0 if not throttled)
+        """
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+# ============================================================================
+# GOVERNOR
+# ============================================================================
+
+class _InFlight:
+    """A request other callers can wait on instead of repeating it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class RequestGovernor:
+    """Central rate limiter, coalescer and metrics for Betfair API calls."""
+
+    def __init__(self, limits: Dict[str, tuple] = None, weight_rate: tuple = WEIGHT_RATE,
+                 max_retries: int = 3, backoff: float = 1.0):
+        """
+        Args:
+            limits: {endpoint: (requests_per_sec, burst)} (default ENDPOINT_LIMITS)
+            weight_rate: (points_per_sec, burst) shared across endpoints
+            max_retries: Retries after a throttling error
+            backoff: First retry delay in seconds (doubles each retry)
+        """
+        self.limits = dict(limits or ENDPOINT_LIMITS)
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._weight_bucket = TokenBucket(*weight_rate)
+        self._inflight: Dict[Hashable, _InFlight] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def call(self, endpoint: str, fn: Callable[[], Any], weight: int = 0,
+             key: Optional[Hashable] = None) -> Any:
+        """
+        Run an API call under the governor.
+
+        Args:
+            endpoint: Betfair operation name (e.g. 'listMarketBook')
+            fn: Zero-argument callable making the request
+            weight: Data-request weight of the call
+            key: Coalescing key - concurrent calls with the same key share one request
+
+        Returns:
+            Whatever fn returns (exceptions propagate to every coalesced caller)
+        """
+        if weight > MAX_REQUEST_WEIGHT:
+            raise ValueError(f"{endpoint} weight {weight} exceeds {MAX_REQUEST_WEIGHT} - split the request")
+
+        if key is None:
+            return self._execute(endpoint, fn, weight)
+
+        with self._lock:
+            pending = self._inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._inflight[key] = _InFlight()
+
+        if not owner:
+            self._bump(endpoint, "coalesced")
+            pending.done.wait()
+            if pending.error:
+                raise pending.error
+            return pending.result
+
+        try:
+            pending.result = self._execute(endpoint, fn, weight)
+            return pending.result
+        except BaseException as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            pending.done.set()
+
+    def _execute(self, endpoint: str, fn: Callable[[], Any], weight: int) -> Any:
+        bucket = self._bucket(endpoint)
+        delay = self.backoff
+
+        for attempt in range(self.max_retries + 1):
+            waited = bucket.acquire()
+            if weight:
+                waited += self._weight_bucket.acquire(weight)
+            if waited > 0:
+                self._bump(endpoint, "throttled_local")
+
+            start = time.perf_counter()
+            try:
+                result = fn()
+            except Exception as e:
+                self._record(endpoint, weight, time.perf_counter() - start, error=True)
+                if attempt < self.max_retries and _is_throttle(e):
+                    self._bump(endpoint, "throttled_remote")
+                    time.sleep(delay)
+                    delay *= 2
+                    continue
+                raise
+
+            self._record(endpoint, weight, time.perf_counter() - start)
+            return result
+
+    def _bucket(self, endpoint: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(endpoint)
+            if bucket is None:
+                rate, burst = self.limits.get(endpoint, self.limits["default"])
+                bucket = self._buckets[endpoint] = TokenBucket(rate, burst)
+            return bucket
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def _endpoint_stats(self, endpoint: str) -> Dict[str, Any]:
+        stats = self._stats.get(endpoint)
+        if stats is None:
+            stats = self._stats[endpoint] = {
+                "calls": 0, "weight": 0, "errors": 0, "coalesced": 0,
+                "throttled_local": 0, "throttled_remote": 0,
+                "latency_ms_total": 0.0,
+                "latency_hist": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+            }
+        return stats
+
+    def _bump(self, endpoint: str, counter: str):
+        with self._lock:
+            self._endpoint_stats(endpoint)[counter] += 1
+
+    def _record(self, endpoint: str, weight: int, seconds: float, error: bool = False):
+        ms = seconds * 1000
+        with self._lock:
+            stats = self._endpoint_stats(endpoint)
+            stats["calls"] += 1
+            stats["weight"] += weight
+            stats["latency_ms_total"] += ms
+            stats["latency_hist"][bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+            if error:
+                stats["errors"] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of per-endpoint counters."""
+        with self._lock:
+            return {ep: {k: (list(v) if isinstance(v, list) else v) for k, v in s.items()}
+                    for ep, s in self._stats.items()}
+
+    def report(self) -> str:
+        """Human-readable summary for end-of-session logs."""
+        lines = []
+        for endpoint, s in sorted(self.stats().items()):
+            avg = s["latency_ms_total"] / s["calls"] if s["calls"] else 0.0
+            lines.append(
+                f"{endpoint}: {s['calls']} calls, weight {s['weight']}, "
+                f"{s['coalesced']} coalesced, {s['throttled_local']} waited, "
+                f"{s['throttled_remote']} throttled, {s['errors']} errors, "
+                f"avg {avg:.0f}ms, p95 ≤{_percentile_bound(s['latency_hist'], 0.95)}"
+            )
+        return "\n".join(lines) if lines else "No Betfair requests made"
+
+
+def _percentile_bound(hist: List[int], q: float) -> str:
+    """Upper bucket bound containing the q-th latency percentile."""
+    total = sum(hist)
+    if not total:
+        return "0ms"
+    running = 0
+    for i, count in enumerate(hist):
+        running += count
+        if running >= q * total:
+            return f"{LATENCY_BUCKETS_MS[i]}ms" if i < len(LATENCY_BUCKETS_MS) else f">{LATENCY_BUCKETS_MS[-1]}ms"
+    return f">{LATENCY_BUCKETS_MS[-1]}ms"
+
+
+def _is_throttle(error: Exception) -> bool:
+    text = str(error)
+    return any(code in text for code in THROTTLE_CODES)
+
+
+# Process-wide governor shared by every Betfair wrapper
+GOVERNOR = RequestGovernor()
@@ -14,19 +14,41 @@ Or import and use programmatically:
     from results_checker import check_results_for_date
 """
 
+import os
 import sys
-import csv
 import time
+import bisect
+import threading
 import requests
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 import re
 
+try:
+    from utilities.log_writer import load_action_rows, open_results_sidecar, record_result
+except ImportError:  # Run directly from utilities/
+    from log_writer import load_action_rows, open_results_sidecar, record_result
+
+# Shared risk ledger (live bots with RISK_LEDGER_PATH set) - settled bets release their exposure
+try:
+    from giddyup.risk import RiskLedger
+except ImportError:
+    RiskLedger = None
+
 
 # API endpoint
 RESULTS_API = "https://www.sportinglife.com/api/horse-racing/v2/fast-results?countryGroups=UK,IRE"
 
+# Every caller shares one download per interval
+RESULTS_CACHE_TTL = 60  # seconds
+
+# A race matches if its off time is within this many minutes (clock changes, late offs)
+TIME_TOLERANCE = 60
+
+# Words dropped from course names when building aliases ("Kempton Park (AW)" -> "kempton")
+COURSE_NOISE = re.compile(r'\s*\((aw|ire|gb)\)|\b(park|racecourse|races)\b')
+
 
 def normalize_horse_name(name: str) -> str:
     """Normalize horse name for matching."""
@@ -43,30 +65,243 @@ def normalize_course_name(name: str) -> str:
     return name.lower().strip()
 
 
+def _alias(name: str) -> str:
+    """Punctuation-free key for fuzzy matching ("o'reilly's" -> "oreillys")."""
+    return re.sub(r'[^a-z0-9]', '', name)
+
+
+def _minutes(hhmm: str) -> Optional[int]:
+    try:
+        h, m = map(int, hhmm.split(':'))
+        return h * 60 + m
+    except (ValueError, AttributeError):
+        return None
+
+
+class ResultsIndex:
+    """
+    Prebuilt lookup over one list of race results.
+    
+        course alias -> off times (sorted minutes) -> runner name -> position
+    
+    Course and horse names are resolved through alias tables built once per
+    index: exact and punctuation-free names are direct dict hits, and anything
+    that needs substring matching is resolved once and memoized. Off times are
+    found by bisection, so each lookup is O(log races at the course).
+    """
+    
+    def __init__(self, race_results: List[Dict]):
+        self._courses: Dict[str, Tuple[List[int], List[Dict]]] = {}
+        self._course_alias: Dict[str, Optional[str]] = {}
+        self._runners: Dict[int, Dict[str, int]] = {}
+        
+        grouped: Dict[str, List[Tuple[int, Dict]]] = {}
+        for race in race_results:
+            course = normalize_course_name(race.get('courseName', ''))
+            off = _minutes(race.get('time', ''))
+            if not course or off is None:
+                continue
+            grouped.setdefault(course, []).append((off, race))
+            
+            runners = {}
+            for horse in race.get('top_horses', []):
+                name = normalize_horse_name(horse.get('horse_name', ''))
+                position = horse.get('position', 999)
+                runners.setdefault(name, position)
+                runners.setdefault(_alias(name), position)
+            self._runners[id(race)] = runners
+        
+        for course, entries in grouped.items():
+            entries.sort(key=lambda e: e[0])
+            self._courses[course] = ([e[0] for e in entries], [e[1] for e in entries])
+            for alias in (course, _alias(course), _alias(COURSE_NOISE.sub('', course))):
+                if alias:
+                    self._course_alias.setdefault(alias, course)
+    
+    def _resolve_course(self, course_norm: str) -> Optional[str]:
+        for key in (course_norm, _alias(course_norm), _alias(COURSE_NOISE.sub('', course_norm))):
+            if key in self._course_alias:
+                return self._course_alias[key]
+        
+        # Substring match (either way round), resolved once per name
+        found = next((c for c in self._courses if course_norm in c or c in course_norm), None)
+        self._course_alias[course_norm] = found
+        return found
+    
+    def _candidates(self, course: str, race_time: str) -> List[Dict]:
+        """Races at a course within TIME_TOLERANCE, nearest first."""
+        offs, races = self._courses[course]
+        target = _minutes(race_time)
+        if target is None:
+            return []
+        
+        lo = bisect.bisect_left(offs, target - TIME_TOLERANCE)
+        hi = bisect.bisect_right(offs, target + TIME_TOLERANCE)
+        return [races[i] for i in sorted(range(lo, hi), key=lambda i: abs(offs[i] - target))]
+    
+    def _position(self, race: Dict, horse_norm: str) -> Optional[int]:
+        runners = self._runners.get(id(race), {})
+        for key in (horse_norm, _alias(horse_norm)):
+            if key in runners:
+                return runners[key]
+        
+        # Substring match, remembered for next time
+        for name, position in list(runners.items()):
+            if horse_norm in name or name in horse_norm:
+                runners[horse_norm] = position
+                return position
+        return None
+    
+    def position(self, horse_name: str, course_name: str, race_time: str) -> Tuple[bool, Optional[int]]:
+        """
+        (race_found, position) - position is None if the horse isn't in the
+        placed runners. race_found is False until a result is published.
+        """
+        course = self._resolve_course(normalize_course_name(course_name))
+        if course is None:
+            return False, None
+        
+        horse_norm = normalize_horse_name(horse_name)
+        for race in self._candidates(course, race_time):
+            if race.get('status') not in ['RESULT', 'WEIGHEDIN']:
+                continue
+            return True, self._position(race, horse_norm)
+        return False, None
+    
+    def result(self, horse_name: str, course_name: str, race_time: str) -> Optional[str]:
+        """"WIN", "LOSS", or None if the result isn't available."""
+        found, position = self.position(horse_name, course_name, race_time)
+        if not found:
+            return None
+        return "WIN" if position == 1 else "LOSS"
+
+
+_LAST_INDEX: Tuple[Optional[List[Dict]], Optional[ResultsIndex]] = (None, None)
+
+
+def results_index(race_results: List[Dict]) -> ResultsIndex:
+    """Index for a results list, reused while callers pass the same list."""
+    global _LAST_INDEX
+    cached_list, cached_index = _LAST_INDEX
+    if cached_list is race_results and cached_index is not None:
+        return cached_index
+    index = ResultsIndex(race_results)
+    _LAST_INDEX = (race_results, index)
+    return index
+
+
+class ResultsCache:
+    """
+    One shared copy of the results feed, refreshed at most once per interval.
+    
+    - Conditional requests (If-None-Match / If-Modified-Since): an unchanged
+      feed costs a 304 and no parsing.
+    - Each date's races get a ResultsIndex (course -> off time -> runner).
+    - If a refresh fails the last good copy keeps being served.
+    
+    Usage:
+        cache = ResultsCache()
+        races = cache.races("2025-10-18")
+        result = cache.lookup("2025-10-18", "Frankel", "Newmarket", "14:30")
+    """
+    
+    def __init__(self, url: str = RESULTS_API, ttl: float = RESULTS_CACHE_TTL,
+                 timeout: float = 10, session: Optional[requests.Session] = None):
+        """
+        Args:
+            url: Results feed URL
+            ttl: Minimum seconds between requests
+            timeout: HTTP timeout
+            session: requests session (default: a new one, reused for keep-alive)
+        """
+        self.url = url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        
+        self._lock = threading.Lock()
+        self._fetched_at = 0.0
+        self._etag = None
+        self._last_modified = None
+        self._by_date: Dict[str, List[Dict]] = {}
+        self._indexes: Dict[str, ResultsIndex] = {}
+        
+        self.stats = {"requests": 0, "not_modified": 0, "errors": 0, "lookups": 0}
+    
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Re-download the feed if the interval has passed.
+        
+        Returns:
+            True if new data was loaded
+        """
+        with self._lock:
+            if not force and time.monotonic() - self._fetched_at < self.ttl:
+                return False
+            self._fetched_at = time.monotonic()
+            
+            headers = {}
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+            
+            self.stats["requests"] += 1
+            try:
+                response = self.session.get(self.url, headers=headers, timeout=self.timeout)
+                if response.status_code == 304:
+                    self.stats["not_modified"] += 1
+                    return False
+                response.raise_for_status()
+                results = response.json()
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"❌ Error fetching results: {e}")
+                return False
+            
+            self._etag = response.headers.get("ETag")
+            self._last_modified = response.headers.get("Last-Modified")
+            self._build_index(results)
+            return True
+    
+    def _build_index(self, results: List[Dict]):
+        by_date: Dict[str, List[Dict]] = {}
+        for race in results:
+            by_date.setdefault(race.get('date'), []).append(race)
+        
+        self._by_date = by_date
+        self._indexes = {date: ResultsIndex(races) for date, races in by_date.items()}
+    
+    def races(self, date: str) -> List[Dict]:
+        """All races on a date (refreshing first if due)."""
+        self.refresh()
+        return self._by_date.get(date, [])
+    
+    def lookup(self, date: str, horse_name: str, course_name: str, race_time: str) -> Optional[str]:
+        """"WIN" / "LOSS" for a horse, or None if the result isn't in yet."""
+        self.stats["lookups"] += 1
+        self.refresh()
+        index = self._indexes.get(date)
+        return index.result(horse_name, course_name, race_time) if index else None
+
+
+RESULTS_CACHE = ResultsCache()
+
+
 def fetch_results(date: str) -> List[Dict]:
     """
     Fetch race results from Sporting Life API.
     
+    Served from the shared RESULTS_CACHE - at most one request per
+    RESULTS_CACHE_TTL seconds, however many callers ask.
+    
     Args:
         date: Date in YYYY-MM-DD format
         
     Returns:
         List of race result dictionaries
     """
-    try:
-        response = requests.get(RESULTS_API, timeout=10)
-        response.raise_for_status()
-        
-        results = response.json()
-        
-        # Filter for specific date
-        date_results = [r for r in results if r.get('date') == date]
-        
-        return date_results
-        
-    except Exception as e:
-        print(f"❌ Error fetching results: {e}")
-        return []
+    return RESULTS_CACHE.races(date)
 
 
 def check_horse_position(horse_name: str, course_name: str, race_time: str, 
@@ -74,6 +309,9 @@ def check_horse_position(horse_name: str, course_name: str, race_time: str,
     """
     Check if a horse won, placed, or lost.
     
+    Uses a ResultsIndex built once per results list, so grading many bets
+    against the same results costs one index build plus O(log n) per bet.
+    
     Args:
         horse_name: Name of horse to check
         course_name: Course name
@@ -81,62 +319,9 @@ def check_horse_position(horse_name: str, course_name: str, race_time: str,
         race_results: List of race results from API
         
     Returns:
-        "WIN", "PLACE", "LOSS", or None if not found
+        "WIN" or "LOSS" (placed is a loss for a win bet), or None if not found
     """
-    horse_norm = normalize_horse_name(horse_name)
-    course_norm = normalize_course_name(course_name)
-    
-    # Find matching race
-    for race in race_results:
-        race_course = normalize_course_name(race.get('courseName', ''))
-        race_time_api = race.get('time', '')
-        
-        # Match course and time
-        if course_norm in race_course or race_course in course_norm:
-            # Time might be off by 1 hour or have slight differences
-            if race_time_api == race_time or \
-               abs_time_diff(race_time, race_time_api) <= 60:
-                
-                # Check if results are available (RESULT or WEIGHEDIN)
-                if race.get('status') not in ['RESULT', 'WEIGHEDIN']:
-                    continue
-                
-                # Check top horses for our horse
-                top_horses = race.get('top_horses', [])
-                
-                for horse in top_horses:
-                    horse_name_api = normalize_horse_name(horse.get('horse_name', ''))
-                    position = horse.get('position', 999)
-                    
-                    if horse_norm == horse_name_api or \
-                       horse_norm in horse_name_api or \
-                       horse_name_api in horse_norm:
-                        
-                        if position == 1:
-                            return "WIN"
-                        elif position <= 3:  # Placed (but we only care about WIN for betting)
-                            return "LOSS"  # Not a win = loss for us
-                        else:
-                            return "LOSS"
-                
-                # If we got here, horse ran but not in top positions
-                return "LOSS"
-    
-    return None  # Race not found or results not available yet
-
-
-def abs_time_diff(time1: str, time2: str) -> int:
-    """Calculate absolute difference in minutes between two HH:MM times."""
-    try:
-        h1, m1 = map(int, time1.split(':'))
-        h2, m2 = map(int, time2.split(':'))
-        
-        mins1 = h1 * 60 + m1
-        mins2 = h2 * 60 + m2
-        
-        return abs(mins1 - mins2)
-    except:
-        return 999
+    return results_index(race_results).result(horse_name, course_name, race_time)
 
 
 def calculate_pnl(result: str, odds: float, stake: float) -> float:
@@ -151,36 +336,6 @@ def calculate_pnl(result: str, odds: float, stake: float) -> float:
         return round(-stake, 2)
 
 
-def update_csv_with_results(csv_file: Path, results_data: List[Tuple[str, str, str, float]]):
-    """
-    Update CSV file with results.
-    
-    Args:
-        csv_file: Path to CSV file
-        results_data: List of (horse, result, pnl_str, pnl_float) tuples
-    """
-    # Read all rows
-    rows = []
-    with csv_file.open('r') as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames
-        for row in reader:
-            rows.append(row)
-    
-    # Update rows with results
-    for horse, result, pnl_str, pnl_float in results_data:
-        for row in rows:
-            if normalize_horse_name(row['horse']) == normalize_horse_name(horse):
-                row['result'] = result
-                row['pnl_gbp'] = pnl_str
-    
-    # Write back
-    with csv_file.open('w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
-
-
 def check_results_for_date(date: str, send_notifications: bool = True) -> Dict:
     """
     Check results for all bets on a specific date.
@@ -216,6 +371,7 @@ def check_results_for_date(date: str, send_notifications: bool = True) -> Dict:
     
     # Read bets from CSV
     results_to_update = []
+    settled = []  # (row, pnl) of graded live bets, for the risk ledger
     wins = 0
     losses = 0
     pending = 0
@@ -237,109 +393,126 @@ def check_results_for_date(date: str, send_notifications: bool = True) -> Dict:
     except:
         STREAM_MODE_AVAILABLE = False
     
-    with actions_csv.open('r') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    # Read bets (with results already in the results sidecar)
+    rows = load_action_rows(actions_csv)
+    
+    for row in rows:
+        # Only check bets that were actually placed
+        if row.get('bet_placed') not in ['DRY_RUN', 'EXECUTED', 'YES']:
+            continue
         
-        for row in rows:
-            # Only check bets that were actually placed
-            if row.get('bet_placed') not in ['DRY_RUN', 'EXECUTED', 'YES']:
-                continue
+        # Skip if already has result
+        if row.get('result') in ['WIN', 'LOSS']:
+            result = row['result']
+            pnl = float(row.get('pnl_gbp', 0))
+            if row.get('bet_placed') == 'EXECUTED':
+                settled.append((row, pnl))
             
-            # Skip if already has result
-            if row.get('result') in ['WIN', 'LOSS']:
-                result = row['result']
-                pnl = float(row.get('pnl_gbp', 0))
-                
-                if result == 'WIN':
-                    wins += 1
-                    total_pnl += pnl
-                else:
-                    losses += 1
-                    total_pnl += pnl
-                
-                continue
+            if result == 'WIN':
+                wins += 1
+                total_pnl += pnl
+            else:
+                losses += 1
+                total_pnl += pnl
             
-            # Check result
-            horse = row['horse']
-            course = row['course']
-            race_time = row['race_time']
+            continue
+        
+        # Check result
+        horse = row['horse']
+        course = row['course']
+        race_time = row['race_time']
+        
+        result = check_horse_position(horse, course, race_time, race_results)
+        
+        if result:
+            # Calculate P&L
+            odds = float(row.get('actual_odds', row.get('expected_odds', 0)))
+            stake = float(row.get('stake', 0))
+            pnl = calculate_pnl(result, odds, stake)
             
-            result = check_horse_position(horse, course, race_time, race_results)
+            # Update tracking
+            if result == "WIN":
+                wins += 1
+                emoji = "🎉"
+                color = Colors.BRIGHT_GREEN if STREAM_MODE_AVAILABLE else ""
+                reset = Colors.RESET if STREAM_MODE_AVAILABLE else ""
+            else:
+                losses += 1
+                emoji = "😔"
+                color = Colors.BRIGHT_RED if STREAM_MODE_AVAILABLE else ""
+                reset = Colors.RESET if STREAM_MODE_AVAILABLE else ""
             
-            if result:
-                # Calculate P&L
-                odds = float(row.get('actual_odds', row.get('expected_odds', 0)))
-                stake = float(row.get('stake', 0))
-                pnl = calculate_pnl(result, odds, stake)
-                
-                # Update tracking
+            total_pnl += pnl
+            
+            # Print result
+            print(f"{color}{emoji} {result}: {horse} @ {course} ({race_time})")
+            print(f"   P&L: £{pnl:+.2f}{reset}")
+            print("")
+            
+            # Stream mode announcement
+            if STREAM_MODE_AVAILABLE:
                 if result == "WIN":
-                    wins += 1
-                    emoji = "🎉"
-                    color = Colors.BRIGHT_GREEN if STREAM_MODE_AVAILABLE else ""
-                    reset = Colors.RESET if STREAM_MODE_AVAILABLE else ""
+                    print(win_announcement(horse, course, pnl))
                 else:
-                    losses += 1
-                    emoji = "😔"
-                    color = Colors.BRIGHT_RED if STREAM_MODE_AVAILABLE else ""
-                    reset = Colors.RESET if STREAM_MODE_AVAILABLE else ""
-                
-                total_pnl += pnl
-                
-                # Print result
-                print(f"{color}{emoji} {result}: {horse} @ {course} ({race_time})")
-                print(f"   P&L: £{pnl:+.2f}{reset}")
-                print("")
-                
-                # Stream mode announcement
-                if STREAM_MODE_AVAILABLE:
-                    if result == "WIN":
-                        print(win_announcement(horse, course, pnl))
-                    else:
-                        print(loss_announcement(horse, course, pnl))
-                
-                # Store for CSV update
-                results_to_update.append((horse, result, str(pnl), pnl))
+                    print(loss_announcement(horse, course, pnl))
+            
+            # Store for results log
+            results_to_update.append((row, result, pnl))
+            if row.get('bet_placed') == 'EXECUTED':
+                settled.append((row, pnl))
+            
+            # Send notifications
+            if send_notifications:
+                if TELEGRAM_ENABLED:
+                    try:
+                        telegram_result(
+                            horse=horse,
+                            course=course,
+                            race_time=race_time,
+                            result=result,
+                            odds=odds,
+                            stake=stake,
+                            pnl=pnl,
+                            strategy=row.get('strategy', 'Unknown')
+                        )
+                    except Exception as e:
+                        print(f"Telegram error: {e}")
                 
-                # Send notifications
-                if send_notifications:
-                    if TELEGRAM_ENABLED:
-                        try:
-                            telegram_result(
-                                horse=horse,
-                                course=course,
-                                race_time=race_time,
-                                result=result,
-                                odds=odds,
-                                stake=stake,
-                                pnl=pnl,
-                                strategy=row.get('strategy', 'Unknown')
-                            )
-                        except Exception as e:
-                            print(f"Telegram error: {e}")
-                    
-                    if TWITCH_ENABLED:
-                        try:
-                            if result == "WIN":
-                                send_win(horse, course, pnl)
-                            else:
-                                send_loss(horse, course, pnl)
-                        except Exception as e:
-                            print(f"Twitch error: {e}")
-            else:
-                pending += 1
-                print(f"⏳ PENDING: {horse} @ {course} ({race_time})")
-                print(f"   Race not found or results not available yet")
-                print("")
+                if TWITCH_ENABLED:
+                    try:
+                        if result == "WIN":
+                            send_win(horse, course, pnl)
+                        else:
+                            send_loss(horse, course, pnl)
+                    except Exception as e:
+                        print(f"Twitch error: {e}")
+        else:
+            pending += 1
+            print(f"⏳ PENDING: {horse} @ {course} ({race_time})")
+            print(f"   Race not found or results not available yet")
+            print("")
     
-    # Update CSV file
+    # Append to results sidecar (the action log itself is never rewritten)
     if results_to_update:
-        print(f"💾 Updating CSV with {len(results_to_update)} result(s)...")
-        update_csv_with_results(actions_csv, results_to_update)
-        print("✅ CSV updated")
+        print(f"💾 Recording {len(results_to_update)} result(s)...")
+        with open_results_sidecar(actions_csv) as results_log:
+            for row, result, pnl in results_to_update:
+                record_result(results_log, row, result, pnl, telegram_posted=send_notifications)
+        print("✅ Results log updated")
         print("")
     
+    # Close settled live bets in the risk ledger (no-op for bets already settled by the bot)
+    ledger_path = os.getenv("RISK_LEDGER_PATH")
+    if settled and ledger_path and RiskLedger is not None:
+        with RiskLedger(ledger_path, date) as ledger:
+            closed = sum(
+                ledger.record_settlement(f"{date}:{row['race_time']}_{row['horse']}", pnl)
+                for row, pnl in settled
+            )
+        if closed:
+            print(f"🛡️  Settled {closed} bet(s) in the risk ledger")
+            print("")
+    
     # Summary
     print("=" * 80)
     print(f"📊 RESULTS SUMMARY FOR {date}")
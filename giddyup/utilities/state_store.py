@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Persistent Bot State Store
+==========================
+Embedded SQLite file recording what the bot has already resolved and decided,
+so a restarted bot resumes without re-running market discovery or risking a
+double bet.
+
+Recorded as they happen:
+    - Resolved Betfair market/selection IDs per selection
+    - Betting decisions (placed, skipped, failed) and bet IDs
+    - Races whose results have been checked
+
+Usage:
+    from utilities.state_store import BotStateStore
+
+    state = BotStateStore(LOG_DIR / "bot_state.sqlite3", "2025-10-20", "HorseBot")
+    resumed = state.load()                       # Sub-second on restart
+    market_cache = resumed.markets
+    state.record_market(key, market_id, sel_id)
+    state.record_decision(key, "PLACED", bet_id="1.234")
+"""
+
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS markets (
+    date TEXT NOT NULL,
+    bot_type TEXT NOT NULL,
+    key TEXT NOT NULL,
+    market_id TEXT NOT NULL,
+    selection_id TEXT NOT NULL,
+    resolved_at TEXT NOT NULL,
+    PRIMARY KEY (date, bot_type, key)
+);
+
+CREATE TABLE IF NOT EXISTS decisions (
+    date TEXT NOT NULL,
+    bot_type TEXT NOT NULL,
+    key TEXT NOT NULL,
+    decision TEXT NOT NULL,        -- PENDING, PLACED, SKIPPED, FAILED, LAID, ...
+    bet_id TEXT,
+    odds REAL,
+    stake REAL,
+    reason TEXT,
+    decided_at TEXT NOT NULL,
+    PRIMARY KEY (date, bot_type, key)
+);
+
+CREATE TABLE IF NOT EXISTS results_checked (
+    date TEXT NOT NULL,
+    bot_type TEXT NOT NULL,
+    key TEXT NOT NULL,
+    checked_at TEXT NOT NULL,
+    PRIMARY KEY (date, bot_type, key)
+);
+"""
+
+
+@dataclass
+class BotState:
+    """State restored for one bot/date."""
+
+    markets: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+    decisions: Dict[str, dict] = field(default_factory=dict)
+    results_checked: Set[str] = field(default_factory=set)
+
+    @property
+    def decided(self) -> Set[str]:
+        """Keys with any decision (including PENDING - never re-bet those)."""
+        return set(self.decisions)
+
+    @property
+    def pending(self) -> Set[str]:
+        """Keys where a bet was being placed when the bot stopped."""
+        return {k for k, d in self.decisions.items() if d["decision"] == "PENDING"}
+
+
+class BotStateStore:
+    """SQLite-backed state for a single bot session (one date, one bot type)."""
+
+    def __init__(self, path: Path, date: str, bot_type: str = "HorseBot"):
+        """
+        Open (or create) the state file.
+
+        Args:
+            path: SQLite file path (shared by all dates and bot types)
+            date: Session date (YYYY-MM-DD)
+            bot_type: 'HorseBot', 'BackLayBot', etc.
+        """
+        self.path = Path(path)
+        self.date = date
+        self.bot_type = bot_type
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        # WAL keeps writes cheap and lets other processes read while we write
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def load(self) -> BotState:
+        """Load everything recorded for this date/bot (single indexed scan per table)."""
+        state = BotState()
+        params = (self.date, self.bot_type)
+
+        with self._lock:
+            for key, market_id, selection_id in self._conn.execute(
+                "SELECT key, market_id, selection_id FROM markets WHERE date = ? AND bot_type = ?",
+                params
+            ):
+                state.markets[key] = (market_id, selection_id)
+
+            for key, decision, bet_id, odds, stake, reason in self._conn.execute(
+                "SELECT key, decision, bet_id, odds, stake, reason FROM decisions "
+                "WHERE date = ? AND bot_type = ?",
+                params
+            ):
+                state.decisions[key] = {
+                    "decision": decision, "bet_id": bet_id, "odds": odds,
+                    "stake": stake, "reason": reason,
+                }
+
+            for (key,) in self._conn.execute(
+                "SELECT key FROM results_checked WHERE date = ? AND bot_type = ?",
+                params
+            ):
+                state.results_checked.add(key)
+
+        return state
+
+    def record_market(self, key: str, market_id: str, selection_id: str):
+        """Record a resolved market/selection ID."""
+        self._write(
+            "INSERT OR REPLACE INTO markets VALUES (?, ?, ?, ?, ?, ?)",
+            (self.date, self.bot_type, key, str(market_id), str(selection_id), _now())
+        )
+
+    def record_decision(self, key: str, decision: str, bet_id: Optional[str] = None,
+                        odds: Optional[float] = None, stake: Optional[float] = None,
+                        reason: Optional[str] = None):
+        """
+        Record (or update) the decision for a selection.
+
+        Record 'PENDING' before sending an order so a crash mid-placement
+        never leads to a second bet on restart.
+        """
+        self._write(
+            "INSERT OR REPLACE INTO decisions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (self.date, self.bot_type, key, decision,
+             str(bet_id) if bet_id else None, odds, stake, reason, _now())
+        )
+
+    def record_result_checked(self, key: str):
+        """Record that a race's result has been checked."""
+        self._write(
+            "INSERT OR REPLACE INTO results_checked VALUES (?, ?, ?, ?)",
+            (self.date, self.bot_type, key, _now())
+        )
+
+    def _write(self, query: str, params: tuple):
+        with self._lock:
+            self._conn.execute(query, params)
+            self._conn.commit()
+
+    def close(self):
+        """Close the state file."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")